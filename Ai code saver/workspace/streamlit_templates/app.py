@@ -13,6 +13,8 @@ from bs4 import BeautifulSoup
 import warnings
 warnings.filterwarnings('ignore')
 
+from synthetic_market import generate_ohlcv
+
 # Page configuration
 st.set_page_config(
     page_title="PSX Trading Dashboard",
@@ -109,32 +111,13 @@ class PSXDashboard:
         np.random.seed(hash(symbol) % 2**32)
         dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
         
-        # Generate realistic price movement
+        # Generate realistic price movement: 2% daily volatility, minimum price of 10
         base_price = np.random.uniform(100, 400)
-        prices = [base_price]
-        
-        for i in range(1, days):
-            change = np.random.normal(0, 0.02)  # 2% daily volatility
-            new_price = prices[-1] * (1 + change)
-            prices.append(max(new_price, 10))  # Minimum price of 10
-        
-        # Generate OHLCV data
-        data = []
-        for i, (date, price) in enumerate(zip(dates, prices)):
-            high = price * np.random.uniform(1.0, 1.05)
-            low = price * np.random.uniform(0.95, 1.0)
-            volume = np.random.randint(100000, 2000000)
-            
-            data.append({
-                'Date': date,
-                'Open': round(price, 2),
-                'High': round(high, 2),
-                'Low': round(low, 2),
-                'Close': round(price, 2),
-                'Volume': volume
-            })
-        
-        return pd.DataFrame(data)
+        df = generate_ohlcv(days, start_price=base_price, volatility=0.02, wick=0.02,
+                            volume=(100000, 2000000), min_price=10, index=dates,
+                            seed=hash(symbol) % 2**32)
+        df[['Open', 'High', 'Low', 'Close']] = df[['Open', 'High', 'Low', 'Close']].round(2)
+        return df.rename_axis('Date').reset_index()
 
     def calculate_technical_indicators(self, df):
         """Calculate basic technical indicators"""
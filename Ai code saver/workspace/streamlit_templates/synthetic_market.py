@@ -0,0 +1,145 @@
+"""
+Seeded synthetic OHLCV generator for demo data and load tests
+
+Prices follow a geometric random walk (close_t = close_{t-1} * (1 + r_t)),
+either with one drift/volatility or with a Markov regime switch between
+several. Everything is generated for all bars and symbols at once with
+``cumprod``-style operations, so 10^7 bars take seconds rather than minutes.
+
+    df = generate_ohlcv(1_000, seed=42)
+    universe = generate_universe(['HBL', 'OGDC'], 5_000, model='regime', seed=7)
+"""
+import numpy as np
+import pandas as pd
+
+# Calm / trending-up / volatile-down regimes used by model='regime'
+DEFAULT_REGIMES = [
+    {'drift': 0.0, 'volatility': 0.01},
+    {'drift': 0.001, 'volatility': 0.008},
+    {'drift': -0.0015, 'volatility': 0.025},
+]
+
+
+def generate_ohlcv(n_bars, start_price=150.0, volatility=0.002, drift=0.0, model='gbm',
+                   regimes=None, switch_prob=0.02, wick=None, volume=(1000, 10000),
+                   min_price=None, index=None, start='2020-01-01', freq='1min', seed=None):
+    """
+    Generate OHLCV bars for one symbol
+
+    Args:
+        n_bars (int): Number of bars
+        start_price (float): Price before the first bar (the first bar's Open)
+        volatility (float): Per-bar return standard deviation (model='gbm')
+        drift (float): Per-bar mean return (model='gbm')
+        model (str): 'gbm' or 'regime'
+        regimes (list): [{'drift': ..., 'volatility': ...}] for model='regime'
+        switch_prob (float): Per-bar probability of leaving the current regime
+        wick (float): Std of the High/Low excursion beyond the body
+            (default: volatility / 2)
+        volume (tuple): [low, high) range of the uniform integer volume
+        min_price (float): Price floor inside the walk: a bar that would close
+            below it closes at the floor and the walk continues from there
+        index (pandas.DatetimeIndex): Bar timestamps (default: ``n_bars`` bars of
+            ``freq`` from ``start``)
+        start, freq: Used to build the default index
+        seed (int): Random seed; None draws fresh entropy
+
+    Returns:
+        pandas.DataFrame: Open/High/Low/Close/Volume indexed by timestamp
+    """
+    if index is None:
+        index = pd.date_range(start, periods=n_bars, freq=freq)
+    columns = _simulate(n_bars, 1, np.random.default_rng(seed), start_price, volatility, drift,
+                        model, regimes, switch_prob, wick, volume, min_price)
+    return pd.DataFrame({name: values[:, 0] for name, values in columns.items()}, index=index)
+
+
+def generate_universe(symbols, n_bars, start_price=150.0, volatility=0.002, drift=0.0,
+                      model='gbm', regimes=None, switch_prob=0.02, wick=None,
+                      volume=(1000, 10000), min_price=None, index=None,
+                      start='2020-01-01', freq='1min', seed=None, wide=False):
+    """
+    Generate OHLCV bars for many symbols in one vectorized draw
+
+    With model='regime' all symbols share one market regime path.
+
+    Args:
+        symbols (list): Symbol names
+        n_bars (int): Bars per symbol
+        start_price (float or array): One start price, or one per symbol
+        wide (bool): Return one frame with (field, symbol) MultiIndex columns,
+            the layout PanelTechnicalAnalyzer accepts
+        Other arguments as in generate_ohlcv
+
+    Returns:
+        dict or pandas.DataFrame: Symbol -> OHLCV frame, or the wide panel
+    """
+    if index is None:
+        index = pd.date_range(start, periods=n_bars, freq=freq)
+    columns = _simulate(n_bars, len(symbols), np.random.default_rng(seed), start_price,
+                        volatility, drift, model, regimes, switch_prob, wick, volume, min_price)
+    if wide:
+        blocks = {(name, symbol): values[:, i]
+                  for name, values in columns.items() for i, symbol in enumerate(symbols)}
+        return pd.DataFrame(blocks, index=index)
+    return {
+        symbol: pd.DataFrame({name: values[:, i] for name, values in columns.items()}, index=index)
+        for i, symbol in enumerate(symbols)
+    }
+
+
+def _simulate(n_bars, n_symbols, rng, start_price, volatility, drift, model, regimes,
+              switch_prob, wick, volume, min_price):
+    """(n_bars, n_symbols) Open/High/Low/Close/Volume arrays"""
+    shape = (n_bars, n_symbols)
+    start_price = np.broadcast_to(np.asarray(start_price, dtype=np.float64), (n_symbols,))
+
+    if model == 'gbm':
+        returns = rng.normal(drift, volatility, shape)
+        scale = volatility
+    elif model == 'regime':
+        regimes = regimes or DEFAULT_REGIMES
+        path = _regime_path(n_bars, len(regimes), switch_prob, rng)
+        drifts = np.array([r['drift'] for r in regimes])[path][:, None]
+        vols = np.array([r['volatility'] for r in regimes])[path][:, None]
+        returns = drifts + vols * rng.standard_normal(shape)
+        scale = np.mean([r['volatility'] for r in regimes])
+    else:
+        raise ValueError(f"Unknown model '{model}' (expected 'gbm' or 'regime')")
+
+    wick = scale / 2 if wick is None else wick
+    if min_price is None:
+        close = start_price * np.cumprod(1 + returns, axis=0)
+    else:
+        # Flooring every step is a running maximum of the shortfall in log space
+        log_close = np.log(start_price) + np.cumsum(np.log1p(returns), axis=0)
+        floor_lift = np.maximum.accumulate(np.maximum(np.log(min_price) - log_close, 0), axis=0)
+        close = np.exp(log_close + floor_lift)
+    open_price = np.empty_like(close)
+    open_price[:1] = start_price
+    open_price[1:] = close[:-1]
+    high = np.maximum(open_price, close) * (1 + np.abs(rng.normal(0, wick, shape)))
+    low = np.minimum(open_price, close) * (1 - np.abs(rng.normal(0, wick, shape)))
+    bar_volume = rng.integers(volume[0], volume[1], shape)
+
+    if min_price is not None:
+        # Only the wicks and a start below the floor can still dip under it
+        for prices in (open_price, low):
+            np.maximum(prices, min_price, out=prices)
+
+    return {'Open': open_price, 'High': high, 'Low': low, 'Close': close, 'Volume': bar_volume}
+
+
+def _regime_path(n_bars, n_regimes, switch_prob, rng):
+    """Regime label per bar from geometric regime durations"""
+    if n_bars == 0:
+        return np.zeros(0, dtype=np.intp)
+    segments = int(n_bars * switch_prob * 1.5) + 16
+    durations = rng.geometric(switch_prob, segments)
+    while durations.sum() < n_bars:
+        durations = np.concatenate([durations, rng.geometric(switch_prob, segments)])
+    # Each new regime differs from the previous one
+    steps = rng.integers(1, max(n_regimes, 2), len(durations))
+    labels = (rng.integers(0, n_regimes) + np.cumsum(steps)) % n_regimes if n_regimes > 1 \
+        else np.zeros(len(durations), dtype=np.intp)
+    return np.repeat(labels, durations)[:n_bars]
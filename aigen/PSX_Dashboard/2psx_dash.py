@@ -10,6 +10,8 @@ import datetime
 from datetime import timedelta
 import ta
 
+from synthetic_market import generate_ohlcv
+
 # Initialize the Dash app with Bootstrap theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.DARKLY])
 server = app.server
@@ -178,36 +180,12 @@ def fetch_psx_data(api_key, symbol, days):
     
     date_range = pd.date_range(start=start_date, end=end_date, freq='B')  # Business days only
     
-    # Generate mock OHLC data
+    # Generate mock OHLC data: 2% daily moves with 1% wicks
     base_price = np.random.uniform(100, 500)
-    price_changes = np.random.normal(0, 0.02, len(date_range))
-    prices = [base_price]
-    
-    for change in price_changes[1:]:
-        prices.append(prices[-1] * (1 + change))
-    
-    ohlc_data = []
-    for i, date in enumerate(date_range):
-        if i > 0:
-            open_price = prices[i-1]
-            close_price = prices[i]
-            high_price = max(open_price, close_price) * (1 + abs(np.random.normal(0, 0.01)))
-            low_price = min(open_price, close_price) * (1 - abs(np.random.normal(0, 0.01)))
-            volume = np.random.randint(10000, 500000)
-        else:
-            open_price = close_price = high_price = low_price = prices[i]
-            volume = np.random.randint(10000, 500000)
-            
-        ohlc_data.append({
-            'date': date,
-            'open': open_price,
-            'high': high_price,
-            'low': low_price,
-            'close': close_price,
-            'volume': volume
-        })
-    
-    return pd.DataFrame(ohlc_data)
+    df = generate_ohlcv(len(date_range), start_price=base_price, volatility=0.02, wick=0.01,
+                        volume=(10000, 500000), index=date_range)
+    df.columns = df.columns.str.lower()
+    return df.rename_axis('date').reset_index()
 
 # Callback to save API key
 @app.callback(
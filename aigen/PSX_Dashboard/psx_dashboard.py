@@ -9,6 +9,8 @@ import requests
 from bs4 import BeautifulSoup
 import time
 
+from synthetic_market import generate_ohlcv
+
 # Set page configuration
 st.set_page_config(
     page_title="PSX Quantum Dashboard",
@@ -141,10 +143,10 @@ def fetch_stock_data(symbol, period):
     
     if period == "1 Day":
         start_date = end_date - timedelta(days=1)
-        interval = "5m"
+        interval = "5min"
     elif period == "1 Week":
         start_date = end_date - timedelta(weeks=1)
-        interval = "30m"
+        interval = "30min"
     elif period == "1 Month":
         start_date = end_date - timedelta(days=30)
         interval = "1h"
@@ -164,25 +166,10 @@ def fetch_stock_data(symbol, period):
     # Base price with some randomness
     base_price = np.random.uniform(100, 500)
     
-    # Generate price movements
-    price_changes = np.random.normal(0, 0.02, size=len(dates))
-    prices = [base_price]
-    
-    for change in price_changes[1:]:
-        prices.append(prices[-1] * (1 + change))
-    
-    # Create OHLC data
-    data = {
-        'Date': dates,
-        'Open': prices,
-        'High': [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-        'Low': [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
-        'Close': [p * (1 + np.random.normal(0, 0.005)) for p in prices],
-        'Volume': [int(np.random.uniform(10000, 500000)) for _ in prices]
-    }
-    
-    df = pd.DataFrame(data)
-    df.set_index('Date', inplace=True)
+    # 2% per-bar moves with 1% wicks
+    df = generate_ohlcv(len(dates), start_price=base_price, volatility=0.02, wick=0.01,
+                        volume=(10000, 500000), index=dates)
+    df.index.name = 'Date'
     
     return df
 
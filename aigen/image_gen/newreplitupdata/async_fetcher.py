@@ -0,0 +1,179 @@
+import asyncio
+import time
+
+from data_fetcher import StockDataFetcher
+
+
+class QuotaExhausted(Exception):
+    """Raised when the daily call quota of the API key is used up"""
+
+
+class TokenBucket:
+    """
+    Async token bucket sized to an API key's call quota
+
+    Tokens refill continuously at ``calls_per_minute``; ``burst`` tokens can
+    be spent back to back. An optional ``calls_per_day`` cap makes
+    ``acquire`` raise ``QuotaExhausted`` instead of waiting until tomorrow.
+    """
+
+    def __init__(self, calls_per_minute=5, burst=None, calls_per_day=None):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(burst or calls_per_minute)
+        self.calls_per_day = calls_per_day
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.day_started = time.time()
+        self.calls_today = 0
+        self._lock = None
+        self._loop = None
+
+    async def acquire(self):
+        """Wait for a token; callers are served in arrival order"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # asyncio.Lock is tied to one event loop; fetch_all runs a new one per call
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            if self.calls_per_day is not None:
+                if time.time() - self.day_started >= 86400:
+                    self.day_started = time.time()
+                    self.calls_today = 0
+                if self.calls_today >= self.calls_per_day:
+                    raise QuotaExhausted(f"Daily quota of {self.calls_per_day} calls used")
+
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.calls_today += 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def drain(self):
+        """Empty the bucket after the API reported a rate limit we did not expect"""
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+
+
+class AsyncStockDataFetcher:
+    """
+    Concurrent multi-symbol fetching under the Alpha Vantage call quota
+
+    Every call goes through one shared ``TokenBucket`` and at most
+    ``max_concurrency`` requests are in flight. Unlike ``StockDataFetcher``,
+    a rate-limited or failed call is retried or reported as ``None``; demo
+    data is never substituted.
+    """
+
+    def __init__(self, fetcher=None, calls_per_minute=5, calls_per_day=None,
+                 max_concurrency=4, max_retries=2, timeout=30):
+        """
+        Args:
+            fetcher (StockDataFetcher): Supplies the API key, parsing and the optional
+                on-disk store (default: a new StockDataFetcher)
+            calls_per_minute (int): Per-minute quota of the API key
+            calls_per_day (int): Daily quota, or None for no daily cap
+            max_concurrency (int): Requests in flight at once
+            max_retries (int): Retries after an unexpected rate-limit response
+            timeout (int): Per-request timeout in seconds
+        """
+        self.fetcher = fetcher or StockDataFetcher(refresh_listing=False)
+        self.bucket = TokenBucket(calls_per_minute, calls_per_day=calls_per_day)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+
+    async def fetch_iter(self, jobs, outputsize='compact'):
+        """
+        Fetch many series, yielding each one as soon as it arrives
+
+        Args:
+            jobs (list): (symbol, interval) pairs; interval 'daily' fetches daily bars
+            outputsize (str): 'compact' or 'full'
+
+        Yields:
+            tuple: (symbol, interval, DataFrame or None)
+
+        Raises:
+            QuotaExhausted: The daily cap was reached; pending jobs are cancelled
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(symbol, interval):
+            async with semaphore:
+                return symbol, interval, await self._fetch_one(symbol, interval, outputsize)
+
+        tasks = [asyncio.ensure_future(run(symbol, interval)) for symbol, interval in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_many(self, jobs, outputsize='compact'):
+        """
+        Fetch many series concurrently
+
+        Returns:
+            dict: (symbol, interval) -> DataFrame or None
+
+        Raises:
+            QuotaExhausted: The daily cap was reached; pending jobs are cancelled
+        """
+        return {(symbol, interval): df
+                async for symbol, interval, df in self.fetch_iter(jobs, outputsize)}
+
+    def fetch_all(self, jobs, outputsize='compact'):
+        """Blocking wrapper around fetch_many for synchronous callers (e.g. Streamlit)"""
+        return asyncio.run(self.fetch_many(jobs, outputsize))
+
+    async def _fetch_one(self, symbol, interval, outputsize):
+        """One series, retrying when the API answers with a rate-limit note"""
+        if interval == 'daily':
+            params = {'function': 'TIME_SERIES_DAILY'}
+            time_series_key = 'Time Series (Daily)'
+        else:
+            params = {'function': 'TIME_SERIES_INTRADAY', 'interval': interval}
+            time_series_key = f'Time Series ({interval})'
+        params.update({
+            'symbol': symbol.upper(),
+            'apikey': self.fetcher.api_key,
+            'outputsize': outputsize,
+            'datatype': 'json',
+        })
+
+        for _ in range(self.max_retries + 1):
+            # QuotaExhausted is not caught here: it ends the whole batch
+            await self.bucket.acquire()
+            try:
+                data = await asyncio.to_thread(self._request, params)
+            except Exception as e:
+                print(f"Error fetching {symbol} ({interval}): {str(e)}")
+                return None
+
+            if "Note" in data:
+                # Quota shared with another process or sized wrong: back off a full refill
+                self.bucket.drain()
+                continue
+            if time_series_key not in data:
+                # "Information" (premium endpoint, invalid or demo key) will not
+                # succeed on retry either
+                message = data.get('Error Message') or data.get('Information') or 'no data'
+                print(f"Error fetching {symbol} ({interval}): {message}")
+                return None
+
+            df = self.fetcher._parse_time_series(data[time_series_key])
+            if self.fetcher.store is not None:
+                df = self.fetcher._trim(self.fetcher.store.write(symbol, interval, df, outputsize), outputsize)
+            return df
+
+        print(f"Error fetching {symbol} ({interval}): rate limited after {self.max_retries} retries")
+        return None
+
+    def _request(self, params):
+        return self.fetcher._request(params, timeout=self.timeout)
@@ -0,0 +1,72 @@
+import json
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+OHLCV_LABELS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def decode_response(response):
+    """
+    Decode an Alpha Vantage HTTP response body
+
+    Uses orjson on the raw bytes when it is installed, otherwise falls back
+    to ``response.json()``.
+
+    Args:
+        response (requests.Response): API response
+
+    Returns:
+        dict: Decoded payload
+    """
+    content = getattr(response, 'content', None)
+    if content is None:
+        return response.json()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_time_series(time_series):
+    """
+    Convert an Alpha Vantage time series object to an OHLCV DataFrame
+
+    The field strings are converted straight into one preallocated float64
+    block and the timestamps are parsed in a single vectorized call; no
+    intermediate object-dtype frame is built. Produces the same frame as
+    ``DataFrame.from_dict(orient='index').astype(float)`` followed by
+    ``to_datetime`` and ``sort_index``.
+
+    Args:
+        time_series (dict): 'YYYY-MM-DD[ HH:MM:SS]' -> {'1. open': '...', ...}
+
+    Returns:
+        pandas.DataFrame: OHLCV columns, oldest bar first
+    """
+    rows = len(time_series)
+    if rows == 0:
+        return pd.DataFrame(columns=OHLCV_LABELS, index=pd.DatetimeIndex([]), dtype=float)
+
+    values = np.fromiter(
+        map(float, chain.from_iterable(bar.values() for bar in time_series.values())),
+        dtype=np.float64, count=rows * len(OHLCV_LABELS),
+    ).reshape(rows, len(OHLCV_LABELS))
+    timestamps = np.array(list(time_series), dtype='datetime64[ns]')
+
+    # Alpha Vantage lists the newest bar first
+    if rows > 1 and (timestamps[1:] <= timestamps[:-1]).all():
+        values = values[::-1]
+        timestamps = timestamps[::-1]
+    elif not (timestamps[1:] >= timestamps[:-1]).all():
+        order = np.argsort(timestamps, kind='stable')
+        values = values[order]
+        timestamps = timestamps[order]
+
+    return pd.DataFrame(np.ascontiguousarray(values), index=pd.DatetimeIndex(timestamps),
+                        columns=OHLCV_LABELS)
@@ -0,0 +1,344 @@
+"""
+Benchmark suite for the analysis stack (fetch parsing, indicators, patterns, charts,
+figure serialization)
+
+Usage:
+    python benchmark.py --sizes 1000 10000 100000 --output results.json
+    python benchmark.py --sizes 1000 10000 --compare results.json --threshold 0.2
+
+Every run uses seeded synthetic OHLCV so numbers are reproducible between
+machines and commits. Each case reports wall time (best of ``--repeat``),
+peak traced memory and throughput in bars/sec. ``--compare`` flags cases that
+got slower than the stored baseline by more than ``--threshold`` and exits
+with status 1 when any regression is found.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from technical_analysis import TechnicalAnalyzer
+from pattern_detector import PatternDetector
+from visulization import ChartVisualizer
+from indicator_graph import DEFAULT_GRAPH
+from incremental_indicators import INDICATOR_COLUMNS
+from av_parser import decode_response, parse_time_series
+from synthetic_market import generate_ohlcv
+from figure_payload import to_binary_json
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+STAGES = ['fetch', 'parse', 'indicators', 'per_indicator', 'patterns', 'charts', 'serialize']
+
+# Figure encoders timed by the serialize stage
+ENCODERS = [
+    ('json', lambda fig: fig.to_json()),
+    ('binary', lambda fig: to_binary_json(fig)),
+    ('binary_f32', lambda fig: to_binary_json(fig, float32=True)),
+]
+
+
+def make_synthetic_ohlcv(n_bars, seed=42, start_price=150.0, volatility=0.002):
+    """
+    Generate reproducible 1-minute OHLCV bars
+
+    Args:
+        n_bars (int): Number of bars
+        seed (int): Random seed
+        start_price (float): First close
+        volatility (float): Per-bar return standard deviation
+
+    Returns:
+        pandas.DataFrame: OHLCV data indexed by timestamp
+    """
+    df = generate_ohlcv(n_bars, start_price=start_price, volatility=volatility, seed=seed)
+    return df.astype({'Volume': float})
+
+
+def make_alpha_vantage_payload(df, interval='1min'):
+    """Build an Alpha Vantage style intraday JSON payload from OHLCV data"""
+    labels = ['1. open', '2. high', '3. low', '4. close', '5. volume']
+    series = {
+        timestamp.strftime('%Y-%m-%d %H:%M:%S'): {
+            label: f'{value:.4f}' for label, value in zip(labels, row)
+        }
+        for timestamp, row in zip(df.index[::-1], df.to_numpy()[::-1])
+    }
+    return {'Meta Data': {}, f'Time Series ({interval})': series}
+
+
+class _FakeResponse:
+    """Stands in for requests.Response so parsing can be timed offline"""
+
+    def __init__(self, payload):
+        self._payload = payload
+        self.content = json.dumps(payload).encode()
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _legacy_parse(response, interval='1min'):
+    """The original get_stock_data parsing path, kept as the parse baseline"""
+    data = response.json()
+    df = pd.DataFrame.from_dict(data[f'Time Series ({interval})'], orient='index')
+    df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    df = df.astype(float)
+    df.index = pd.to_datetime(df.index)
+    return df.sort_index()
+
+
+def _columnar_parse(response, interval='1min'):
+    """Current path: orjson decode plus the columnar time series parser"""
+    data = decode_response(response)
+    return parse_time_series(data[f'Time Series ({interval})'])
+
+
+def measure(func, bars, repeat=3):
+    """
+    Time ``func`` and record its peak memory
+
+    Args:
+        func (callable): Work to measure
+        bars (int): Bars processed per call, for throughput
+        repeat (int): Timed repetitions; the best one is reported
+
+    Returns:
+        dict: seconds, peak_bytes and bars_per_sec
+    """
+    timings = []
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    # Separate traced run: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        'seconds': seconds,
+        'peak_bytes': peak,
+        'bars_per_sec': bars / seconds if seconds > 0 else float('inf'),
+    }
+
+
+def run_benchmarks(sizes, stages=None, repeat=3, seed=42, indicators=None):
+    """
+    Run the requested stages for every size
+
+    Args:
+        sizes (list): Bar counts to benchmark
+        stages (list): Subset of STAGES (default: all)
+        repeat (int): Timed repetitions per case
+        seed (int): Seed for the synthetic data
+        indicators (list): Indicators for the per_indicator stage
+
+    Returns:
+        dict: Metadata plus one record per (stage, name, bars) case
+    """
+    stages = stages or STAGES
+    indicators = indicators or INDICATOR_COLUMNS
+    analyzer = TechnicalAnalyzer()
+    detector = PatternDetector()
+    visualizer = ChartVisualizer(downsample=True)
+    full_visualizer = ChartVisualizer(downsample=False)
+    fast_visualizer = ChartVisualizer(downsample=False, fast_render=True)
+    reuse_visualizer = ChartVisualizer(downsample=True, reuse_figures=True)
+    results = []
+
+    def record(stage, name, bars, func, payload_bytes=None):
+        metrics = measure(func, bars, repeat)
+        if payload_bytes is not None:
+            metrics['payload_bytes'] = payload_bytes
+        results.append({'stage': stage, 'name': name, 'bars': bars, **metrics})
+        payload = f"  payload {payload_bytes / 1e6:>8.2f} MB" if payload_bytes is not None else ""
+        print(f"{stage:>14} {name:<28} {bars:>10,} bars  "
+              f"{metrics['seconds'] * 1000:>10.2f} ms  "
+              f"{metrics['peak_bytes'] / 1e6:>9.1f} MB  "
+              f"{metrics['bars_per_sec']:>14,.0f} bars/s{payload}", file=sys.stderr)
+
+    for bars in sizes:
+        df = make_synthetic_ohlcv(bars, seed=seed)
+
+        if 'fetch' in stages:
+            import data_fetcher
+            fetcher = data_fetcher.StockDataFetcher(refresh_listing=False)
+            payload = make_alpha_vantage_payload(df)
+            with mock.patch.object(data_fetcher.get_session(), 'get',
+                                   return_value=_FakeResponse(payload)), \
+                    mock.patch.object(data_fetcher, 'st'):
+                record('fetch', 'get_stock_data_parse', bars,
+                       lambda: fetcher.get_stock_data('BENCH', outputsize='full'))
+            record('fetch', 'demo_data', 100, fetcher._get_demo_data)
+
+        if 'parse' in stages:
+            response = _FakeResponse(make_alpha_vantage_payload(df))
+            record('parse', 'legacy_json_from_dict', bars, lambda: _legacy_parse(response))
+            record('parse', 'orjson_columnar', bars, lambda: _columnar_parse(response))
+
+        indicator_df = None
+        if stages_need_indicators(stages):
+            indicator_df = analyzer.add_all_indicators(df)
+
+        if 'indicators' in stages:
+            record('indicators', 'add_all_indicators', bars,
+                   lambda: analyzer.add_all_indicators(df))
+            record('indicators', 'get_signal_summary', bars,
+                   lambda: analyzer.get_signal_summary(indicator_df))
+            record('indicators', 'signal_timeline', bars,
+                   lambda: analyzer.get_signal_timeline(indicator_df))
+            record('indicators', 'support_resistance', bars,
+                   lambda: analyzer.calculate_support_resistance(indicator_df))
+
+        if 'per_indicator' in stages:
+            for name in indicators:
+                record('per_indicator', name, bars,
+                       lambda name=name: DEFAULT_GRAPH.evaluate(df.copy(), [name]))
+
+        if 'patterns' in stages:
+            record('patterns', 'detect_patterns', bars,
+                   lambda: detector.detect_patterns(indicator_df))
+            record('patterns', 'scan_candlestick_history', bars,
+                   lambda: detector.scan_candlestick_history(df))
+
+        if 'charts' in stages:
+            record('charts', 'candlestick', bars,
+                   lambda: visualizer.create_candlestick_chart(indicator_df, 'BENCH'))
+            record('charts', 'line', bars,
+                   lambda: visualizer.create_candlestick_chart(indicator_df, 'BENCH', 'Line'))
+            # Best of --repeat: every call after the first refreshes the cached figure
+            record('charts', 'candlestick_refresh', bars,
+                   lambda: reuse_visualizer.create_candlestick_chart(indicator_df, 'BENCH'))
+            record('charts', 'technical_indicators', bars,
+                   lambda: visualizer.create_technical_indicators_chart(indicator_df))
+            # Full-resolution traces: the default render path against fast_render
+            for name, chart_visualizer in [('full', full_visualizer), ('full_fast', fast_visualizer)]:
+                record('charts', f'candlestick_{name}', bars,
+                       lambda v=chart_visualizer: v.create_candlestick_chart(indicator_df, 'BENCH'))
+                record('charts', f'technical_{name}', bars,
+                       lambda v=chart_visualizer: v.create_technical_indicators_chart(indicator_df))
+
+        if 'serialize' in stages:
+            # Build, then encode the finished figure; payload_bytes is the encoded size
+            prediction = {'prediction': 'UP', 'confidence': 0.7}
+            builders = [
+                ('candlestick', lambda: visualizer.create_candlestick_chart(indicator_df, 'BENCH')),
+                ('technical', lambda: visualizer.create_technical_indicators_chart(indicator_df)),
+                ('prediction', lambda: visualizer.create_prediction_chart(indicator_df, prediction)),
+            ]
+            for chart, build in builders:
+                record('serialize', f'{chart}_build', bars, build)
+                fig = build()
+                for encoding, encode in ENCODERS:
+                    record('serialize', f'{chart}_{encoding}', bars,
+                           lambda encode=encode: encode(fig), payload_bytes=len(encode(fig)))
+
+    return {
+        'meta': {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'seed': seed,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def stages_need_indicators(stages):
+    return any(stage in stages for stage in ('indicators', 'patterns', 'charts', 'serialize'))
+
+
+def compare_results(current, baseline, threshold=0.2):
+    """
+    Compare a run against a stored baseline
+
+    Args:
+        current (dict): Output of run_benchmarks
+        baseline (dict): Previously saved output
+        threshold (float): Allowed relative slowdown (0.2 = 20%)
+
+    Returns:
+        list: One dict per case present in both runs, with ``regression`` set
+        when the case got slower than allowed
+    """
+    def key(record):
+        return record['stage'], record['name'], record['bars']
+
+    previous = {key(record): record for record in baseline.get('results', [])}
+    comparison = []
+    for record in current['results']:
+        old = previous.get(key(record))
+        if old is None or old['seconds'] <= 0:
+            continue
+        ratio = record['seconds'] / old['seconds']
+        comparison.append({
+            'stage': record['stage'],
+            'name': record['name'],
+            'bars': record['bars'],
+            'baseline_seconds': old['seconds'],
+            'seconds': record['seconds'],
+            'ratio': ratio,
+            'memory_ratio': record['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else None,
+            'regression': ratio > 1 + threshold,
+        })
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the stock analysis stack")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help="Bar counts to benchmark (1k .. 10M)")
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--indicators', nargs='+', default=None,
+                        help="Indicators for the per_indicator stage")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write results as JSON to this file")
+    parser.add_argument('--compare', help="Baseline JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Relative slowdown that counts as a regression")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.stages, args.repeat, args.seed, args.indicators)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison = compare_results(results, baseline, args.threshold)
+        results['comparison'] = comparison
+        regressions = [row for row in comparison if row['regression']]
+        for row in regressions:
+            print(f"REGRESSION {row['stage']}/{row['name']} @ {row['bars']:,} bars: "
+                  f"{row['baseline_seconds'] * 1000:.2f} ms -> {row['seconds'] * 1000:.2f} ms "
+                  f"({row['ratio']:.2f}x)", file=sys.stderr)
+        if regressions:
+            exit_code = 1
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+# (pattern_id, name, direction, candles); direction is 1 bullish, -1 bearish, 0 neutral.
+# Ids are stable: they are stored in pattern indexes and backtest outputs.
+CANDLE_PATTERNS = [
+    (0, 'Doji', 0, 1),
+    (1, 'Hammer', 1, 1),
+    (2, 'Shooting Star', -1, 1),
+    (3, 'Spinning Top', 0, 1),
+    (4, 'Bullish Engulfing', 1, 2),
+    (5, 'Bearish Engulfing', -1, 2),
+    (6, 'Piercing Pattern', 1, 2),
+    (7, 'Dark Cloud Cover', -1, 2),
+    (8, 'Morning Star', 1, 3),
+    (9, 'Evening Star', -1, 3),
+    (10, 'Three White Soldiers', 1, 3),
+    (11, 'Three Black Crows', -1, 3),
+]
+
+PATTERN_NAMES = {pattern_id: name for pattern_id, name, _, _ in CANDLE_PATTERNS}
+PATTERN_IDS = {name: pattern_id for pattern_id, name, _, _ in CANDLE_PATTERNS}
+PATTERN_DIRECTIONS = {pattern_id: direction for pattern_id, _, direction, _ in CANDLE_PATTERNS}
+
+# Alert text used by PatternDetector and StreamingPatternDetector
+PATTERN_MESSAGES = {
+    'Doji': "Doji detected at {}",
+    'Hammer': "Hammer pattern at {}",
+    'Shooting Star': "Shooting Star at {}",
+    'Spinning Top': "Spinning Top at {}",
+    'Bullish Engulfing': "Bullish Engulfing pattern at {}",
+    'Bearish Engulfing': "Bearish Engulfing pattern at {}",
+    'Piercing Pattern': "Piercing Pattern at {}",
+    'Dark Cloud Cover': "Dark Cloud Cover at {}",
+    'Morning Star': "Morning Star pattern at {}",
+    'Evening Star': "Evening Star pattern at {}",
+    'Three White Soldiers': "Three White Soldiers at {}",
+    'Three Black Crows': "Three Black Crows at {}",
+}
+
+PATTERN_DTYPE = np.dtype([
+    ('timestamp', 'datetime64[ns]'),
+    ('pattern_id', np.uint8),
+    ('direction', np.int8),
+])
+
+
+def _as_float(values):
+    """Keep float32/float64 inputs as they are so thresholds match the row rules"""
+    values = np.asarray(values)
+    return values if values.dtype.kind == 'f' else values.astype(float)
+
+
+def candlestick_masks(open_, high, low, close):
+    """
+    Evaluate every candlestick rule over whole OHLC arrays
+
+    Multi-candle rules are aligned on their last candle, so ``masks[name][i]``
+    means the pattern completes at bar ``i``.
+
+    Args:
+        open_, high, low, close (numpy.ndarray): Price arrays of equal length
+
+    Returns:
+        dict: Pattern name -> boolean array
+    """
+    o, h, l, c = (_as_float(x) for x in (open_, high, low, close))
+    n = len(c)
+
+    body = np.abs(c - o)
+    upper_shadow = h - np.maximum(o, c)
+    lower_shadow = np.minimum(o, c) - l
+    total_range = h - l
+    has_range = total_range != 0
+    bullish = c > o
+    bearish = c < o
+    midpoint = (o + c) / 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        doji = has_range & (body / total_range < 0.1)
+
+    masks = {
+        'Doji': doji,
+        'Hammer': has_range & (lower_shadow > 2 * body) & (upper_shadow < body * 0.5)
+        & (lower_shadow > 0.6 * total_range),
+        'Shooting Star': has_range & (upper_shadow > 2 * body) & (lower_shadow < body * 0.5)
+        & (upper_shadow > 0.6 * total_range),
+        'Spinning Top': has_range & (body < 0.3 * total_range)
+        & (upper_shadow > 0.1 * total_range) & (lower_shadow > 0.1 * total_range),
+    }
+
+    def shifted(values, periods, fill):
+        out = np.full(n, fill, dtype=values.dtype)
+        if periods < n:
+            out[periods:] = values[:n - periods]
+        return out
+
+    # Previous candle (two-candle rules) and the two before it (three-candle rules)
+    o1, h1, l1, c1 = (shifted(x, 1, np.nan) for x in (o, h, l, c))
+    bull1, bear1 = shifted(bullish, 1, False), shifted(bearish, 1, False)
+    mid1, body1 = shifted(midpoint, 1, np.nan), shifted(body, 1, np.nan)
+    o2, c2 = shifted(o, 2, np.nan), shifted(c, 2, np.nan)
+    bull2, bear2 = shifted(bullish, 2, False), shifted(bearish, 2, False)
+    mid2, body2 = shifted(midpoint, 2, np.nan), shifted(body, 2, np.nan)
+
+    masks['Bullish Engulfing'] = bear1 & bullish & (o < c1) & (c > o1)
+    masks['Bearish Engulfing'] = bull1 & bearish & (o > c1) & (c < o1)
+    masks['Piercing Pattern'] = bear1 & bullish & (o < l1) & (c > mid1)
+    masks['Dark Cloud Cover'] = bull1 & bearish & (o > h1) & (c < mid1)
+
+    small_middle = body1 < np.minimum(body2, body) * 0.5
+    masks['Morning Star'] = bear2 & bullish & small_middle & (c > mid2)
+    masks['Evening Star'] = bull2 & bearish & small_middle & (c < mid2)
+    masks['Three White Soldiers'] = bull2 & bull1 & bullish & (c1 > c2) & (c > c1) \
+        & (o1 > o2) & (o > o1)
+    masks['Three Black Crows'] = bear2 & bear1 & bearish & (c1 < c2) & (c < c1) \
+        & (o1 < o2) & (o < o1)
+
+    return masks
+
+
+def scan_candlestick_patterns(df, patterns=None):
+    """
+    Scan a full OHLC history for candlestick patterns in one pass
+
+    Args:
+        df (pandas.DataFrame): OHLC data indexed by timestamp
+        patterns (list): Pattern names to keep (default: all)
+
+    Returns:
+        numpy.ndarray: Structured array of (timestamp, pattern_id, direction)
+        sorted by timestamp, then pattern id
+    """
+    if df is None or df.empty:
+        return np.empty(0, dtype=PATTERN_DTYPE)
+
+    masks = candlestick_masks(df['Open'].to_numpy(), df['High'].to_numpy(),
+                              df['Low'].to_numpy(), df['Close'].to_numpy())
+    selected = [pattern for pattern in CANDLE_PATTERNS
+                if patterns is None or pattern[1] in patterns]
+    if not selected:
+        return np.empty(0, dtype=PATTERN_DTYPE)
+
+    # (bars x patterns) matrix; nonzero walks it bar-major
+    matrix = np.column_stack([masks[name] for _, name, _, _ in selected])
+    rows, cols = np.nonzero(matrix)
+    ids = np.array([pattern_id for pattern_id, _, _, _ in selected], dtype=np.uint8)
+    directions = np.array([direction for _, _, direction, _ in selected], dtype=np.int8)
+
+    timestamps = pd.DatetimeIndex(df.index).values.astype('datetime64[ns]')
+    result = np.empty(len(rows), dtype=PATTERN_DTYPE)
+    result['timestamp'] = timestamps[rows]
+    result['pattern_id'] = ids[cols]
+    result['direction'] = directions[cols]
+    return result
+
+
+def patterns_to_frame(occurrences):
+    """
+    Expand a structured pattern array into a readable DataFrame
+
+    Args:
+        occurrences (numpy.ndarray): Output of scan_candlestick_patterns
+
+    Returns:
+        pandas.DataFrame: timestamp, pattern, direction columns
+    """
+    frame = pd.DataFrame(occurrences)
+    if frame.empty:
+        return pd.DataFrame(columns=['timestamp', 'pattern', 'direction'])
+    frame['pattern'] = frame['pattern_id'].map(PATTERN_NAMES)
+    return frame[['timestamp', 'pattern', 'direction']]
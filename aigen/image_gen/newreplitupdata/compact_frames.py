@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+# Ordered so that comparisons (e.g. signal >= 'NEUTRAL') read naturally
+SIGNAL_DTYPE = pd.CategoricalDtype(['SELL', 'NEUTRAL', 'BUY'], ordered=True)
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+# Running sums of volume: float32 would round them on long histories
+CUMULATIVE_COLUMNS = ['OBV', 'ADL']
+
+
+class CompactDtypePolicy:
+    """
+    Opt-in memory policy for OHLCV / indicator frames
+
+    Prices and indicator columns are stored as float32, Volume as the
+    smallest signed integer type that holds it (so differences cannot wrap),
+    and signal summaries as an ordered categorical. Cumulative volume
+    columns (OBV, ADL) keep their 64-bit dtype. Downstream code
+    (``PatternDetector``, ``ChartVisualizer``) works on the float32 columns directly; pandas arithmetic with Python
+    scalars keeps float32, so no float64 copies are created.
+    """
+
+    def __init__(self, float_dtype='float32'):
+        self.float_dtype = np.dtype(float_dtype)
+
+    def apply(self, df):
+        """
+        Convert a frame to the compact dtypes
+
+        Args:
+            df (pandas.DataFrame): OHLCV data, with or without indicators
+
+        Returns:
+            pandas.DataFrame: Frame with compact column dtypes
+        """
+        if df is None or df.empty:
+            return df
+
+        dtypes = {}
+        for col in df.columns:
+            dtype = df[col].dtype
+            if col == 'Volume':
+                dtypes[col] = self._volume_dtype(df[col])
+            elif col in CUMULATIVE_COLUMNS:
+                continue
+            elif ((pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype))
+                  and dtype != self.float_dtype):
+                # Integer indicators go to the float dtype too
+                dtypes[col] = self.float_dtype
+            elif pd.api.types.is_object_dtype(dtype) and self._is_signal_column(df[col]):
+                dtypes[col] = SIGNAL_DTYPE
+
+        dtypes = {col: dtype for col, dtype in dtypes.items() if df[col].dtype != dtype}
+        if not dtypes:
+            return df
+        return df.astype(dtypes)
+
+    def compact_signals(self, signals, index=None):
+        """
+        Store signal summaries as categoricals
+
+        Args:
+            signals (dict or list): One ``get_signal_summary`` result, or a
+                list of them (one per bar)
+            index: Optional index for a list of summaries
+
+        Returns:
+            pandas.Series or pandas.DataFrame: Categorical signal values
+        """
+        if isinstance(signals, dict):
+            return pd.Series(signals, dtype=SIGNAL_DTYPE)
+        frame = pd.DataFrame(list(signals), index=index)
+        return frame.astype(SIGNAL_DTYPE)
+
+    def memory_report(self, df):
+        """
+        Report the memory footprint of a frame
+
+        Args:
+            df (pandas.DataFrame): Frame to measure
+
+        Returns:
+            dict: Total bytes, bytes per row, the float64 equivalent and the
+            per-column breakdown
+        """
+        if df is None or df.empty:
+            return {'total_bytes': 0, 'bytes_per_row': 0, 'float64_bytes': 0,
+                    'saved_pct': 0.0, 'columns': {}}
+
+        usage = df.memory_usage(index=True, deep=True)
+        total = int(usage.sum())
+        # Same frame with every numeric column stored as 8-byte values
+        baseline = int(usage.get('Index', 0)) + sum(
+            len(df) * 8 if pd.api.types.is_numeric_dtype(df[col].dtype) else int(usage[col])
+            for col in df.columns
+        )
+        return {
+            'total_bytes': total,
+            'bytes_per_row': total / len(df),
+            'float64_bytes': baseline,
+            'saved_pct': (1 - total / baseline) * 100 if baseline else 0.0,
+            'columns': {col: int(usage[col]) for col in df.columns},
+        }
+
+    def _volume_dtype(self, volume):
+        """Smallest signed integer dtype for whole-number volumes, else the float dtype"""
+        values = volume.to_numpy()
+        if pd.api.types.is_integer_dtype(values.dtype):
+            if values.dtype.kind == 'u' and len(values) and values.max() > np.iinfo(np.int64).max:
+                return values.dtype
+            return pd.to_numeric(volume.astype(np.int64), downcast='integer').dtype
+        if not np.isfinite(values).all() or not (values == np.round(values)).all():
+            return self.float_dtype
+        if not len(values):
+            return np.dtype(np.int8)
+        return np.result_type(np.min_scalar_type(-1), np.min_scalar_type(int(values.min())),
+                              np.min_scalar_type(int(values.max())))
+
+    @staticmethod
+    def _is_signal_column(series):
+        return series.dropna().isin(SIGNAL_DTYPE.categories).all()
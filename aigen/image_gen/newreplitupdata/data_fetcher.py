@@ -5,14 +5,45 @@ from datetime import datetime, timedelta
 import time
 import os
 import streamlit as st
+from ohlcv_store import OHLCVStore
+from av_parser import decode_response, parse_time_series
+from synthetic_market import generate_ohlcv
+from request_pool import UPSTREAM, get_session
+from symbol_directory import get_symbol_directory
 
 class StockDataFetcher:
     """Handles fetching stock data from Alpha Vantage API"""
     
-    def __init__(self):
+    # Bars returned by outputsize='compact'
+    COMPACT_BARS = 100
+    
+    def __init__(self, store=None, directory=None, refresh_listing=True):
+        """
+        Args:
+            store (OHLCVStore): Optional on-disk bar cache. When set, only bars
+                newer than the cached ones are requested and reads are served
+                from the cache while it is younger than one bar interval.
+                Defaults to an OHLCVStore at $OHLCV_CACHE_DIR when that is set
+                (and pyarrow is installed).
+            directory (SymbolDirectory): Listing used by validate_symbol and
+                search_symbols (default: the shared process-wide directory)
+            refresh_listing (bool): Start a background download of the shared
+                listing (one API call) when it is missing or stale. Runs when
+                the fetcher is created, so the listing is ready by the time
+                symbols are validated
+        """
         # Get API key from environment variables with fallback
         self.api_key = os.getenv("ALPHA_VANTAGE_API_KEY", "demo")
         self.base_url = "https://www.alphavantage.co/query"
+        if store is None and os.getenv("OHLCV_CACHE_DIR"):
+            try:
+                store = OHLCVStore(os.getenv("OHLCV_CACHE_DIR"))
+            except ImportError as e:
+                print(f"Error opening the bar cache: {str(e)}")
+        self.store = store
+        if directory is None:
+            directory = get_symbol_directory(auto_refresh=refresh_listing)
+        self._directory = directory
         
     def get_stock_data(self, symbol, interval="1min", outputsize="compact"):
         """
@@ -26,20 +57,25 @@ class StockDataFetcher:
         Returns:
             pandas.DataFrame: Stock data with OHLCV columns
         """
+        cached = self._read_cache(symbol, interval)
+        request_size = self._request_size(symbol, interval, cached, outputsize)
+        if cached is not None and request_size == 'compact' and self._cache_is_fresh(symbol, interval):
+            return self._trim(cached, outputsize)
+        
         try:
+            
             # Parameters for the API call
             params = {
                 'function': 'TIME_SERIES_INTRADAY',
                 'symbol': symbol.upper(),
                 'interval': interval,
                 'apikey': self.api_key,
-                'outputsize': outputsize,
+                'outputsize': request_size,
                 'datatype': 'json'
             }
             
             # Make the API request
-            response = requests.get(self.base_url, params=params, timeout=30)
-            data = response.json()
+            data = self._request(params)
             
             # Check for API errors
             if "Error Message" in data:
@@ -47,31 +83,25 @@ class StockDataFetcher:
                 return None
             
             if "Note" in data:
+                if cached is not None:
+                    st.warning("API call frequency limit reached. Using cached data.")
+                    return self._trim(cached, outputsize)
                 st.warning("API call frequency limit reached. Using demo data.")
                 return self._get_demo_data()
             
             # Extract time series data
             time_series_key = f'Time Series ({interval})'
             if time_series_key not in data:
+                if cached is not None:
+                    return self._trim(cached, outputsize)
                 st.warning("No data found. Using demo data for demonstration.")
                 return self._get_demo_data()
             
-            time_series = data[time_series_key]
-            
-            # Convert to DataFrame
-            df = pd.DataFrame.from_dict(time_series, orient='index')
+            df = self._parse_time_series(data[time_series_key])
+            df, coverage = self._fill_gap(params, time_series_key, df, cached)
             
-            # Rename columns
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            
-            # Convert data types
-            df = df.astype(float)
-            
-            # Convert index to datetime
-            df.index = pd.to_datetime(df.index)
-            
-            # Sort by date (oldest first)
-            df = df.sort_index()
+            if self.store is not None:
+                df = self._trim(self.store.write(symbol, interval, df, coverage), outputsize)
             
             # Ensure we have enough data points
             if len(df) < 50:
@@ -81,52 +111,94 @@ class StockDataFetcher:
             
         except requests.exceptions.RequestException as e:
             st.error(f"Network error: {str(e)}")
-            return self._get_demo_data()
+            return self._trim(cached, outputsize) if cached is not None else self._get_demo_data()
         except Exception as e:
             st.error(f"Error fetching data: {str(e)}")
-            return self._get_demo_data()
+            return self._trim(cached, outputsize) if cached is not None else self._get_demo_data()
+    
+    def _request(self, params, timeout=30):
+        """
+        Call the API through the shared session, joining an identical request
+        already in flight in this process instead of spending another call
+        
+        Args:
+            params (dict): Query parameters
+            timeout (int): Request timeout in seconds
+        
+        Returns:
+            dict: Decoded payload
+        """
+        key = (params.get('function'), params.get('symbol'), params.get('interval'),
+               params.get('outputsize'))
+        
+        def fetch():
+            response = get_session().get(self.base_url, params=params, timeout=timeout)
+            return decode_response(response)
+        
+        return UPSTREAM.do(key, fetch)
+    
+    def _parse_time_series(self, time_series):
+        """Convert an Alpha Vantage time series object to an OHLCV DataFrame (oldest first)"""
+        return parse_time_series(time_series)
+    
+    def _request_size(self, symbol, interval, cached, outputsize):
+        """
+        outputsize to request: only the newest bars when the cache already
+        covers what the caller asked for, the full history when it does not
+        """
+        if cached is None or outputsize == 'full' and self.store.coverage(symbol, interval) != 'full':
+            return outputsize
+        return 'compact'
+    
+    def _fill_gap(self, params, time_series_key, df, cached):
+        """
+        Re-request the full series when a compact response does not reach the cached bars
+        
+        Returns:
+            tuple: (bars, outputsize they cover)
+        """
+        if cached is None or params['outputsize'] != 'compact' or df.index[0] <= cached.index[-1]:
+            return df, params['outputsize']
+        
+        data = self._request({**params, 'outputsize': 'full'})
+        if time_series_key not in data:
+            return df, 'compact'
+        return self._parse_time_series(data[time_series_key]), 'full'
+    
+    def _read_cache(self, symbol, interval):
+        """Cached bars for a series, or None when caching is off or empty"""
+        if self.store is None:
+            return None
+        cached = self.store.read(symbol, interval)
+        return cached if cached is not None and not cached.empty else None
+    
+    def _cache_is_fresh(self, symbol, interval):
+        """Whether the cached series was written less than one bar interval ago"""
+        age = self.store.age(symbol, interval)
+        if age is None:
+            return False
+        if interval == 'daily':
+            return age < 3600
+        return age < int(interval.replace('min', '')) * 60
+    
+    def _trim(self, df, outputsize):
+        """Limit a cached series to what the requested outputsize returns"""
+        if df is None or outputsize == 'full':
+            return df
+        return df.tail(self.COMPACT_BARS)
     
     def _get_demo_data(self):
         """
         Generate demo data for testing purposes when API is unavailable
         """
-        # Generate realistic stock data
-        np.random.seed(42)  # For reproducible results
-        
         # Create datetime index for the last 100 minutes
         end_time = datetime.now()
         start_time = end_time - timedelta(minutes=100)
-        date_range = pd.date_range(start=start_time, end=end_time, freq='1T')
-        
-        # Generate realistic price movements
-        base_price = 150.0
-        returns = np.random.normal(0, 0.002, len(date_range))  # 0.2% volatility
-        prices = [base_price]
-        
-        for ret in returns[1:]:
-            new_price = prices[-1] * (1 + ret)
-            prices.append(new_price)
-        
-        # Create OHLCV data
-        data = []
-        for i, price in enumerate(prices):
-            # Generate realistic OHLC from the base price
-            high = price * (1 + abs(np.random.normal(0, 0.001)))
-            low = price * (1 - abs(np.random.normal(0, 0.001)))
-            open_price = prices[i-1] if i > 0 else price
-            close_price = price
-            volume = np.random.randint(1000, 10000)
-            
-            data.append({
-                'Open': open_price,
-                'High': max(open_price, high, close_price),
-                'Low': min(open_price, low, close_price),
-                'Close': close_price,
-                'Volume': volume
-            })
-        
-        df = pd.DataFrame(data, index=date_range)
-        return df
+        date_range = pd.date_range(start=start_time, end=end_time, freq='1min')
+
+        # 0.2% volatility random walk from 150, seeded for reproducible results
+        return generate_ohlcv(len(date_range), start_price=150.0, volatility=0.002,
+                              wick=0.001, volume=(1000, 10000), index=date_range, seed=42)
     
     def get_daily_data(self, symbol, outputsize="compact"):
         """
@@ -139,47 +211,68 @@ class StockDataFetcher:
         Returns:
             pandas.DataFrame: Daily stock data
         """
+        cached = self._read_cache(symbol, 'daily')
+        request_size = self._request_size(symbol, 'daily', cached, outputsize)
+        if cached is not None and request_size == 'compact' and self._cache_is_fresh(symbol, 'daily'):
+            return self._trim(cached, outputsize)
+        
         try:
             params = {
                 'function': 'TIME_SERIES_DAILY',
                 'symbol': symbol.upper(),
                 'apikey': self.api_key,
-                'outputsize': outputsize,
+                'outputsize': request_size,
                 'datatype': 'json'
             }
             
-            response = requests.get(self.base_url, params=params, timeout=30)
-            data = response.json()
+            data = self._request(params)
             
             if "Time Series (Daily)" not in data:
-                return None
+                return self._trim(cached, outputsize)
+            
+            df = self._parse_time_series(data["Time Series (Daily)"])
+            df, coverage = self._fill_gap(params, "Time Series (Daily)", df, cached)
             
-            time_series = data["Time Series (Daily)"]
-            df = pd.DataFrame.from_dict(time_series, orient='index')
-            df.columns = ['Open', 'High', 'Low', 'Close', 'Volume']
-            df = df.astype(float)
-            df.index = pd.to_datetime(df.index)
-            df = df.sort_index()
+            if self.store is not None:
+                df = self._trim(self.store.write(symbol, 'daily', df, coverage), outputsize)
             
             return df
             
         except Exception as e:
             st.error(f"Error fetching daily data: {str(e)}")
-            return None
+            return self._trim(cached, outputsize)
+    
+    @property
+    def directory(self):
+        return self._directory
     
     def validate_symbol(self, symbol):
         """
         Validate if a stock symbol exists
         
+        Checked against the local symbol directory only; no API call is made.
+        
         Args:
             symbol (str): Stock symbol to validate
         
         Returns:
-            bool: True if valid, False otherwise
+            bool: True if valid, False otherwise, None while the directory is
+            unavailable (no listing downloaded yet)
         """
-        try:
-            # Try to fetch a small amount of data
-            data = self.get_stock_data(symbol, outputsize="compact")
-            return data is not None and not data.empty
-        except:
-            return False
+        if not self.directory.loaded:
+            st.warning("Symbol directory unavailable; the symbol could not be validated yet.")
+            return None
+        return self.directory.contains(symbol)
+    
+    def search_symbols(self, query, limit=10):
+        """
+        Autocomplete a partial ticker or company name
+        
+        Args:
+            query (str): What the user typed so far
+            limit (int): Maximum suggestions
+        
+        Returns:
+            list: Dicts with symbol, name, exchange, asset_type and ipo_date
+        """
+        return self.directory.search(query, limit=limit)
@@ -0,0 +1,167 @@
+"""
+Server-side downsampling of bar data for charting
+
+A chart never shows more bars than it has pixels, so large frames are
+reduced before they reach Plotly:
+
+* ``ohlc_buckets`` merges consecutive bars into equal-count buckets
+  (first Open, max High, min Low, last Close, summed Volume), which keeps
+  every wick extreme visible.
+* ``lttb_indices`` picks the points of a line with Largest-Triangle-Three-
+  Buckets, which keeps its visual shape (peaks, troughs) with ~2 points per
+  pixel.
+* ``viewport`` cuts the frame to the visible x-range first, so zooming in
+  re-requests full detail for just that range.
+"""
+import numpy as np
+import pandas as pd
+
+
+def viewport(df, x_range=None):
+    """
+    Rows inside the visible x-range, plus one bar either side so lines reach the edges
+
+    Args:
+        df (pandas.DataFrame): Data indexed by timestamp (sorted)
+        x_range (tuple): (start, end) timestamps or strings; None keeps everything
+
+    Returns:
+        pandas.DataFrame: The visible slice
+    """
+    if x_range is None:
+        return df
+    start, end = pd.Timestamp(x_range[0]), pd.Timestamp(x_range[1])
+    lo = max(int(df.index.searchsorted(start, side='left')) - 1, 0)
+    hi = min(int(df.index.searchsorted(end, side='right')) + 1, len(df))
+    return df.iloc[lo:hi]
+
+
+def viewport_from_relayout(relayout_data):
+    """
+    Visible x-range from a Plotly relayout event (e.g. Dash ``relayoutData``)
+
+    Returns:
+        tuple: (start, end), or None for autorange / no zoom
+    """
+    if not relayout_data or relayout_data.get('xaxis.autorange'):
+        return None
+    if 'xaxis.range[0]' in relayout_data:
+        return relayout_data['xaxis.range[0]'], relayout_data['xaxis.range[1]']
+    if 'xaxis.range' in relayout_data:
+        return tuple(relayout_data['xaxis.range'])
+    return None
+
+
+def _bucket_starts(n_rows, n_buckets):
+    return np.unique(np.arange(n_buckets) * n_rows // n_buckets)
+
+
+def ohlc_buckets(df, n_buckets):
+    """
+    Aggregate consecutive bars into at most ``n_buckets`` OHLC bars
+
+    Other columns (indicators) take the bucket's last value.
+
+    Args:
+        df (pandas.DataFrame): OHLCV data
+        n_buckets (int): Target bar count
+
+    Returns:
+        pandas.DataFrame: Aggregated bars indexed by each bucket's first timestamp
+            (``df`` itself when it is already small enough)
+    """
+    n_rows = len(df)
+    if n_buckets <= 0 or n_rows <= n_buckets:
+        return df
+
+    starts = _bucket_starts(n_rows, n_buckets)
+    ends = np.append(starts[1:], n_rows) - 1
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if column == 'Open':
+            columns[column] = values[starts]
+        elif column == 'High':
+            columns[column] = np.fmax.reduceat(values.astype(np.float64), starts)
+        elif column == 'Low':
+            columns[column] = np.fmin.reduceat(values.astype(np.float64), starts)
+        elif column == 'Volume':
+            columns[column] = np.add.reduceat(np.nan_to_num(values.astype(np.float64)), starts)
+        else:
+            columns[column] = values[ends]
+    return pd.DataFrame(columns, index=df.index[starts])
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets point selection
+
+    Args:
+        x (numpy.ndarray): Increasing float x values
+        y (numpy.ndarray): Finite y values
+        n_out (int): Points to keep (including the first and last)
+
+    Returns:
+        numpy.ndarray: Sorted positions of the kept points
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # n_out - 2 buckets between the fixed first and last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    next_starts = edges[1:]
+    next_ends = np.append(edges[2:], n)
+    # Average of the bucket after each bucket, from prefix sums
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    counts = next_ends - next_starts
+    avg_x = (cum_x[next_ends] - cum_x[next_starts]) / counts
+    avg_y = (cum_y[next_ends] - cum_y[next_starts]) / counts
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - avg_x[i]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (avg_y[i] - ay))
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def lttb_positions(series, n_out):
+    """
+    Row positions LTTB keeps for a series, ignoring NaN (indicator warm-up) rows
+
+    Args:
+        series (pandas.Series): Values indexed by timestamp
+        n_out (int): Points to keep
+
+    Returns:
+        numpy.ndarray: Sorted row positions
+    """
+    values = series.to_numpy(dtype=np.float64)
+    if len(values) <= n_out:
+        return np.arange(len(values))
+
+    valid = np.flatnonzero(np.isfinite(values))
+    if isinstance(series.index, pd.DatetimeIndex):
+        x = series.index.asi8[valid].astype(np.float64)
+        x -= x[0] if len(x) else 0.0
+    else:
+        x = valid.astype(np.float64)
+    return valid[lttb_indices(x, values[valid], n_out)]
+
+
+def lttb(series, n_out):
+    """
+    Downsample a time series with LTTB
+
+    Returns:
+        tuple: (x, y) arrays ready for a Plotly trace
+    """
+    positions = lttb_positions(series, n_out)
+    return series.index[positions], series.to_numpy()[positions]
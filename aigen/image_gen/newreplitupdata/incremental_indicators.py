@@ -0,0 +1,481 @@
+import math
+from collections import deque
+
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+# Rows holding a zero, NaN or overflowing value are removed by ``ta.utils.dropna``
+# before the batch path runs, so the incremental path skips them as well.
+_DROPNA_LIMIT = math.exp(709)
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+INDICATOR_COLUMNS = [
+    # Trend
+    'SMA_10', 'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'EMA_50',
+    'MACD', 'MACD_signal', 'MACD_histogram', 'ADX', 'PSAR',
+    # Momentum
+    'RSI', 'STOCH_k', 'STOCH_d', 'WILLIAMS_R', 'ROC', 'MFI',
+    # Volatility
+    'BB_upper', 'BB_middle', 'BB_lower', 'BB_width', 'BB_percent',
+    'ATR', 'KC_upper', 'KC_middle', 'KC_lower',
+    # Volume
+    'OBV', 'ADL', 'CMF', 'Volume_SMA',
+    # Others
+    'Price_change', 'Price_change_abs', 'HL_pct', 'Close_position',
+    'Volume_change', 'Momentum_5', 'Volatility',
+]
+
+NAN = float('nan')
+
+
+def _div(numerator, denominator):
+    """Divide with NumPy semantics (inf / NaN instead of ZeroDivisionError)"""
+    return float(np.float64(numerator) / denominator)
+
+
+class _Window:
+    """Fixed-size window over the most recent values"""
+
+    __slots__ = ('values', 'size')
+
+    def __init__(self, size):
+        self.size = size
+        self.values = deque(maxlen=size)
+
+    def push(self, value):
+        self.values.append(value)
+
+    def full(self):
+        return len(self.values) == self.size
+
+    def last(self, offset=0):
+        """Value ``offset`` bars before the newest one, NaN if not available"""
+        if offset >= len(self.values):
+            return NAN
+        return self.values[-1 - offset]
+
+    def mean(self, min_periods=None):
+        count = len(self.values)
+        if count < (self.size if min_periods is None else max(min_periods, 1)):
+            return NAN
+        return sum(self.values) / count
+
+    def total(self):
+        if not self.full():
+            return NAN
+        return sum(self.values)
+
+    def std(self, ddof):
+        if not self.full():
+            return NAN
+        mean = sum(self.values) / self.size
+        variance = sum((value - mean) ** 2 for value in self.values) / (self.size - ddof)
+        return math.sqrt(variance)
+
+    def min(self):
+        return min(self.values) if self.full() else NAN
+
+    def max(self):
+        return max(self.values) if self.full() else NAN
+
+
+class _EMA:
+    """Running ``ewm(adjust=False)`` mean with pandas' ``min_periods`` masking"""
+
+    __slots__ = ('alpha', 'min_periods', 'raw', 'count')
+
+    def __init__(self, alpha, min_periods):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.raw = NAN
+        self.count = 0
+
+    @classmethod
+    def from_span(cls, span):
+        return cls(2.0 / (span + 1.0), span)
+
+    def update(self, value):
+        # Only leading NaNs reach here (MACD warm-up); they do not start the average
+        if value != value:
+            return self.value
+        if self.count == 0:
+            self.raw = value
+        else:
+            self.raw = (1.0 - self.alpha) * self.raw + self.alpha * value
+        self.count += 1
+        return self.value
+
+    @property
+    def value(self):
+        return self.raw if self.count >= self.min_periods else NAN
+
+
+class IncrementalIndicatorEngine:
+    """
+    Stateful counterpart of ``TechnicalAnalyzer.add_all_indicators``
+
+    Every indicator keeps its running state (EMA / Wilder averages, cumulative
+    OBV and ADL, PSAR trend state and fixed-size rolling windows), so appending
+    one bar costs O(1) regardless of how much history has been seen. Once the
+    history covers the longest warm-up (``2 * 14`` bars for ADX) the produced
+    rows match the batch path to floating point tolerance.
+    """
+
+    def __init__(self, keep_history=True):
+        """
+        Args:
+            keep_history (bool): Keep every produced row so ``to_frame`` can
+                rebuild the full indicator frame
+        """
+        self.keep_history = keep_history
+        self.bar_count = 0
+        self._index = []
+        self._rows = []
+        self._prev = None
+
+        # Trend
+        self._close_10 = _Window(10)
+        self._close_20 = _Window(20)
+        self._close_50 = _Window(50)
+        self._ema_12 = _EMA.from_span(12)
+        self._ema_26 = _EMA.from_span(26)
+        self._ema_50 = _EMA.from_span(50)
+        self._macd_signal = _EMA.from_span(9)
+        self._adx_window = 14
+        self._adx_seed = {'tr': 0.0, 'pos': 0.0, 'neg': 0.0}
+        self._adx_trs = NAN
+        self._adx_dip = NAN
+        self._adx_din = NAN
+        self._adx_di_seed = []
+        self._adx = 0.0
+        self._psar_step = 0.02
+        self._psar_max_step = 0.20
+        self._psar_state = None
+
+        # Momentum
+        self._rsi_up = _EMA(1.0 / 14, 14)
+        self._rsi_down = _EMA(1.0 / 14, 14)
+        self._high_14 = _Window(14)
+        self._low_14 = _Window(14)
+        self._stoch_k_3 = _Window(3)
+        self._close_12 = _Window(12)
+        self._money_flow_14 = _Window(14)
+
+        # Volatility
+        self._true_range_seed = []
+        self._atr = 0.0
+        self._typical_20 = _Window(20)
+        self._typical_high_20 = _Window(20)
+        self._typical_low_20 = _Window(20)
+
+        # Volume
+        self._obv = 0.0
+        self._adl = 0.0
+        self._money_flow_volume_20 = _Window(20)
+        self._volume_20 = _Window(20)
+
+    def append(self, df):
+        """
+        Feed a block of new bars through the engine
+
+        Args:
+            df (pandas.DataFrame): OHLCV bars newer than any bar seen so far
+
+        Returns:
+            pandas.DataFrame: OHLCV plus indicator columns for the appended bars
+        """
+        index = []
+        rows = []
+        if df is None or df.empty:
+            return pd.DataFrame(columns=OHLCV_COLUMNS + INDICATOR_COLUMNS)
+
+        for timestamp, o, h, l, c, v in df[OHLCV_COLUMNS].itertuples(name=None):
+            row = self.update(timestamp, o, h, l, c, v)
+            if row is not None:
+                index.append(timestamp)
+                rows.append(row)
+
+        return pd.DataFrame(rows, index=pd.Index(index, name=df.index.name),
+                            columns=OHLCV_COLUMNS + INDICATOR_COLUMNS)
+
+    def update(self, timestamp, open_price, high, low, close, volume):
+        """
+        Add one bar and return its indicator row
+
+        Args:
+            timestamp: Index label of the bar
+            open_price, high, low, close, volume (float): Bar values
+
+        Returns:
+            tuple: OHLCV followed by ``INDICATOR_COLUMNS`` values, or None when
+            the bar would be dropped by ``ta.utils.dropna``
+        """
+        bar = (float(open_price), float(high), float(low), float(close), float(volume))
+        if not all(value < _DROPNA_LIMIT and value != 0.0 for value in bar):
+            return None
+
+        o, h, l, c, v = bar
+        prev = self._prev
+
+        row = bar + (
+            self._trend(h, l, c, prev)
+            + self._momentum(h, l, c, v, prev)
+            + self._volatility(h, l, c, prev)
+            + self._volume(h, l, c, v, prev)
+            + self._other(h, l, c, v, prev)
+        )
+
+        self._prev = bar
+        self.bar_count += 1
+        if self.keep_history:
+            self._index.append(timestamp)
+            self._rows.append(row)
+        return row
+
+    def to_frame(self, tail=None):
+        """
+        Build the indicator frame from the retained history
+
+        Args:
+            tail (int): Only return the newest ``tail`` rows
+
+        Returns:
+            pandas.DataFrame: Same layout as ``add_all_indicators`` output
+        """
+        index = self._index if tail is None else self._index[-tail:]
+        rows = self._rows if tail is None else self._rows[-tail:]
+        return pd.DataFrame(rows, index=pd.Index(index),
+                            columns=OHLCV_COLUMNS + INDICATOR_COLUMNS)
+
+    def _trend(self, h, l, c, prev):
+        """Update SMA / EMA / MACD / ADX / PSAR state"""
+        self._close_10.push(c)
+        self._close_20.push(c)
+        self._close_50.push(c)
+
+        ema_12 = self._ema_12.update(c)
+        ema_26 = self._ema_26.update(c)
+        ema_50 = self._ema_50.update(c)
+
+        macd_line = ema_12 - ema_26
+        macd_signal = self._macd_signal.update(macd_line)
+
+        # Column names mirror the batch path (MACD holds the histogram)
+        return (
+            self._close_10.mean(), self._close_20.mean(), self._close_50.mean(),
+            ema_12, ema_26, ema_50,
+            macd_line - macd_signal, macd_signal, macd_line,
+            self._update_adx(h, l, prev),
+            self._update_psar(h, l, c),
+        )
+
+    def _update_adx(self, h, l, prev):
+        """Wilder-smoothed ADX following ``ta.trend.ADXIndicator``"""
+        window = self._adx_window
+        i = self.bar_count
+        if prev is None:
+            return 0.0
+
+        prev_high, prev_low, prev_close = prev[1], prev[2], prev[3]
+        true_range = max(h, prev_close) - min(l, prev_close)
+        diff_up = h - prev_high
+        diff_down = prev_low - l
+        pos = diff_up if (diff_up > diff_down and diff_up > 0) else 0.0
+        neg = diff_down if (diff_down > diff_up and diff_down > 0) else 0.0
+
+        if i <= window:
+            self._adx_seed['tr'] += true_range
+            self._adx_seed['pos'] += pos
+            self._adx_seed['neg'] += neg
+            if i < window:
+                return 0.0
+            self._adx_trs = self._adx_seed['tr']
+            self._adx_dip = self._adx_seed['pos']
+            self._adx_din = self._adx_seed['neg']
+        else:
+            self._adx_trs = self._adx_trs - self._adx_trs / window + true_range
+            self._adx_dip = self._adx_dip - self._adx_dip / window + pos
+            self._adx_din = self._adx_din - self._adx_din / window + neg
+
+        trs = self._adx_trs
+        dip = 100 * (self._adx_dip / trs) if trs != 0 else 0.0
+        din = 100 * (self._adx_din / trs) if trs != 0 else 0.0
+        directional_index = 100 * abs((dip - din) / (dip + din)) if dip + din != 0 else 0.0
+
+        if len(self._adx_di_seed) < window:
+            self._adx_di_seed.append(directional_index)
+            if len(self._adx_di_seed) < window:
+                return 0.0
+            self._adx = sum(self._adx_di_seed) / window
+            return self._adx
+
+        self._adx = (self._adx * (window - 1) + directional_index) / window
+        return self._adx
+
+    def _update_psar(self, h, l, c):
+        """Parabolic SAR state machine following ``ta.trend.PSARIndicator``"""
+        state = self._psar_state
+        if state is None:
+            self._psar_state = {
+                'up_trend': True,
+                'acceleration': self._psar_step,
+                'up_trend_high': h,
+                'down_trend_low': l,
+                'psar': c,
+                'highs': deque([h], maxlen=2),
+                'lows': deque([l], maxlen=2),
+            }
+            return NAN
+
+        highs, lows = state['highs'], state['lows']
+        if len(highs) < 2:
+            state['psar'] = c
+            highs.append(h)
+            lows.append(l)
+            return NAN
+
+        reversal = False
+        prev_psar = state['psar']
+        if state['up_trend']:
+            psar = prev_psar + state['acceleration'] * (state['up_trend_high'] - prev_psar)
+            if l < psar:
+                reversal = True
+                psar = state['up_trend_high']
+                state['down_trend_low'] = l
+                state['acceleration'] = self._psar_step
+            else:
+                if h > state['up_trend_high']:
+                    state['up_trend_high'] = h
+                    state['acceleration'] = min(state['acceleration'] + self._psar_step,
+                                                self._psar_max_step)
+                low2, low1 = lows[0], lows[1]
+                if low2 < psar:
+                    psar = low2
+                elif low1 < psar:
+                    psar = low1
+        else:
+            psar = prev_psar - state['acceleration'] * (prev_psar - state['down_trend_low'])
+            if h > psar:
+                reversal = True
+                psar = state['down_trend_low']
+                state['up_trend_high'] = h
+                state['acceleration'] = self._psar_step
+            else:
+                if l < state['down_trend_low']:
+                    state['down_trend_low'] = l
+                    state['acceleration'] = min(state['acceleration'] + self._psar_step,
+                                                self._psar_max_step)
+                high2, high1 = highs[0], highs[1]
+                if high2 > psar:
+                    psar = high2
+                elif high1 > psar:
+                    psar = high1
+
+        state['up_trend'] = state['up_trend'] != reversal
+        state['psar'] = psar
+        highs.append(h)
+        lows.append(l)
+        return NAN if state['up_trend'] else psar
+
+    def _momentum(self, h, l, c, v, prev):
+        """Update RSI / stochastic / Williams %R / ROC / MFI state"""
+        diff = c - prev[3] if prev is not None else 0.0
+        up = self._rsi_up.update(diff if diff > 0 else 0.0)
+        down = self._rsi_down.update(-diff if diff < 0 else 0.0)
+        if down == 0:
+            rsi = 100.0
+        else:
+            rsi = 100 - 100 / (1 + up / down) if down == down else NAN
+
+        self._high_14.push(h)
+        self._low_14.push(l)
+        highest, lowest = self._high_14.max(), self._low_14.min()
+        stoch_k = _div(100 * (c - lowest), highest - lowest)
+        self._stoch_k_3.push(stoch_k)
+        williams_r = _div(-100 * (highest - c), highest - lowest)
+
+        close_12_ago = self._close_12.last(11)
+        roc = _div(c - close_12_ago, close_12_ago) * 100
+        self._close_12.push(c)
+
+        typical = (h + l + c) / 3.0
+        prev_typical = (prev[1] + prev[2] + prev[3]) / 3.0 if prev is not None else NAN
+        direction = 1 if typical > prev_typical else (-1 if typical < prev_typical else 0)
+        self._money_flow_14.push(typical * v * direction)
+        if self._money_flow_14.full():
+            positive = sum(x for x in self._money_flow_14.values if x >= 0.0)
+            negative = abs(sum(x for x in self._money_flow_14.values if x < 0.0))
+            mfi = 100 - 100 / (1 + _div(positive, negative))
+        else:
+            mfi = NAN
+
+        return (rsi, stoch_k, self._stoch_k_3.mean(), williams_r, roc, mfi)
+
+    def _volatility(self, h, l, c, prev):
+        """Update Bollinger / ATR / Keltner state"""
+        middle = self._close_20.mean()
+        deviation = self._close_20.std(ddof=0)
+        upper = middle + 2 * deviation
+        lower = middle - 2 * deviation
+        width = _div(upper - lower, middle) * 100
+        percent = _div(c - lower, upper - lower) if upper != lower else NAN
+
+        if prev is None:
+            true_range = h - l
+        else:
+            true_range = max(h - l, abs(h - prev[3]), abs(l - prev[3]))
+        if len(self._true_range_seed) < 14:
+            self._true_range_seed.append(true_range)
+            if len(self._true_range_seed) == 14:
+                self._atr = sum(self._true_range_seed) / 14
+        else:
+            self._atr = (self._atr * 13 + true_range) / 14.0
+
+        self._typical_20.push((h + l + c) / 3.0)
+        self._typical_high_20.push(((4 * h) - (2 * l) + c) / 3.0)
+        self._typical_low_20.push(((-2 * h) + (4 * l) + c) / 3.0)
+
+        return (
+            upper, middle, lower, width, percent, self._atr,
+            self._typical_high_20.mean(min_periods=0),
+            self._typical_20.mean(),
+            self._typical_low_20.mean(min_periods=0),
+        )
+
+    def _volume(self, h, l, c, v, prev):
+        """Update OBV / ADL / CMF / volume SMA state"""
+        self._obv += -v if (prev is not None and c < prev[3]) else v
+
+        close_location = _div((c - l) - (h - c), h - l)
+        if close_location != close_location:
+            close_location = 0.0
+        self._adl += close_location * v
+
+        self._money_flow_volume_20.push(close_location * v)
+        self._volume_20.push(v)
+        cmf = _div(self._money_flow_volume_20.total(), self._volume_20.total())
+
+        return (self._obv, self._adl, cmf, self._volume_20.mean())
+
+    def _other(self, h, l, c, v, prev):
+        """Update the remaining price / volume derived columns"""
+        if prev is None:
+            price_change = NAN
+            volume_change = NAN
+        else:
+            price_change = c / prev[3] - 1
+            volume_change = v / prev[4] - 1
+
+        close_5_ago = self._close_10.last(5)
+        return (
+            price_change,
+            abs(price_change),
+            (h - l) / c,
+            _div(c - l, h - l),
+            volume_change,
+            c / close_5_ago - 1,
+            self._close_20.std(ddof=1),
+        )
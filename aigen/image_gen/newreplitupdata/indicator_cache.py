@@ -0,0 +1,224 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from incremental_indicators import IncrementalIndicatorEngine, OHLCV_COLUMNS
+
+
+class _CacheEntry:
+    """Cached indicator frame plus what is needed to extend it"""
+
+    __slots__ = ('result', 'nbytes', 'rows', 'series_key', 'engine')
+
+    def __init__(self, result, rows, series_key, engine=None):
+        self.result = result
+        self.nbytes = int(result.memory_usage(index=True, deep=True).sum())
+        self.rows = rows
+        self.series_key = series_key
+        self.engine = engine
+
+
+class IndicatorCache:
+    """
+    Process-wide, content-addressed cache of indicator frames
+
+    Entries are keyed by a BLAKE2 hash of the window (index, OHLCV values and
+    every other column ``compute`` may read), the column dtypes and the
+    indicator parameter set, bounded by the total size of the cached frames
+    and evicted least-recently-used first. When a lookup misses but an
+    earlier entry covers a prefix of the new window (the frame only grew by a
+    few bars), the cached result is extended with
+    ``IncrementalIndicatorEngine`` instead of being recomputed, and the
+    extended entry replaces the one it grew from.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, max_extend_rows=500):
+        """
+        Args:
+            max_bytes (int): Upper bound on the memory held by cached frames
+            max_extend_rows (int): Largest growth served by extending an entry
+        """
+        self.max_bytes = max_bytes
+        self.max_extend_rows = max_extend_rows
+        self._entries = OrderedDict()
+        self._latest = {}
+        self._lock = threading.RLock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.extensions = 0
+        self.evictions = 0
+
+    def get_or_compute(self, df, params, compute):
+        """
+        Return the indicator frame for ``df``, computing it only when needed
+
+        Args:
+            df (pandas.DataFrame): OHLCV data
+            params (tuple): Hashable description of the indicator set
+            compute (callable): ``compute(df)`` producing the full result
+
+        Returns:
+            pandas.DataFrame: A private copy of the indicator frame
+        """
+        index_bytes, values = self._fingerprint_arrays(df)
+        rows = len(values)
+        # Values are hashed as float64, so the dtypes tell e.g. int and float Volume apart
+        dtypes = tuple(str(dtype) for dtype in df.dtypes)
+        key = (params, tuple(df.columns), dtypes, self._digest(index_bytes, values, rows),
+               self._extra_digest(df))
+        series_key = (params, tuple(df.columns), dtypes, df.index[0] if rows else None)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.result.copy()
+            self.misses += 1
+            base_key = self._latest.get(series_key)
+            base = self._entries.get(base_key) if base_key is not None else None
+            engine = None
+            if base is not None and self._can_extend(base, base_key, df, index_bytes, values, rows):
+                # Hand the running engine state over to the entry being created
+                engine, base.engine = base.engine, None
+            else:
+                base = None
+
+        result = None
+        if base is not None:
+            result, engine = self._extend(base, df, engine)
+
+        if result is None:
+            result = compute(df)
+            if result is None:
+                return result
+
+        with self._lock:
+            if engine is not None:
+                self.extensions += 1
+                # The extended frame supersedes its prefix; keeping both would
+                # grow memory with every refresh and evict other symbols
+                self._drop(base_key)
+            self._store(key, _CacheEntry(result, rows, series_key, engine))
+        return result.copy()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Hit/miss/extension/eviction counters and memory use
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'extensions': self.extensions,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.extensions = self.evictions = 0
+
+    def _can_extend(self, base, base_key, df, index_bytes, values, rows):
+        """Whether ``base`` covers a short prefix of ``df``"""
+        grown = rows - base.rows
+        if grown <= 0 or grown > self.max_extend_rows or list(df.columns) != OHLCV_COLUMNS:
+            return False
+        row_width = len(index_bytes) // rows
+        prefix_digest = self._digest(index_bytes[:row_width * base.rows], values, base.rows)
+        return base_key[3] == prefix_digest
+
+    def _extend(self, base, df, engine):
+        """Append the bars after ``base`` to its cached result"""
+        if engine is None:
+            # First extension of a batch result: replay it once to seed the state
+            engine = IncrementalIndicatorEngine(keep_history=False)
+            engine.append(base.result[OHLCV_COLUMNS])
+
+        new_rows = engine.append(df.iloc[base.rows:])
+        new_rows = new_rows.reindex(columns=base.result.columns)
+        # The engine works in float64; keep the batch result's dtypes (int64
+        # Volume/OBV, ...) so an extended hit matches an uncached compute
+        for column, dtype in base.result.dtypes.items():
+            if new_rows[column].dtype != dtype and not (dtype.kind in 'iub' and new_rows[column].isna().any()):
+                new_rows[column] = new_rows[column].astype(dtype)
+        return pd.concat([base.result, new_rows]), engine
+
+    def _drop(self, key):
+        """Remove one entry (no-op when it was already evicted)"""
+        old = self._entries.pop(key, None)
+        if old is None:
+            return
+        self.current_bytes -= old.nbytes
+        if self._latest.get(old.series_key) == key:
+            del self._latest[old.series_key]
+
+    def _store(self, key, entry):
+        """Insert an entry and evict least-recently-used ones over budget"""
+        if entry.nbytes > self.max_bytes:
+            return
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.current_bytes -= previous.nbytes
+
+        self._entries[key] = entry
+        self.current_bytes += entry.nbytes
+        latest_key = self._latest.get(entry.series_key)
+        latest = self._entries.get(latest_key) if latest_key is not None else None
+        if latest is None or latest.rows <= entry.rows:
+            self._latest[entry.series_key] = key
+
+        while self.current_bytes > self.max_bytes and self._entries:
+            old_key, old = self._entries.popitem(last=False)
+            self.current_bytes -= old.nbytes
+            self.evictions += 1
+            if self._latest.get(old.series_key) == old_key:
+                del self._latest[old.series_key]
+
+    @staticmethod
+    def _fingerprint_arrays(df):
+        """Index bytes and a C-contiguous float copy of the OHLCV values"""
+        if isinstance(df.index, pd.DatetimeIndex):
+            index_values = df.index.asi8
+        else:
+            index_values = pd.util.hash_pandas_object(df.index, index=False).to_numpy()
+        columns = [col for col in OHLCV_COLUMNS if col in df.columns]
+        values = np.ascontiguousarray(df[columns].to_numpy(dtype=np.float64))
+        return np.ascontiguousarray(index_values).tobytes(), values
+
+    @staticmethod
+    def _extra_digest(df):
+        """Hash of the non-OHLCV columns (None when there are none)"""
+        extra = [col for col in df.columns if col not in OHLCV_COLUMNS]
+        if not extra:
+            return None
+        digest = hashlib.blake2b(digest_size=16)
+        for col in extra:
+            digest.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().data)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _digest(index_bytes, values, rows):
+        """Hash the first ``rows`` bars"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(index_bytes)
+        digest.update(values[:rows].data)
+        return digest.hexdigest()
+
+
+# Shared by every TechnicalAnalyzer created with use_cache=True
+INDICATOR_CACHE = IndicatorCache()
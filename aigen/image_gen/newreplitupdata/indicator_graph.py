@@ -0,0 +1,231 @@
+import math
+
+import numpy as np
+import pandas as pd
+import ta
+from ta.utils import dropna
+import warnings
+warnings.filterwarnings('ignore')
+
+from incremental_indicators import INDICATOR_COLUMNS, OHLCV_COLUMNS
+
+
+class IndicatorNode:
+    """One column (or shared intermediate) in the indicator graph"""
+
+    def __init__(self, name, dependencies, func):
+        self.name = name
+        self.dependencies = tuple(dependencies)
+        self.func = func
+
+    @property
+    def is_intermediate(self):
+        return self.name.startswith('_')
+
+
+class IndicatorGraph:
+    """
+    Dependency graph over the columns produced by ``TechnicalAnalyzer``
+
+    Each node lists the OHLCV columns, indicators or shared intermediates
+    (names starting with ``_``) it is computed from. Evaluating a set of
+    indicators only runs the nodes they need, and intermediates such as the
+    20-bar rolling mean / std of Close are computed once for SMA_20, the
+    Bollinger bands and Volatility.
+    """
+
+    def __init__(self):
+        self.nodes = {}
+        self._register_defaults()
+
+    def register(self, name, dependencies, func):
+        """
+        Add or replace a node
+
+        Args:
+            name (str): Column name, prefix with '_' for hidden intermediates
+            dependencies (list): Names of OHLCV columns or other nodes
+            func (callable): Receives a dict of the evaluated dependencies and
+                returns a pandas.Series
+        """
+        self.nodes[name] = IndicatorNode(name, dependencies, func)
+
+    def resolve(self, indicators):
+        """
+        Order the nodes needed for ``indicators`` so dependencies come first
+
+        Args:
+            indicators (list): Requested indicator names
+
+        Returns:
+            list: Node names in evaluation order
+        """
+        order = []
+        visiting = set()
+        done = set(OHLCV_COLUMNS)
+
+        def visit(name):
+            if name in done:
+                return
+            if name not in self.nodes:
+                raise KeyError(f"Unknown indicator: {name}")
+            if name in visiting:
+                raise ValueError(f"Circular indicator dependency at {name}")
+            visiting.add(name)
+            for dependency in self.nodes[name].dependencies:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+            order.append(name)
+
+        for name in indicators:
+            visit(name)
+        return order
+
+    def evaluate(self, df, indicators):
+        """
+        Compute only the requested indicators
+
+        Args:
+            df (pandas.DataFrame): OHLCV data (already cleaned)
+            indicators (list): Requested indicator names
+
+        Returns:
+            pandas.DataFrame: ``df`` with the requested columns appended in
+            the same order ``add_all_indicators`` uses
+        """
+        values = {name: df[name] for name in OHLCV_COLUMNS if name in df.columns}
+
+        for name in self.resolve(indicators):
+            node = self.nodes[name]
+            if not all(dependency in values for dependency in node.dependencies):
+                continue
+            try:
+                values[name] = node.func(values)
+            except Exception as e:
+                print(f"Error calculating {name}: {str(e)}")
+
+        requested = set(indicators)
+        ordered = [name for name in INDICATOR_COLUMNS if name in requested]
+        ordered += [name for name in indicators if name not in ordered]
+        for name in ordered:
+            if name in values and name not in OHLCV_COLUMNS:
+                df[name] = values[name]
+        return df
+
+    def _register_defaults(self):
+        """Register every column produced by ``add_all_indicators``"""
+        register = self.register
+        hlc = ('High', 'Low', 'Close')
+
+        # Shared intermediates
+        register('_close_mean_20', ['Close'],
+                 lambda v: v['Close'].rolling(20, min_periods=20).mean())
+        register('_close_std_20', ['Close'],
+                 lambda v: v['Close'].rolling(20, min_periods=20).std(ddof=0))
+        register('_macd_line', ['EMA_12', 'EMA_26'],
+                 lambda v: v['EMA_12'] - v['EMA_26'])
+        register('_highest_high_14', ['High'],
+                 lambda v: v['High'].rolling(14, min_periods=14).max())
+        register('_lowest_low_14', ['Low'],
+                 lambda v: v['Low'].rolling(14, min_periods=14).min())
+        register('_close_location', hlc, _close_location)
+        register('_volume_mean_20', ['Volume'],
+                 lambda v: v['Volume'].rolling(20, min_periods=20).mean())
+
+        # Trend
+        register('SMA_10', ['Close'], lambda v: ta.trend.sma_indicator(v['Close'], window=10))
+        register('SMA_20', ['_close_mean_20'], lambda v: v['_close_mean_20'])
+        register('SMA_50', ['Close'], lambda v: ta.trend.sma_indicator(v['Close'], window=50))
+        register('EMA_12', ['Close'], lambda v: ta.trend.ema_indicator(v['Close'], window=12))
+        register('EMA_26', ['Close'], lambda v: ta.trend.ema_indicator(v['Close'], window=26))
+        register('EMA_50', ['Close'], lambda v: ta.trend.ema_indicator(v['Close'], window=50))
+        register('MACD_signal', ['_macd_line'],
+                 lambda v: v['_macd_line'].ewm(span=9, min_periods=9, adjust=False).mean())
+        # Same naming as _add_trend_indicators: MACD holds the histogram
+        register('MACD', ['_macd_line', 'MACD_signal'],
+                 lambda v: v['_macd_line'] - v['MACD_signal'])
+        register('MACD_histogram', ['_macd_line'], lambda v: v['_macd_line'])
+        register('ADX', hlc, lambda v: ta.trend.adx(v['High'], v['Low'], v['Close']))
+        register('PSAR', hlc, lambda v: ta.trend.psar_down(v['High'], v['Low'], v['Close']))
+
+        # Momentum
+        register('RSI', ['Close'], lambda v: ta.momentum.rsi(v['Close'], window=14))
+        register('STOCH_k', ['Close', '_highest_high_14', '_lowest_low_14'],
+                 lambda v: 100 * (v['Close'] - v['_lowest_low_14'])
+                 / (v['_highest_high_14'] - v['_lowest_low_14']))
+        register('STOCH_d', ['STOCH_k'],
+                 lambda v: v['STOCH_k'].rolling(3, min_periods=3).mean())
+        register('WILLIAMS_R', ['Close', '_highest_high_14', '_lowest_low_14'],
+                 lambda v: -100 * (v['_highest_high_14'] - v['Close'])
+                 / (v['_highest_high_14'] - v['_lowest_low_14']))
+        register('ROC', ['Close'], lambda v: ta.momentum.roc(v['Close']))
+        register('MFI', hlc + ('Volume',),
+                 lambda v: ta.volume.money_flow_index(v['High'], v['Low'], v['Close'], v['Volume']))
+
+        # Volatility
+        register('BB_middle', ['_close_mean_20'], lambda v: v['_close_mean_20'])
+        register('BB_upper', ['_close_mean_20', '_close_std_20'],
+                 lambda v: v['_close_mean_20'] + 2 * v['_close_std_20'])
+        register('BB_lower', ['_close_mean_20', '_close_std_20'],
+                 lambda v: v['_close_mean_20'] - 2 * v['_close_std_20'])
+        register('BB_width', ['BB_upper', 'BB_lower', '_close_mean_20'],
+                 lambda v: ((v['BB_upper'] - v['BB_lower']) / v['_close_mean_20']) * 100)
+        register('BB_percent', ['Close', 'BB_upper', 'BB_lower'],
+                 lambda v: (v['Close'] - v['BB_lower'])
+                 / (v['BB_upper'] - v['BB_lower']).where(v['BB_upper'] != v['BB_lower'], np.nan))
+        register('ATR', hlc, lambda v: ta.volatility.average_true_range(v['High'], v['Low'], v['Close']))
+        register('KC_middle', hlc,
+                 lambda v: ((v['High'] + v['Low'] + v['Close']) / 3.0).rolling(20, min_periods=20).mean())
+        register('KC_upper', hlc,
+                 lambda v: (((4 * v['High']) - (2 * v['Low']) + v['Close']) / 3.0).rolling(20, min_periods=0).mean())
+        register('KC_lower', hlc,
+                 lambda v: (((-2 * v['High']) + (4 * v['Low']) + v['Close']) / 3.0).rolling(20, min_periods=0).mean())
+
+        # Volume
+        register('OBV', ['Close', 'Volume'],
+                 lambda v: ta.volume.on_balance_volume(v['Close'], v['Volume']))
+        register('ADL', ['_close_location', 'Volume'],
+                 lambda v: (v['_close_location'] * v['Volume']).cumsum())
+        register('CMF', ['_close_location', 'Volume', '_volume_mean_20'],
+                 lambda v: (v['_close_location'] * v['Volume']).rolling(20, min_periods=20).mean()
+                 / v['_volume_mean_20'])
+        register('Volume_SMA', ['_volume_mean_20'], lambda v: v['_volume_mean_20'])
+
+        # Others
+        register('Price_change', ['Close'], lambda v: v['Close'].pct_change())
+        register('Price_change_abs', ['Price_change'], lambda v: v['Price_change'].abs())
+        register('HL_pct', hlc, lambda v: (v['High'] - v['Low']) / v['Close'])
+        register('Close_position', hlc,
+                 lambda v: (v['Close'] - v['Low']) / (v['High'] - v['Low']))
+        register('Volume_change', ['Volume'], lambda v: v['Volume'].pct_change())
+        register('Momentum_5', ['Close'], lambda v: v['Close'] / v['Close'].shift(5) - 1)
+        # Sample (ddof=1) deviation rescaled from the shared population one
+        register('Volatility', ['_close_std_20'],
+                 lambda v: v['_close_std_20'] * math.sqrt(20 / 19))
+
+
+def _close_location(values):
+    """Close location value used by ADL and CMF (0 for flat bars)"""
+    high, low, close = values['High'], values['Low'], values['Close']
+    return (((close - low) - (high - close)) / (high - low)).fillna(0.0)
+
+
+def select_indicators(df, indicators, graph=None):
+    """
+    Clean ``df`` like ``add_all_indicators`` and compute only ``indicators``
+
+    Args:
+        df (pandas.DataFrame): OHLCV stock data
+        indicators (list): Indicator column names to compute
+        graph (IndicatorGraph): Graph to use, defaults to the shared one
+
+    Returns:
+        pandas.DataFrame: Cleaned data with the requested indicator columns
+    """
+    if df is None or df.empty:
+        return df
+    return (graph or DEFAULT_GRAPH).evaluate(dropna(df.copy()), list(indicators))
+
+
+DEFAULT_GRAPH = IndicatorGraph()
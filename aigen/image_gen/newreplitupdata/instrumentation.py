@@ -0,0 +1,184 @@
+import functools
+import os
+import threading
+import time
+
+import pandas as pd
+
+
+class _StageStats:
+    """Accumulated measurements for one (component, stage) pair"""
+
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'last_seconds',
+                 'rows', 'last_rows', 'errors', 'last_error')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_seconds = 0.0
+        self.rows = 0
+        self.last_rows = 0
+        self.errors = 0
+        self.last_error = ''
+
+
+class MetricsRegistry:
+    """
+    In-process registry of hot-path timings, row counts and errors
+
+    Disabled by default; when disabled the ``instrumented`` decorator costs a
+    single attribute check per call. Enable it at runtime with ``enable()``
+    or by starting the process with ``STOCK_ANALYSIS_METRICS=1``.
+    """
+
+    def __init__(self, prefix='stock_analysis', enabled=False):
+        self.prefix = prefix
+        self.enabled = enabled
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Forget every recorded measurement"""
+        with self._lock:
+            self._stats.clear()
+
+    def record(self, component, stage, seconds, rows=0):
+        """
+        Record one timed call
+
+        Args:
+            component (str): e.g. 'technical_analyzer'
+            stage (str): Indicator group or pattern family
+            seconds (float): Wall time of the call
+            rows (int): Rows processed
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.setdefault((component, stage), _StageStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.last_seconds = seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            stats.rows += rows
+            stats.last_rows = rows
+
+    def record_error(self, component, stage, error):
+        """
+        Record an exception that the hot path handled itself
+
+        Args:
+            component (str): e.g. 'pattern_detector'
+            stage (str): Indicator group or pattern family
+            error (Exception): The handled exception
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            stats = self._stats.setdefault((component, stage), _StageStats())
+            stats.errors += 1
+            stats.last_error = f"{type(error).__name__}: {error}"
+
+    def snapshot(self):
+        """
+        Returns:
+            list: One dict per (component, stage) with the accumulated values
+        """
+        with self._lock:
+            return [
+                {
+                    'component': component,
+                    'stage': stage,
+                    'calls': stats.calls,
+                    'seconds_total': stats.seconds,
+                    'seconds_avg': stats.seconds / stats.calls if stats.calls else 0.0,
+                    'seconds_max': stats.max_seconds,
+                    'seconds_last': stats.last_seconds,
+                    'rows_total': stats.rows,
+                    'rows_last': stats.last_rows,
+                    'errors': stats.errors,
+                    'last_error': stats.last_error,
+                }
+                for (component, stage), stats in sorted(self._stats.items())
+            ]
+
+    def to_frame(self):
+        """
+        Returns:
+            pandas.DataFrame: Snapshot sorted by total time, ready for st.dataframe
+        """
+        frame = pd.DataFrame(self.snapshot())
+        if frame.empty:
+            return frame
+        return frame.sort_values('seconds_total', ascending=False).reset_index(drop=True)
+
+    def to_prometheus(self):
+        """
+        Export the registry in the Prometheus text exposition format
+
+        Returns:
+            str: Metrics text, one sample per (component, stage)
+        """
+        metrics = [
+            ('calls_total', 'counter', 'Number of calls', 'calls'),
+            ('seconds_total', 'counter', 'Total wall time in seconds', 'seconds_total'),
+            ('seconds_max', 'gauge', 'Slowest call in seconds', 'seconds_max'),
+            ('seconds_last', 'gauge', 'Most recent call in seconds', 'seconds_last'),
+            ('rows_total', 'counter', 'Rows processed', 'rows_total'),
+            ('errors_total', 'counter', 'Handled exceptions', 'errors'),
+        ]
+        snapshot = self.snapshot()
+        lines = []
+        for suffix, kind, help_text, field in metrics:
+            name = f'{self.prefix}_stage_{suffix}'
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for row in snapshot:
+                labels = f'component="{_escape(row["component"])}",stage="{_escape(row["stage"])}"'
+                lines.append(f'{name}{{{labels}}} {row[field]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def instrumented(component, stage, registry=None):
+    """
+    Decorator timing a method and counting the rows of its DataFrame argument
+
+    Args:
+        component (str): Component label (e.g. 'technical_analyzer')
+        stage (str): Stage label (e.g. 'trend')
+        registry (MetricsRegistry): Defaults to the shared METRICS registry
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            target = registry or METRICS
+            if not target.enabled:
+                return func(self, *args, **kwargs)
+
+            df = args[0] if args else kwargs.get('df')
+            rows = len(df) if isinstance(df, pd.DataFrame) else 0
+            start = time.perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            except Exception as e:
+                target.record_error(component, stage, e)
+                raise
+            finally:
+                target.record(component, stage, time.perf_counter() - start, rows)
+        return wrapper
+    return decorator
+
+
+# Shared by TechnicalAnalyzer and PatternDetector
+METRICS = MetricsRegistry(enabled=os.getenv("STOCK_ANALYSIS_METRICS", "0") == "1")
@@ -0,0 +1,154 @@
+import os
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# One lock per cache file, shared by every OHLCVStore in the process
+_PATH_LOCKS = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def _path_lock(path):
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(os.path.abspath(path), threading.Lock())
+
+
+class OHLCVStore:
+    """
+    Local columnar cache of fetched OHLCV bars
+
+    One uncompressed Arrow IPC file per (interval, symbol) under
+    ``<root>/<interval>/<SYMBOL>.arrow``. Reads memory-map the file, so
+    opening a cached series costs no parse and no copy of the columns until
+    pandas touches them, and nothing is loaded until a symbol is requested;
+    hundreds of cached symbols do not slow down start-up. Writes merge the
+    new bars with the stored ones, keep the newest value per timestamp and
+    replace the file atomically. Each file also records whether it holds the
+    full history or only the latest (compact) bars.
+
+    Requires pyarrow.
+    """
+
+    def __init__(self, root='ohlcv_cache'):
+        """
+        Args:
+            root (str): Directory holding the cache
+        """
+        if pa is None:
+            raise ImportError("OHLCVStore requires pyarrow")
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, symbol, interval):
+        return os.path.join(self.root, interval, f'{symbol.upper()}.arrow')
+
+    def read(self, symbol, interval):
+        """
+        Load a cached series
+
+        Args:
+            symbol (str): Stock symbol
+            interval (str): '1min' ... '60min' or 'daily'
+
+        Returns:
+            pandas.DataFrame: Cached OHLCV bars (oldest first), or None
+        """
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            # The columns keep the mapping alive; split_blocks avoids
+            # consolidating them into a fresh 2-D block
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+            return table.to_pandas(split_blocks=True).set_index('timestamp').rename_axis(None)
+        except Exception as e:
+            print(f"Error reading cached data for {symbol}: {str(e)}")
+            return None
+
+    def coverage(self, symbol, interval):
+        """
+        How much history the cached series holds
+
+        Returns:
+            str: 'full' or 'compact' (the outputsize it was fetched with),
+            or None when not cached
+        """
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        try:
+            metadata = pa.ipc.open_file(pa.memory_map(path, 'r')).schema.metadata or {}
+            return metadata.get(b'coverage', b'compact').decode()
+        except Exception as e:
+            print(f"Error reading cached data for {symbol}: {str(e)}")
+            return None
+
+    def write(self, symbol, interval, df, coverage='compact'):
+        """
+        Merge new bars into the cached series
+
+        Args:
+            symbol (str): Stock symbol
+            interval (str): Bar interval
+            df (pandas.DataFrame): OHLCV bars indexed by timestamp
+            coverage (str): 'full' when ``df`` is the whole history; a stored
+                full history stays full when newer bars are merged in
+
+        Returns:
+            pandas.DataFrame: The merged series as stored
+        """
+        if df is None or df.empty:
+            return self.read(symbol, interval)
+
+        path = self.path(symbol, interval)
+        with _path_lock(path):
+            cached = self.read(symbol, interval)
+            merged = df if cached is None else pd.concat([cached, df])
+            merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+            if coverage != 'full' and self.coverage(symbol, interval) == 'full':
+                coverage = 'full'
+
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            table = pa.Table.from_pandas(merged.rename_axis('timestamp').reset_index(),
+                                         preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                                   b'coverage': coverage.encode()})
+            # A unique temporary file per write, so concurrent writers never share one
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            os.close(fd)
+            try:
+                with pa.OSFile(tmp_path, 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_path, path)
+            except Exception:
+                os.remove(tmp_path)
+                raise
+            return merged
+
+    def age(self, symbol, interval):
+        """
+        Seconds since the series was last written (None when not cached)
+        """
+        try:
+            return time.time() - os.path.getmtime(self.path(symbol, interval))
+        except OSError:
+            return None
+
+    def symbols(self, interval):
+        """
+        Returns:
+            list: Symbols cached for an interval
+        """
+        directory = os.path.join(self.root, interval)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name[:-len('.arrow')] for name in os.listdir(directory) if name.endswith('.arrow'))
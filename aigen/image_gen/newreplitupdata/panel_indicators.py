@@ -0,0 +1,261 @@
+import math
+
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+PANEL_INDICATOR_COLUMNS = [
+    'SMA_10', 'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'EMA_50',
+    'RSI', 'STOCH_k', 'STOCH_d',
+    'BB_upper', 'BB_middle', 'BB_lower', 'BB_width', 'BB_percent',
+    'ATR',
+]
+
+
+class PanelTechnicalAnalyzer:
+    """
+    Calculates the moving average, RSI, Bollinger, ATR and stochastic families
+    for many symbols at once.
+
+    Every indicator runs as a single 2-D operation over a (bars x symbols)
+    block: NumPy for element-wise maths and pandas' column-wise window kernels
+    for rolling / exponential windows, which are the same kernels the ``ta``
+    library uses, so values match ``TechnicalAnalyzer.add_all_indicators``
+    run per symbol.
+    """
+
+    def __init__(self, bb_window=20, bb_dev=2, rsi_window=14, atr_window=14,
+                 stoch_window=14, stoch_smooth=3):
+        self.bb_window = bb_window
+        self.bb_dev = bb_dev
+        self.rsi_window = rsi_window
+        self.atr_window = atr_window
+        self.stoch_window = stoch_window
+        self.stoch_smooth = stoch_smooth
+
+    def add_indicators(self, panel, symbol_level=0):
+        """
+        Add indicator columns for every symbol of an OHLCV panel
+
+        Args:
+            panel (pandas.DataFrame): Either a wide block whose columns are a
+                MultiIndex of (field, symbol) or (symbol, field), or a long
+                block indexed by a (symbol, timestamp) MultiIndex with OHLCV
+                columns
+            symbol_level (int): Row level holding the symbol for long blocks
+
+        Returns:
+            pandas.DataFrame: Panel in the same layout with the indicator
+            columns added per symbol
+        """
+        if panel is None or panel.empty:
+            return panel
+
+        if isinstance(panel.columns, pd.MultiIndex):
+            return self._add_wide(panel)
+
+        if isinstance(panel.index, pd.MultiIndex):
+            return self._add_long(panel, symbol_level)
+
+        raise ValueError("Panel needs MultiIndex columns (wide) or a MultiIndex index (long)")
+
+    def compute(self, fields):
+        """
+        Compute the indicator arrays from aligned OHLCV arrays
+
+        Args:
+            fields (dict): 'Open'/'High'/'Low'/'Close'/'Volume' -> array of
+                shape (bars, symbols)
+
+        Returns:
+            dict: Indicator name -> array of shape (bars, symbols); rows that
+            ``ta.utils.dropna`` would remove for a symbol hold NaN
+        """
+        arrays = {name: np.asarray(fields[name], dtype=float) for name in OHLCV_COLUMNS}
+        valid = np.ones(arrays['Close'].shape, dtype=bool)
+        for values in arrays.values():
+            with np.errstate(invalid='ignore'):
+                valid &= (values < math.exp(709)) & (values != 0.0)
+
+        if valid.all():
+            return self._compute_dense(arrays)
+
+        # Move each symbol's valid bars to the top of its column so the window
+        # kernels see the same sequence as a per-symbol dropna would produce
+        order = np.argsort(~valid, axis=0, kind='stable')
+        padding = np.arange(valid.shape[0])[:, None] >= valid.sum(axis=0)[None, :]
+        compact = {}
+        for name, values in arrays.items():
+            packed = np.take_along_axis(values, order, axis=0)
+            packed[padding] = np.nan
+            compact[name] = packed
+
+        results = self._compute_dense(compact)
+        for name, packed in results.items():
+            unpacked = np.empty_like(packed)
+            np.put_along_axis(unpacked, order, packed, axis=0)
+            unpacked[~valid] = np.nan
+            results[name] = unpacked
+
+        return results
+
+    def _compute_dense(self, arrays):
+        """Compute every indicator on blocks without gaps"""
+        close = pd.DataFrame(arrays['Close'])
+        high = pd.DataFrame(arrays['High'])
+        low = pd.DataFrame(arrays['Low'])
+        results = {}
+
+        # Trend
+        for window in (10, 20, 50):
+            results[f'SMA_{window}'] = close.rolling(window, min_periods=window).mean().to_numpy()
+        for window in (12, 26, 50):
+            results[f'EMA_{window}'] = close.ewm(
+                span=window, min_periods=window, adjust=False
+            ).mean().to_numpy()
+
+        # Momentum
+        results['RSI'] = self._rsi(close)
+        results['STOCH_k'], results['STOCH_d'] = self._stochastic(high, low, close)
+
+        # Volatility
+        results.update(self._bollinger(close))
+        results['ATR'] = self._atr(arrays['High'], arrays['Low'], arrays['Close'])
+
+        return results
+
+    def _rsi(self, close):
+        """Wilder RSI for every symbol"""
+        diff = close.diff(1)
+        up = diff.where(diff > 0, 0.0)
+        down = -diff.where(diff < 0, 0.0)
+        window = self.rsi_window
+        ema_up = up.ewm(alpha=1 / window, min_periods=window, adjust=False).mean().to_numpy()
+        ema_down = down.ewm(alpha=1 / window, min_periods=window, adjust=False).mean().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(ema_down == 0, 100, 100 - (100 / (1 + ema_up / ema_down)))
+
+    def _stochastic(self, high, low, close):
+        """Stochastic %K and %D for every symbol"""
+        window = self.stoch_window
+        lowest = low.rolling(window, min_periods=window).min()
+        highest = high.rolling(window, min_periods=window).max()
+        stoch_k = 100 * (close - lowest) / (highest - lowest)
+        stoch_d = stoch_k.rolling(self.stoch_smooth, min_periods=self.stoch_smooth).mean()
+        return stoch_k.to_numpy(), stoch_d.to_numpy()
+
+    def _bollinger(self, close):
+        """Bollinger band family for every symbol"""
+        window = self.bb_window
+        middle = close.rolling(window, min_periods=window).mean().to_numpy()
+        deviation = close.rolling(window, min_periods=window).std(ddof=0).to_numpy()
+        upper = middle + self.bb_dev * deviation
+        lower = middle - self.bb_dev * deviation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            width = ((upper - lower) / middle) * 100
+            percent = (close.to_numpy() - lower) / np.where(upper != lower, upper - lower, np.nan)
+        return {
+            'BB_upper': upper,
+            'BB_middle': middle,
+            'BB_lower': lower,
+            'BB_width': width,
+            'BB_percent': percent,
+        }
+
+    def _atr(self, high, low, close):
+        """Average True Range for every symbol"""
+        window = self.atr_window
+        prev_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+        true_range[0] = high[0] - low[0]
+
+        if len(true_range) < window:
+            return np.full(true_range.shape, np.nan)
+
+        # Wilder smoothing seeded with the mean of the first window, written as
+        # an adjust=False EWM that starts at the seed row
+        seeded = true_range.copy()
+        seeded[:window - 1] = np.nan
+        seeded[window - 1] = true_range[:window].mean(axis=0)
+        atr = pd.DataFrame(seeded).ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+        atr[:window - 1] = 0.0
+        return atr
+
+    def _add_wide(self, panel):
+        """Handle (field, symbol) or (symbol, field) column layouts"""
+        field_level = None
+        for level in range(panel.columns.nlevels):
+            if set(OHLCV_COLUMNS).issubset(panel.columns.get_level_values(level)):
+                field_level = level
+                break
+
+        if field_level is None:
+            raise ValueError("Panel columns must contain Open, High, Low, Close and Volume")
+
+        # Work on one consolidated, column-major array; per-field xs on a wide
+        # frame would copy every block once per field
+        values = panel.to_numpy(dtype=float)
+        field_values = panel.columns.get_level_values(field_level)
+        symbol_values = panel.columns.get_level_values(1 - field_level)
+        symbols = pd.Index(symbol_values[field_values == 'Close'])
+        fields = {}
+        for name in OHLCV_COLUMNS:
+            positions = np.flatnonzero(field_values == name)
+            lookup = pd.Index(symbol_values[positions]).get_indexer(symbols)
+            block = np.full((len(panel), len(symbols)), np.nan, order='F')
+            found = lookup >= 0
+            block[:, found] = values[:, positions[lookup[found]]]
+            fields[name] = block
+        results = self.compute(fields)
+
+        n_symbols = len(symbols)
+        n_existing = values.shape[1]
+        if field_level == 0:
+            added = pd.MultiIndex.from_product([PANEL_INDICATOR_COLUMNS, symbols])
+            targets = np.arange(n_existing + len(added))
+        else:
+            added = pd.MultiIndex.from_product([symbols, PANEL_INDICATOR_COLUMNS])
+        columns = panel.columns.append(added.set_names(panel.columns.names))
+
+        if field_level == 1:
+            # Keep each symbol's own columns followed by its indicators
+            rank = symbols.get_indexer(columns.get_level_values(0))
+            order = np.argsort(rank, kind='stable')
+            targets = np.empty_like(order)
+            targets[order] = np.arange(len(order))
+            columns = columns[order]
+
+        combined = np.empty((len(panel), len(columns)), order='F')
+        combined[:, targets[:n_existing]] = values
+        for k, name in enumerate(PANEL_INDICATOR_COLUMNS):
+            if field_level == 0:
+                slots = n_existing + k * n_symbols + np.arange(n_symbols)
+            else:
+                slots = n_existing + np.arange(n_symbols) * len(PANEL_INDICATOR_COLUMNS) + k
+            combined[:, targets[slots]] = results[name]
+
+        return pd.DataFrame(combined, index=panel.index, columns=columns)
+
+    def _add_long(self, panel, symbol_level):
+        """Handle a (symbol, timestamp) row layout"""
+        wide = panel[OHLCV_COLUMNS].unstack(level=symbol_level)
+        symbols = wide['Close'].columns
+        results = self.compute({name: wide[name].reindex(columns=symbols).to_numpy()
+                                for name in OHLCV_COLUMNS})
+
+        levels = [wide.index, symbols] if symbol_level == 1 else [symbols, wide.index]
+        long_index = pd.MultiIndex.from_product(levels, names=panel.index.names)
+        added = pd.DataFrame(
+            {name: (values if symbol_level == 1 else values.T).ravel()
+             for name, values in results.items()},
+            index=long_index,
+        )[PANEL_INDICATOR_COLUMNS].reindex(panel.index)
+
+        # Match the per-symbol batch path, which drops invalid bars entirely
+        combined = pd.concat([panel, added], axis=1)
+        valid = combined[OHLCV_COLUMNS].lt(math.exp(709)).all(axis=1) & \
+            combined[OHLCV_COLUMNS].ne(0.0).all(axis=1)
+        return combined[valid]
@@ -0,0 +1,282 @@
+"""
+Parallel parameter sweeps over the indicator windows
+
+Usage:
+    runner = ParameterSweepRunner(max_workers=4, checkpoint_path='sweep.jsonl')
+    results = runner.run({'HBL': hbl_df, 'OGDC': ogdc_df},
+                         param_grid({'rsi_window': [7, 14, 21], 'bb_window': [20, 30]}))
+
+OHLCV arrays are copied once into shared memory and attached read-only by the
+worker processes, so tasks only pickle a symbol name and a parameter dict.
+Every finished task is appended to the checkpoint file; rerunning the same
+sweep skips the (symbol, parameters) pairs already recorded there for the same
+OHLCV data. The file starts with a header naming the objective and its
+backtest options, and is started afresh when they no longer match.
+"""
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import ta
+from ta.utils import dropna
+
+from backtest import VectorizedBacktester
+from incremental_indicators import OHLCV_COLUMNS
+from signal_timeline import signal_timeline
+
+# Windows used by TechnicalAnalyzer when a parameter is not swept
+DEFAULT_PARAMS = {
+    'rsi_window': 14,
+    'macd_fast': 12,
+    'macd_slow': 26,
+    'macd_signal': 9,
+    'bb_window': 20,
+    'bb_dev': 2,
+    'ema_window': 20,
+}
+
+# Worker-side views of the shared OHLCV blocks, filled by _attach_shared
+_SHARED = {}
+
+
+def param_grid(grid):
+    """
+    Expand {'name': [values]} into the list of every combination
+
+    Args:
+        grid (dict): Parameter name -> candidate values
+
+    Returns:
+        list: One parameter dict per combination
+    """
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def _plain(value):
+    """Python scalar for a NumPy scalar, so parameters encode the same everywhere"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _json_default(value):
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+
+def _data_fingerprint(df):
+    """Digest of a frame's timestamps and OHLCV values"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.DatetimeIndex(df.index).values.astype('datetime64[ns]').tobytes())
+    digest.update(np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)).tobytes())
+    return digest.hexdigest()
+
+
+def evaluate_signal_rules(df, params, backtest_options=None):
+    """
+    Default sweep objective: backtest the get_signal_summary rules
+
+    Rebuilds the RSI, MACD, Bollinger %B and EMA inputs of the signal summary
+    with the given windows (the EMA is written to the 'EMA_20' column the MA
+    rule reads), derives the OVERALL timeline and backtests it.
+
+    Args:
+        df (pandas.DataFrame): OHLCV data
+        params (dict): Windows overriding DEFAULT_PARAMS
+        backtest_options (dict): Keyword arguments for VectorizedBacktester
+
+    Returns:
+        dict: Backtest statistics
+    """
+    p = {**DEFAULT_PARAMS, **params}
+    df = dropna(df.copy())
+    close = df['Close']
+
+    frame = pd.DataFrame({'Close': close}, index=df.index)
+    frame['RSI'] = ta.momentum.rsi(close, window=p['rsi_window'])
+    frame['MACD'] = ta.trend.macd_diff(close, window_slow=p['macd_slow'],
+                                       window_fast=p['macd_fast'], window_sign=p['macd_signal'])
+    frame['MACD_signal'] = ta.trend.macd_signal(close, window_slow=p['macd_slow'],
+                                                window_fast=p['macd_fast'], window_sign=p['macd_signal'])
+    frame['BB_percent'] = ta.volatility.bollinger_pband(close, window=p['bb_window'],
+                                                        window_dev=p['bb_dev'])
+    frame['EMA_20'] = ta.trend.ema_indicator(close, window=p['ema_window'])
+
+    signals = signal_timeline(frame)['OVERALL'].rename('signal')
+    result = VectorizedBacktester(**(backtest_options or {})).run(close, signals)
+    stats = result['stats'].iloc[0].to_dict()
+    stats['bars'] = len(frame)
+    return stats
+
+
+def _attach_shared(layout):
+    """Process-pool initializer: map every shared OHLCV block into this worker"""
+    for symbol, (values_name, index_name, rows) in layout.items():
+        values_shm = shared_memory.SharedMemory(name=values_name)
+        index_shm = shared_memory.SharedMemory(name=index_name)
+        values = np.ndarray((rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=values_shm.buf)
+        index = np.ndarray((rows,), dtype='datetime64[ns]', buffer=index_shm.buf)
+        values.flags.writeable = False
+        _SHARED[symbol] = (values_shm, index_shm, values, index)
+
+
+def _shared_frame(symbol):
+    """OHLCV DataFrame viewing the shared block"""
+    _, _, values, index = _SHARED[symbol]
+    return pd.DataFrame(values, index=pd.DatetimeIndex(index), columns=OHLCV_COLUMNS)
+
+
+def _run_task(symbol, params, evaluate, backtest_options):
+    return evaluate(_shared_frame(symbol), params, backtest_options)
+
+
+class ParameterSweepRunner:
+    """Evaluates parameter grids across symbols on a process pool"""
+
+    def __init__(self, max_workers=None, checkpoint_path=None,
+                 evaluate=evaluate_signal_rules, backtest_options=None):
+        """
+        Args:
+            max_workers (int): Worker processes (default: CPU count)
+            checkpoint_path (str): JSON-lines file recording finished tasks
+            evaluate (callable): Module-level ``evaluate(df, params, backtest_options)``
+                returning a dict of metrics
+            backtest_options (dict): Passed through to ``evaluate``
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.checkpoint_path = checkpoint_path
+        self.evaluate = evaluate
+        self.backtest_options = backtest_options or {}
+
+    def run(self, frames, grid):
+        """
+        Evaluate every parameter set on every symbol
+
+        Args:
+            frames (dict): Symbol -> OHLCV DataFrame
+            grid (list): Parameter dicts, e.g. from param_grid()
+
+        Returns:
+            pandas.DataFrame: One row per (symbol, parameter set) with the
+            parameters and the metrics, including rows restored from the checkpoint
+        """
+        grid = [{name: _plain(value) for name, value in params.items()} for params in grid]
+        fingerprints = {symbol: _data_fingerprint(df) for symbol, df in frames.items()}
+        done = self._load_checkpoint()
+        rows = []
+        tasks = []
+        for symbol in frames:
+            for params in grid:
+                row = done.get(self._task_key(symbol, fingerprints[symbol], params))
+                if row is None:
+                    tasks.append((symbol, params))
+                else:
+                    rows.append(row)
+
+        if tasks:
+            segments, layout = self._share_frames({symbol: frames[symbol] for symbol, _ in tasks})
+            try:
+                with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_attach_shared,
+                                         initargs=(layout,)) as pool:
+                    futures = {
+                        pool.submit(_run_task, symbol, params, self.evaluate, self.backtest_options):
+                            (symbol, params)
+                        for symbol, params in tasks
+                    }
+                    for future in as_completed(futures):
+                        symbol, params = futures[future]
+                        try:
+                            row = {'symbol': symbol, **params, **future.result()}
+                        except Exception as e:
+                            print(f"Error in sweep task {symbol} {params}: {str(e)}")
+                            continue
+                        rows.append(row)
+                        self._checkpoint(row, symbol, fingerprints[symbol], params)
+            finally:
+                for segment in segments:
+                    segment.close()
+                    segment.unlink()
+
+        return pd.DataFrame(rows)
+
+    def _share_frames(self, frames):
+        """Copy each OHLCV frame into shared memory once"""
+        segments = []
+        layout = {}
+        try:
+            for symbol, df in frames.items():
+                values = np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+                index = pd.DatetimeIndex(df.index).values.astype('datetime64[ns]')
+
+                values_shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+                segments.append(values_shm)
+                index_shm = shared_memory.SharedMemory(create=True, size=max(index.nbytes, 1))
+                segments.append(index_shm)
+                np.ndarray(values.shape, dtype=values.dtype, buffer=values_shm.buf)[:] = values
+                np.ndarray(index.shape, dtype=index.dtype, buffer=index_shm.buf)[:] = index
+                layout[symbol] = (values_shm.name, index_shm.name, len(values))
+        except Exception:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+            raise
+        return segments, layout
+
+    @staticmethod
+    def _task_key(symbol, data, params):
+        return json.dumps([symbol, data, params], sort_keys=True, default=_json_default)
+
+    def _header(self):
+        """Checkpoint header identifying the objective the recorded rows came from"""
+        name = getattr(self.evaluate, '__qualname__', repr(self.evaluate))
+        objective = f"{getattr(self.evaluate, '__module__', '')}.{name}"
+        return json.loads(json.dumps({'objective': objective, 'backtest_options': self.backtest_options},
+                                     sort_keys=True, default=_json_default))
+
+    def _load_checkpoint(self):
+        """Finished rows from an earlier (possibly interrupted) run of the same objective"""
+        done = {}
+        if not self.checkpoint_path:
+            return done
+        header = self._header()
+        content = b''
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'rb+') as f:
+                content = f.read()
+                if content and not content.endswith(b'\n'):
+                    # A killed run may leave its last line cut short; drop it so
+                    # the next record starts on a line of its own
+                    content = content[:content.rfind(b'\n') + 1]
+                    f.truncate(len(content))
+
+        lines = content.decode('utf-8').splitlines()
+        try:
+            stored = json.loads(lines[0])['header'] if lines else None
+        except (json.JSONDecodeError, KeyError, TypeError):
+            stored = None
+        if stored != header:
+            if lines:
+                print(f"Discarding sweep checkpoint {self.checkpoint_path}: recorded for a different objective")
+            with open(self.checkpoint_path, 'w') as f:
+                f.write(json.dumps({'header': header}) + '\n')
+            return done
+
+        for line in lines[1:]:
+            try:
+                record = json.loads(line)
+                done[self._task_key(record['symbol'], record['data'], record['params'])] = record['row']
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+        return done
+
+    def _checkpoint(self, row, symbol, data, params):
+        if not self.checkpoint_path:
+            return
+        with open(self.checkpoint_path, 'a') as f:
+            f.write(json.dumps({'symbol': symbol, 'data': data, 'params': params, 'row': row},
+                               default=_json_default) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
@@ -1,13 +1,24 @@
 import pandas as pd
 import numpy as np
 from typing import List, Dict
+from instrumentation import METRICS, instrumented
+from candlestick_engine import (CANDLE_PATTERNS, PATTERN_DTYPE, PATTERN_MESSAGES,
+                                candlestick_masks, scan_candlestick_patterns)
+from streaming_patterns import StreamingPatternDetector
 
 class PatternDetector:
     """Detects candlestick patterns and chart patterns"""
     
-    def __init__(self):
+    def __init__(self, level_engine=None):
+        """
+        Args:
+            level_engine (VolumeProfileEngine): Optional volume-profile engine used
+                for the support/resistance tests instead of the 20-bar low/high
+        """
         self.patterns = []
+        self.level_engine = level_engine
     
+    @instrumented('pattern_detector', 'all_patterns')
     def detect_patterns(self, df):
         """
         Detect various candlestick and chart patterns
@@ -34,231 +45,117 @@ class PatternDetector:
             patterns.extend(self._detect_technical_patterns(df))
             
         except Exception as e:
+            METRICS.record_error('pattern_detector', 'all_patterns', e)
             print(f"Error detecting patterns: {str(e)}")
         
         return patterns
     
+    def create_stream(self):
+        """
+        Create a bar-by-bar detector for live feeds (one per symbol)
+        
+        Returns:
+            StreamingPatternDetector: Detector fed with update() as bars close
+        """
+        return StreamingPatternDetector()
+    
+    @instrumented('pattern_detector', 'candlestick')
     def _detect_candlestick_patterns(self, df):
         """Detect single and multi-candle patterns"""
         patterns = []
         
         try:
             # Get recent candles (last 10)
-            recent = df.tail(10).copy()
+            recent = df.tail(10)
             
             if len(recent) < 3:
                 return patterns
             
-            # Calculate candle properties
-            recent['body'] = abs(recent['Close'] - recent['Open'])
-            recent['upper_shadow'] = recent['High'] - recent[['Open', 'Close']].max(axis=1)
-            recent['lower_shadow'] = recent[['Open', 'Close']].min(axis=1) - recent['Low']
-            recent['total_range'] = recent['High'] - recent['Low']
-            recent['is_bullish'] = recent['Close'] > recent['Open']
-            recent['is_bearish'] = recent['Close'] < recent['Open']
+            # Evaluate every rule over the window at once
+            masks = self._candle_masks(recent)
             
             # Single candle patterns
-            for i in range(len(recent)):
-                candle = recent.iloc[i]
-                
-                # Doji
-                if self._is_doji(candle):
-                    patterns.append(f"Doji detected at {candle.name.strftime('%H:%M')}")
-                
-                # Hammer
-                if self._is_hammer(candle):
-                    patterns.append(f"Hammer pattern at {candle.name.strftime('%H:%M')}")
-                
-                # Shooting Star
-                if self._is_shooting_star(candle):
-                    patterns.append(f"Shooting Star at {candle.name.strftime('%H:%M')}")
-                
-                # Spinning Top
-                if self._is_spinning_top(candle):
-                    patterns.append(f"Spinning Top at {candle.name.strftime('%H:%M')}")
+            patterns.extend(self._format_candle_patterns(recent, masks, 1))
             
             # Multi-candle patterns
             if len(recent) >= 2:
-                patterns.extend(self._detect_two_candle_patterns(recent))
+                patterns.extend(self._detect_two_candle_patterns(recent, masks))
             
             if len(recent) >= 3:
-                patterns.extend(self._detect_three_candle_patterns(recent))
+                patterns.extend(self._detect_three_candle_patterns(recent, masks))
                 
         except Exception as e:
+            METRICS.record_error('pattern_detector', 'candlestick', e)
             print(f"Error in candlestick pattern detection: {str(e)}")
         
         return patterns
     
-    def _is_doji(self, candle):
-        """Check if candle is a Doji"""
-        body_size = abs(candle['Close'] - candle['Open'])
-        total_range = candle['High'] - candle['Low']
+    @instrumented('pattern_detector', 'history_scan')
+    def scan_candlestick_history(self, df, patterns=None):
+        """
+        Scan the full history for candlestick patterns
         
-        if total_range == 0:
-            return False
+        Args:
+            df (pandas.DataFrame): OHLC data indexed by timestamp
+            patterns (list): Pattern names to keep (default: all)
         
-        return body_size / total_range < 0.1
+        Returns:
+            numpy.ndarray: Structured array of (timestamp, pattern_id, direction);
+            see candlestick_engine.PATTERN_NAMES for the ids
+        """
+        try:
+            return scan_candlestick_patterns(df, patterns)
+        except Exception as e:
+            METRICS.record_error('pattern_detector', 'history_scan', e)
+            print(f"Error scanning candlestick history: {str(e)}")
+            return np.empty(0, dtype=PATTERN_DTYPE)
     
-    def _is_hammer(self, candle):
-        """Check if candle is a Hammer"""
-        body = abs(candle['Close'] - candle['Open'])
-        lower_shadow = candle['lower_shadow']
-        upper_shadow = candle['upper_shadow']
-        total_range = candle['High'] - candle['Low']
-        
-        if total_range == 0:
-            return False
-        
-        # Hammer conditions
-        return (lower_shadow > 2 * body and 
-                upper_shadow < body * 0.5 and
-                lower_shadow > 0.6 * total_range)
+    def _candle_masks(self, df):
+        """Boolean pattern masks for every candle in df"""
+        return candlestick_masks(df['Open'].to_numpy(), df['High'].to_numpy(),
+                                 df['Low'].to_numpy(), df['Close'].to_numpy())
     
-    def _is_shooting_star(self, candle):
-        """Check if candle is a Shooting Star"""
-        body = abs(candle['Close'] - candle['Open'])
-        lower_shadow = candle['lower_shadow']
-        upper_shadow = candle['upper_shadow']
-        total_range = candle['High'] - candle['Low']
-        
-        if total_range == 0:
-            return False
-        
-        # Shooting star conditions
-        return (upper_shadow > 2 * body and 
-                lower_shadow < body * 0.5 and
-                upper_shadow > 0.6 * total_range)
+    def _format_candle_patterns(self, df, masks, candles):
+        """Describe the patterns spanning ``candles`` bars, in candle order"""
+        names = [name for _, name, _, count in CANDLE_PATTERNS if count == candles]
+        matrix = np.column_stack([masks[name] for name in names])
+        rows, cols = np.nonzero(matrix)
+        return [PATTERN_MESSAGES[names[col]].format(df.index[row].strftime('%H:%M'))
+                for row, col in zip(rows, cols)]
     
-    def _is_spinning_top(self, candle):
-        """Check if candle is a Spinning Top"""
-        body = abs(candle['Close'] - candle['Open'])
-        total_range = candle['High'] - candle['Low']
-        upper_shadow = candle['upper_shadow']
-        lower_shadow = candle['lower_shadow']
-        
-        if total_range == 0:
-            return False
-        
-        # Spinning top conditions
-        return (body < 0.3 * total_range and
-                upper_shadow > 0.1 * total_range and
-                lower_shadow > 0.1 * total_range)
-    
-    def _detect_two_candle_patterns(self, df):
+    @instrumented('pattern_detector', 'two_candle')
+    def _detect_two_candle_patterns(self, df, masks=None):
         """Detect two-candle patterns"""
         patterns = []
         
         try:
-            for i in range(1, len(df)):
-                prev_candle = df.iloc[i-1]
-                curr_candle = df.iloc[i]
-                
-                # Bullish Engulfing
-                if self._is_bullish_engulfing(prev_candle, curr_candle):
-                    patterns.append(f"Bullish Engulfing pattern at {curr_candle.name.strftime('%H:%M')}")
-                
-                # Bearish Engulfing
-                if self._is_bearish_engulfing(prev_candle, curr_candle):
-                    patterns.append(f"Bearish Engulfing pattern at {curr_candle.name.strftime('%H:%M')}")
-                
-                # Piercing Pattern
-                if self._is_piercing_pattern(prev_candle, curr_candle):
-                    patterns.append(f"Piercing Pattern at {curr_candle.name.strftime('%H:%M')}")
-                
-                # Dark Cloud Cover
-                if self._is_dark_cloud_cover(prev_candle, curr_candle):
-                    patterns.append(f"Dark Cloud Cover at {curr_candle.name.strftime('%H:%M')}")
+            if masks is None:
+                masks = self._candle_masks(df)
+            patterns = self._format_candle_patterns(df, masks, 2)
                 
         except Exception as e:
+            METRICS.record_error('pattern_detector', 'two_candle', e)
             print(f"Error in two-candle pattern detection: {str(e)}")
         
         return patterns
     
-    def _is_bullish_engulfing(self, prev, curr):
-        """Check for Bullish Engulfing pattern"""
-        return (prev['is_bearish'] and 
-                curr['is_bullish'] and
-                curr['Open'] < prev['Close'] and
-                curr['Close'] > prev['Open'])
-    
-    def _is_bearish_engulfing(self, prev, curr):
-        """Check for Bearish Engulfing pattern"""
-        return (prev['is_bullish'] and 
-                curr['is_bearish'] and
-                curr['Open'] > prev['Close'] and
-                curr['Close'] < prev['Open'])
-    
-    def _is_piercing_pattern(self, prev, curr):
-        """Check for Piercing Pattern"""
-        return (prev['is_bearish'] and 
-                curr['is_bullish'] and
-                curr['Open'] < prev['Low'] and
-                curr['Close'] > (prev['Open'] + prev['Close']) / 2)
-    
-    def _is_dark_cloud_cover(self, prev, curr):
-        """Check for Dark Cloud Cover"""
-        return (prev['is_bullish'] and 
-                curr['is_bearish'] and
-                curr['Open'] > prev['High'] and
-                curr['Close'] < (prev['Open'] + prev['Close']) / 2)
-    
-    def _detect_three_candle_patterns(self, df):
+    @instrumented('pattern_detector', 'three_candle')
+    def _detect_three_candle_patterns(self, df, masks=None):
         """Detect three-candle patterns"""
         patterns = []
         
         try:
-            for i in range(2, len(df)):
-                candle1 = df.iloc[i-2]
-                candle2 = df.iloc[i-1]
-                candle3 = df.iloc[i]
-                
-                # Morning Star
-                if self._is_morning_star(candle1, candle2, candle3):
-                    patterns.append(f"Morning Star pattern at {candle3.name.strftime('%H:%M')}")
-                
-                # Evening Star
-                if self._is_evening_star(candle1, candle2, candle3):
-                    patterns.append(f"Evening Star pattern at {candle3.name.strftime('%H:%M')}")
-                
-                # Three White Soldiers
-                if self._is_three_white_soldiers(candle1, candle2, candle3):
-                    patterns.append(f"Three White Soldiers at {candle3.name.strftime('%H:%M')}")
-                
-                # Three Black Crows
-                if self._is_three_black_crows(candle1, candle2, candle3):
-                    patterns.append(f"Three Black Crows at {candle3.name.strftime('%H:%M')}")
+            if masks is None:
+                masks = self._candle_masks(df)
+            patterns = self._format_candle_patterns(df, masks, 3)
                 
         except Exception as e:
+            METRICS.record_error('pattern_detector', 'three_candle', e)
             print(f"Error in three-candle pattern detection: {str(e)}")
         
         return patterns
     
-    def _is_morning_star(self, c1, c2, c3):
-        """Check for Morning Star pattern"""
-        return (c1['is_bearish'] and
-                c3['is_bullish'] and
-                c2['body'] < min(c1['body'], c3['body']) * 0.5 and
-                c3['Close'] > (c1['Open'] + c1['Close']) / 2)
-    
-    def _is_evening_star(self, c1, c2, c3):
-        """Check for Evening Star pattern"""
-        return (c1['is_bullish'] and
-                c3['is_bearish'] and
-                c2['body'] < min(c1['body'], c3['body']) * 0.5 and
-                c3['Close'] < (c1['Open'] + c1['Close']) / 2)
-    
-    def _is_three_white_soldiers(self, c1, c2, c3):
-        """Check for Three White Soldiers pattern"""
-        return (c1['is_bullish'] and c2['is_bullish'] and c3['is_bullish'] and
-                c2['Close'] > c1['Close'] and c3['Close'] > c2['Close'] and
-                c2['Open'] > c1['Open'] and c3['Open'] > c2['Open'])
-    
-    def _is_three_black_crows(self, c1, c2, c3):
-        """Check for Three Black Crows pattern"""
-        return (c1['is_bearish'] and c2['is_bearish'] and c3['is_bearish'] and
-                c2['Close'] < c1['Close'] and c3['Close'] < c2['Close'] and
-                c2['Open'] < c1['Open'] and c3['Open'] < c2['Open'])
-    
+    @instrumented('pattern_detector', 'chart')
     def _detect_chart_patterns(self, df):
         """Detect chart patterns like support/resistance breaks"""
         patterns = []
@@ -270,8 +167,11 @@ class PatternDetector:
             recent = df.tail(20)
             
             # Support and resistance levels
-            support = recent['Low'].min()
-            resistance = recent['High'].max()
+            support, resistance = self._support_resistance(df)
+            if not support == support:
+                support = recent['Low'].min()
+            if not resistance == resistance:
+                resistance = recent['High'].max()
             current_price = df['Close'].iloc[-1]
             
             # Support break
@@ -288,10 +188,26 @@ class PatternDetector:
                 patterns.append("Tight consolidation - potential breakout")
                 
         except Exception as e:
+            METRICS.record_error('pattern_detector', 'chart', e)
             print(f"Error in chart pattern detection: {str(e)}")
         
         return patterns
     
+    def _support_resistance(self, df):
+        """Volume-profile levels for the last bar (NaN when unavailable)"""
+        if 'VP_support' in df.columns and 'VP_resistance' in df.columns:
+            # Precomputed by TechnicalAnalyzer.volume_profile_levels
+            return df['VP_support'].iloc[-1], df['VP_resistance'].iloc[-1]
+        if self.level_engine is None:
+            return np.nan, np.nan
+        
+        levels = self.level_engine.latest_levels(df)
+        supports = levels.loc[levels['kind'] == 'support', 'price']
+        resistances = levels.loc[levels['kind'] == 'resistance', 'price']
+        return (supports.iloc[0] if len(supports) else np.nan,
+                resistances.iloc[0] if len(resistances) else np.nan)
+    
+    @instrumented('pattern_detector', 'technical')
     def _detect_technical_patterns(self, df):
         """Detect technical indicator patterns"""
         patterns = []
@@ -338,6 +254,7 @@ class PatternDetector:
                         patterns.append("Price at lower Bollinger Band")
                         
         except Exception as e:
+            METRICS.record_error('pattern_detector', 'technical', e)
             print(f"Error in technical pattern detection: {str(e)}")
         
         return patterns
@@ -0,0 +1,278 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from candlestick_engine import (PATTERN_DTYPE, PATTERN_IDS, PATTERN_NAMES,
+                                scan_candlestick_patterns)
+
+# Bars of context a multi-candle rule needs before the first new bar
+_CONTEXT_BARS = 2
+
+
+class PatternIndex:
+    """
+    Persistent, per-symbol index of candlestick pattern occurrences
+
+    Each symbol lives in its own directory of Parquet parts
+    (``<root>/<SYMBOL>/part-<first>_<last>.parquet``, named by the range of
+    bars they cover in epoch nanoseconds) holding (timestamp, pattern_id,
+    direction) rows, plus a small state file recording the last indexed bar.
+    ``update`` only scans bars newer than that and writes them as a new part,
+    so restarts never rescan full history. Loaded symbols are kept in memory
+    as sorted structured arrays and queried with ``searchsorted``.
+
+    Parts and state are written to temporary files and moved into place with
+    ``os.replace``. The state file is the commit point: a part covering bars
+    after the recorded last bar is left over from a crash and is ignored, and
+    a part whose range lies inside another one has been merged by ``compact``.
+    """
+
+    def __init__(self, root='pattern_index'):
+        """
+        Args:
+            root (str): Directory holding the index
+        """
+        self.root = root
+        self._occurrences = {}
+        self._lock = threading.RLock()
+        os.makedirs(root, exist_ok=True)
+
+    def update(self, symbol, df):
+        """
+        Index the bars of ``df`` that are newer than the last indexed bar
+
+        Args:
+            symbol (str): Stock symbol
+            df (pandas.DataFrame): OHLC data indexed by timestamp; may be the full
+                history or only the latest bars
+
+        Returns:
+            int: Number of new pattern occurrences written
+        """
+        if df is None or df.empty:
+            return 0
+
+        symbol = symbol.upper()
+        try:
+            with self._lock:
+                state = self._read_state(symbol)
+                df = df.sort_index()
+                if state['last_timestamp'] is not None:
+                    last = pd.Timestamp(state['last_timestamp'])
+                    new = df[df.index > last]
+                    if new.empty:
+                        return 0
+                    # Prepend the stored tail so patterns spanning the boundary are found
+                    context = pd.DataFrame(state['context'], columns=['timestamp', 'Open', 'High', 'Low', 'Close'])
+                    context = context.set_index(pd.to_datetime(context['timestamp'])).drop(columns='timestamp')
+                    frame = pd.concat([context, new[['Open', 'High', 'Low', 'Close']]])
+                else:
+                    new = df
+                    frame = df[['Open', 'High', 'Low', 'Close']]
+
+                occurrences = scan_candlestick_patterns(frame)
+                occurrences = occurrences[occurrences['timestamp'] >= np.datetime64(new.index[0], 'ns')]
+                existing = self._load(symbol)
+                self._discard_uncommitted(symbol, state)
+                if len(occurrences):
+                    self._write_part(symbol, occurrences, new.index[0], frame.index[-1])
+
+                tail = frame.tail(_CONTEXT_BARS)
+                state['last_timestamp'] = tail.index[-1].isoformat()
+                state['context'] = [[timestamp.isoformat(), *map(float, row)]
+                                    for timestamp, row in zip(tail.index, tail.to_numpy())]
+                self._write_state(symbol, state)
+                if len(occurrences):
+                    self._occurrences[symbol] = np.concatenate([existing, occurrences])
+                return len(occurrences)
+
+        except Exception as e:
+            print(f"Error updating pattern index for {symbol}: {str(e)}")
+            return 0
+
+    def query(self, symbols=None, patterns=None, start=None, end=None, direction=None):
+        """
+        Look up pattern occurrences
+
+        Args:
+            symbols (str or list): Symbols to search (default: every indexed symbol)
+            patterns (str or list): Pattern names (default: all)
+            start, end: Inclusive timestamp bounds
+            direction (int): 1 bullish, -1 bearish, 0 neutral
+
+        Returns:
+            pandas.DataFrame: symbol, timestamp, pattern and direction columns
+        """
+        if symbols is None:
+            symbols = self.symbols()
+        elif isinstance(symbols, str):
+            symbols = [symbols]
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        pattern_ids = None if patterns is None else np.array([PATTERN_IDS[p] for p in patterns], dtype=np.uint8)
+        start = None if start is None else np.datetime64(pd.Timestamp(start), 'ns')
+        end = None if end is None else np.datetime64(pd.Timestamp(end), 'ns')
+
+        frames = []
+        for symbol in symbols:
+            occurrences = self._load(symbol.upper())
+            lo = 0 if start is None else np.searchsorted(occurrences['timestamp'], start, 'left')
+            hi = len(occurrences) if end is None else np.searchsorted(occurrences['timestamp'], end, 'right')
+            selected = occurrences[lo:hi]
+            if pattern_ids is not None:
+                selected = selected[np.isin(selected['pattern_id'], pattern_ids)]
+            if direction is not None:
+                selected = selected[selected['direction'] == direction]
+            if len(selected):
+                frames.append(pd.DataFrame({
+                    'symbol': symbol.upper(),
+                    'timestamp': selected['timestamp'],
+                    'pattern': pd.Categorical.from_codes(selected['pattern_id'],
+                                                         [PATTERN_NAMES[i] for i in sorted(PATTERN_NAMES)]),
+                    'direction': selected['direction'],
+                }))
+
+        if not frames:
+            return pd.DataFrame(columns=['symbol', 'timestamp', 'pattern', 'direction'])
+        return pd.concat(frames, ignore_index=True)
+
+    def symbols_with(self, pattern, start, end=None):
+        """
+        Symbols showing ``pattern`` between ``start`` and ``end``
+
+        Args:
+            pattern (str): Pattern name, e.g. 'Bullish Engulfing'
+            start: First timestamp (e.g. today's date)
+            end: Last timestamp (default: end of the day of ``start``)
+
+        Returns:
+            list: Sorted symbols
+        """
+        if end is None:
+            end = pd.Timestamp(start).normalize() + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+        hits = self.query(patterns=pattern, start=start, end=end)
+        return sorted(hits['symbol'].unique())
+
+    def symbols(self):
+        """
+        Returns:
+            list: Every symbol with an index on disk
+        """
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def compact(self, symbol):
+        """
+        Rewrite a symbol's parts as a single Parquet file
+
+        The merged part is moved into place before the old parts are removed,
+        so a crash at any point leaves a readable index.
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            occurrences = self._load(symbol)
+            state = self._read_state(symbol)
+            names = self._live_parts(symbol, state)
+            if not names:
+                return
+            if len(names) == 1:
+                # Already one part; only clear what an interrupted compact left behind
+                merged = names[0]
+            else:
+                starts = [bounds[0] for bounds in map(self._part_range, names) if bounds is not None]
+                first = min(starts + [int(occurrences['timestamp'][0].astype('datetime64[ns]').astype(np.int64))])
+                merged = self._write_part(symbol, occurrences, pd.Timestamp(first),
+                                          pd.Timestamp(state['last_timestamp']))
+            for name in self._part_files(symbol):
+                if name != merged:
+                    os.remove(os.path.join(self.root, symbol, name))
+
+    def _load(self, symbol):
+        """Sorted occurrences of a symbol, read from disk on first use"""
+        with self._lock:
+            cached = self._occurrences.get(symbol)
+            if cached is not None:
+                return cached
+            names = self._live_parts(symbol, self._read_state(symbol))
+            parts = [pd.read_parquet(os.path.join(self.root, symbol, name)) for name in names]
+            if parts:
+                table = pd.concat(parts, ignore_index=True)
+                occurrences = np.empty(len(table), dtype=PATTERN_DTYPE)
+                for field in PATTERN_DTYPE.names:
+                    occurrences[field] = table[field].to_numpy()
+                occurrences = occurrences[np.argsort(occurrences['timestamp'], kind='stable')]
+            else:
+                occurrences = np.empty(0, dtype=PATTERN_DTYPE)
+            self._occurrences[symbol] = occurrences
+            return occurrences
+
+    def _part_files(self, symbol):
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if name.endswith('.parquet'))
+
+    @staticmethod
+    def _part_range(name):
+        """(first, last) epoch nanoseconds a part covers, or None for an unnamed range"""
+        fields = name[len('part-'):-len('.parquet')].split('_')
+        if len(fields) != 2:
+            return None
+        try:
+            return int(fields[0]), int(fields[1])
+        except ValueError:
+            return None
+
+    def _live_parts(self, symbol, state):
+        """Committed parts, minus those already merged into a larger one"""
+        if state['last_timestamp'] is None:
+            return []
+        last = pd.Timestamp(state['last_timestamp']).value
+        ranges = {name: self._part_range(name) for name in self._part_files(symbol)}
+        committed = {name: bounds for name, bounds in ranges.items()
+                     if bounds is None or bounds[0] <= last}
+        live = []
+        for name, bounds in committed.items():
+            merged = bounds is not None and any(
+                other is not None and other != bounds and other[0] <= bounds[0] and bounds[1] <= other[1]
+                for other in committed.values())
+            if not merged:
+                live.append(name)
+        return sorted(live, key=lambda name: (ranges[name] or (-1, -1)))
+
+    def _discard_uncommitted(self, symbol, state):
+        """Remove parts written after the last committed state (an interrupted update)"""
+        last = None if state['last_timestamp'] is None else pd.Timestamp(state['last_timestamp']).value
+        for name in self._part_files(symbol):
+            bounds = self._part_range(name)
+            if bounds is not None and (last is None or bounds[0] > last):
+                os.remove(os.path.join(self.root, symbol, name))
+
+    def _write_part(self, symbol, occurrences, first, last):
+        """Write a part covering bars ``first``..``last`` atomically; returns its file name"""
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+        name = f'part-{pd.Timestamp(first).value}_{pd.Timestamp(last).value}.parquet'
+        path = os.path.join(directory, name)
+        pd.DataFrame({field: occurrences[field] for field in PATTERN_DTYPE.names}).to_parquet(
+            path + '.tmp', index=False)
+        os.replace(path + '.tmp', path)
+        return name
+
+    def _read_state(self, symbol):
+        path = os.path.join(self.root, symbol, '_state.json')
+        if not os.path.exists(path):
+            return {'last_timestamp': None, 'context': []}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_state(self, symbol, state):
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, '_state.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(path + '.tmp', path)
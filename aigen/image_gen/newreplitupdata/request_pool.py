@@ -0,0 +1,134 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class _Call:
+    """One in-flight upstream request and the callers waiting on it"""
+
+    __slots__ = ('done', 'result', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Process-wide coalescing of identical upstream requests
+
+    The first caller for a key runs the request; callers arriving with the
+    same key while it is in flight block until it finishes and receive the
+    same result (or exception). Nothing is cached once the call completes,
+    so freshness is still decided by the caller. Works across threads, which
+    covers Streamlit sessions and ``asyncio.to_thread`` workers alike.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+        self.errors = 0
+
+    def do(self, key, func):
+        """
+        Run ``func()`` once per concurrently requested key
+
+        Args:
+            key (hashable): Identity of the request
+            func (callable): Performs the request
+
+        Returns:
+            The value returned by the leading call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.upstream_calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced_calls += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Upstream calls made, calls saved by coalescing and the saved share
+        """
+        with self._lock:
+            requested = self.upstream_calls + self.coalesced_calls
+            return {
+                'requested': requested,
+                'upstream_calls': self.upstream_calls,
+                'calls_saved': self.coalesced_calls,
+                'saved_ratio': self.coalesced_calls / requested if requested else 0.0,
+                'errors': self.errors,
+                'in_flight': len(self._calls),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.upstream_calls = 0
+            self.coalesced_calls = 0
+            self.errors = 0
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(pool_size=16):
+    """
+    Shared keep-alive HTTP session
+
+    Created on first use; every fetcher in the process reuses its pooled
+    connections instead of opening a new TLS connection per request.
+
+    Args:
+        pool_size (int): Connections kept per host
+
+    Returns:
+        requests.Session: The process-wide session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+# Shared by StockDataFetcher and AsyncStockDataFetcher
+UPSTREAM = SingleFlight()
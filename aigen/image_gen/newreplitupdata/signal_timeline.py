@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from compact_frames import SIGNAL_DTYPE
+
+# int8 encoding of the get_signal_summary labels
+SIGNAL_CODES = {'SELL': -1, 'NEUTRAL': 0, 'BUY': 1}
+SIGNAL_COLUMNS = ['RSI', 'MACD', 'BB', 'MA', 'OVERALL']
+
+BUY = np.int8(1)
+NEUTRAL = np.int8(0)
+SELL = np.int8(-1)
+
+
+def _column(df, name, default):
+    """Column values, or the scalar get_signal_summary falls back to when it is missing"""
+    if name in df.columns:
+        return df[name].to_numpy()
+    return default
+
+
+def signal_timeline(df):
+    """
+    Evaluate the ``get_signal_summary`` rules for every row at once
+
+    Missing columns fall back to the same defaults as the single-row version
+    (RSI 50, MACD / MACD_signal 0, BB_percent 0.5, EMA_20 = Close) and NaN
+    values compare false, exactly as they do there.
+
+    Args:
+        df (pandas.DataFrame): DataFrame with technical indicators
+
+    Returns:
+        pandas.DataFrame: int8 RSI, MACD, BB, MA and OVERALL columns
+        (1 BUY, 0 NEUTRAL, -1 SELL) indexed like ``df``
+    """
+    if df is None or df.empty:
+        return pd.DataFrame(columns=SIGNAL_COLUMNS, dtype=np.int8)
+
+    n = len(df)
+    rsi = _column(df, 'RSI', 50)
+    macd = _column(df, 'MACD', 0)
+    macd_signal = _column(df, 'MACD_signal', 0)
+    bb_percent = _column(df, 'BB_percent', 0.5)
+    close = df['Close'].to_numpy()
+    ema = _column(df, 'EMA_20', close)
+
+    with np.errstate(invalid='ignore'):
+        signals = {
+            'RSI': np.select([rsi > 70, rsi < 30], [SELL, BUY], NEUTRAL),
+            'MACD': np.where(macd > macd_signal, BUY, SELL),
+            'BB': np.select([bb_percent > 0.8, bb_percent < 0.2], [SELL, BUY], NEUTRAL),
+            'MA': np.where(close > ema, BUY, SELL),
+        }
+    signals = {name: np.broadcast_to(values, n).astype(np.int8) for name, values in signals.items()}
+
+    stacked = np.stack(list(signals.values()))
+    balance = (stacked == BUY).sum(axis=0) - (stacked == SELL).sum(axis=0)
+    signals['OVERALL'] = np.sign(balance).astype(np.int8)
+
+    return pd.DataFrame(signals, index=df.index)
+
+
+def decode_signals(timeline):
+    """
+    Convert an int8 signal timeline to 'BUY'/'NEUTRAL'/'SELL' labels
+
+    Args:
+        timeline (pandas.DataFrame): Output of signal_timeline
+
+    Returns:
+        pandas.DataFrame: Same shape, with ordered categorical columns
+    """
+    labels = np.array(['SELL', 'NEUTRAL', 'BUY'])
+    return pd.DataFrame(
+        {col: pd.Categorical(labels[timeline[col].to_numpy() + 1], dtype=SIGNAL_DTYPE)
+         for col in timeline.columns},
+        index=timeline.index,
+    )
@@ -0,0 +1,190 @@
+from candlestick_engine import PATTERN_MESSAGES
+
+NAN = float('nan')
+
+# Bars looked at by PatternDetector._detect_technical_patterns
+_TECHNICAL_WINDOW = 5
+
+# Oldest-to-newest slot order of a full ring, keyed by the next write position
+_RING_ORDER = [tuple((pos + k) % _TECHNICAL_WINDOW for k in range(_TECHNICAL_WINDOW))
+               for pos in range(_TECHNICAL_WINDOW)]
+
+
+class StreamingPatternDetector:
+    """
+    Bar-by-bar variant of ``PatternDetector`` for live feeds
+
+    Keeps the previous two candles and the last five RSI / MACD / MACD signal /
+    BB_percent values in fixed-size ring buffers and evaluates the single-,
+    two- and three-candle rules plus the technical-indicator checks for each
+    closed bar using plain floats, so nothing is allocated per update apart
+    from the returned alerts. One instance per symbol; the object is small
+    enough to keep thousands alive in one process.
+
+    Alerts use the same messages as ``PatternDetector.detect_patterns``.
+    """
+
+    __slots__ = ('_prev1', '_prev2', '_close', '_rsi', '_macd', '_signal',
+                 '_bb', '_pos', '_count')
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget every buffered bar"""
+        self._prev1 = None
+        self._prev2 = None
+        self._close = [NAN] * _TECHNICAL_WINDOW
+        self._rsi = [NAN] * _TECHNICAL_WINDOW
+        self._macd = [NAN] * _TECHNICAL_WINDOW
+        self._signal = [NAN] * _TECHNICAL_WINDOW
+        self._bb = [NAN] * _TECHNICAL_WINDOW
+        self._pos = 0
+        self._count = 0
+
+    def update(self, timestamp, open_, high, low, close, rsi=None, macd=None,
+               macd_signal=None, bb_percent=None):
+        """
+        Process one closed bar
+
+        Args:
+            timestamp (datetime): Bar timestamp, only used to format alerts
+            open_, high, low, close (float): Bar prices
+            rsi, macd, macd_signal, bb_percent (float): Indicator values for the
+                bar (None or NaN when not available yet)
+
+        Returns:
+            list: Alert messages for this bar (usually empty)
+        """
+        alerts = []
+        label = None
+
+        for name in self.candle_patterns(open_, high, low, close):
+            if label is None:
+                label = timestamp.strftime('%H:%M')
+            alerts.append(PATTERN_MESSAGES[name].format(label))
+
+        pos = self._pos
+        self._close[pos] = close
+        self._rsi[pos] = NAN if rsi is None else rsi
+        self._macd[pos] = NAN if macd is None else macd
+        self._signal[pos] = NAN if macd_signal is None else macd_signal
+        self._bb[pos] = NAN if bb_percent is None else bb_percent
+        self._pos = (pos + 1) % _TECHNICAL_WINDOW
+        if self._count < _TECHNICAL_WINDOW:
+            self._count += 1
+        if self._count == _TECHNICAL_WINDOW:
+            self._technical_alerts(alerts)
+
+        return alerts
+
+    def candle_patterns(self, open_, high, low, close):
+        """
+        Evaluate the candlestick rules for a new bar and advance the candle buffer
+
+        Args:
+            open_, high, low, close (float): Bar prices
+
+        Returns:
+            list: Pattern names completed by this bar, in ``CANDLE_PATTERNS`` order
+        """
+        found = []
+        body = abs(close - open_)
+        top = open_ if open_ > close else close
+        bottom = open_ if open_ < close else close
+        upper_shadow = high - top
+        lower_shadow = bottom - low
+        total_range = high - low
+        bullish = close > open_
+        bearish = close < open_
+
+        if total_range != 0:
+            if body / total_range < 0.1:
+                found.append('Doji')
+            if lower_shadow > 2 * body and upper_shadow < body * 0.5 and lower_shadow > 0.6 * total_range:
+                found.append('Hammer')
+            if upper_shadow > 2 * body and lower_shadow < body * 0.5 and upper_shadow > 0.6 * total_range:
+                found.append('Shooting Star')
+            if body < 0.3 * total_range and upper_shadow > 0.1 * total_range and lower_shadow > 0.1 * total_range:
+                found.append('Spinning Top')
+
+        prev1 = self._prev1
+        if prev1 is not None:
+            o1, h1, l1, c1, body1 = prev1
+            if c1 < o1 and bullish:
+                if open_ < c1 and close > o1:
+                    found.append('Bullish Engulfing')
+                if open_ < l1 and close > (o1 + c1) / 2:
+                    found.append('Piercing Pattern')
+            elif c1 > o1 and bearish:
+                if open_ > c1 and close < o1:
+                    found.append('Bearish Engulfing')
+                if open_ > h1 and close < (o1 + c1) / 2:
+                    found.append('Dark Cloud Cover')
+
+            prev2 = self._prev2
+            if prev2 is not None:
+                o2, _, _, c2, body2 = prev2
+                small_middle = body1 < (body2 if body2 < body else body) * 0.5
+                if c2 < o2 and bullish and small_middle and close > (o2 + c2) / 2:
+                    found.append('Morning Star')
+                if c2 > o2 and bearish and small_middle and close < (o2 + c2) / 2:
+                    found.append('Evening Star')
+                if (c2 > o2 and c1 > o1 and bullish and c1 > c2 and close > c1
+                        and o1 > o2 and open_ > o1):
+                    found.append('Three White Soldiers')
+                if (c2 < o2 and c1 < o1 and bearish and c1 < c2 and close < c1
+                        and o1 < o2 and open_ < o1):
+                    found.append('Three Black Crows')
+
+        self._prev2 = prev1
+        self._prev1 = (open_, high, low, close, body)
+        return found
+
+    def _technical_alerts(self, alerts):
+        """Same checks as PatternDetector._detect_technical_patterns on the last 5 bars"""
+        order = _RING_ORDER[self._pos]
+
+        # RSI: the last three non-missing values in the window
+        r1 = r2 = r3 = NAN
+        valid = 0
+        for slot in order:
+            value = self._rsi[slot]
+            if value == value:
+                r3, r2, r1 = r2, r1, value
+                valid += 1
+        if valid >= 2:
+            if r1 > 70:
+                alerts.append("RSI indicates overbought condition")
+            elif r1 < 30:
+                alerts.append("RSI indicates oversold condition")
+            if valid >= 3 and r1 > r2 > r3 and self._close[order[-1]] < self._close[order[-3]]:
+                alerts.append("Bullish RSI divergence detected")
+
+        # MACD: the last two bars where both MACD and its signal exist
+        m1 = m2 = s1 = s2 = NAN
+        valid = 0
+        for slot in order:
+            macd = self._macd[slot]
+            signal = self._signal[slot]
+            if macd == macd and signal == signal:
+                m2, m1 = m1, macd
+                s2, s1 = s1, signal
+                valid += 1
+        if valid >= 2:
+            if m2 <= s2 and m1 > s1:
+                alerts.append("MACD bullish crossover")
+            elif m2 >= s2 and m1 < s1:
+                alerts.append("MACD bearish crossover")
+
+        # Bollinger Bands: the last non-missing BB_percent
+        bb = NAN
+        for slot in order:
+            value = self._bb[slot]
+            if value == value:
+                bb = value
+        if bb == bb:
+            if bb > 0.95:
+                alerts.append("Price at upper Bollinger Band")
+            elif bb < 0.05:
+                alerts.append("Price at lower Bollinger Band")
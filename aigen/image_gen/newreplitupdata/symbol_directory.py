@@ -0,0 +1,328 @@
+import difflib
+import io
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from request_pool import get_session
+
+LISTING_COLUMNS = ['symbol', 'name', 'exchange', 'assetType', 'ipoDate', 'delistingDate', 'status']
+
+
+def default_listing_path():
+    """$SYMBOL_LISTING_PATH, else symbol_listing.csv in the user cache directory"""
+    path = os.getenv("SYMBOL_LISTING_PATH")
+    if path:
+        return path
+    cache_root = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_root, 'stock_analysis', 'symbol_listing.csv')
+
+
+class _Index:
+    """Immutable sorted arrays over one listing; swapped whole on refresh"""
+
+    def __init__(self, listing):
+        listing = listing.sort_values('symbol', kind='stable').drop_duplicates('symbol')
+        self.symbols = listing['symbol'].to_numpy(dtype=str)
+        self.names = listing['name'].to_numpy(dtype=str)
+        self.names_lower = np.char.lower(self.names)
+        self.exchanges = listing['exchange'].to_numpy(dtype=str)
+        self.asset_types = listing['assetType'].to_numpy(dtype=str)
+        self.ipo_dates = listing['ipoDate'].to_numpy(dtype=str)
+        self.lengths = np.char.str_len(self.symbols)
+
+    def position(self, symbol):
+        i = int(np.searchsorted(self.symbols, symbol))
+        return i if i < len(self.symbols) and self.symbols[i] == symbol else -1
+
+    def prefix_range(self, prefix):
+        start = int(np.searchsorted(self.symbols, prefix, side='left'))
+        end = int(np.searchsorted(self.symbols, prefix + '\uffff', side='left'))
+        return start, end
+
+
+class SymbolDirectory:
+    """
+    Local index of listed tickers for validation and autocomplete
+
+    Backed by a CSV in the Alpha Vantage LISTING_STATUS layout (symbol, name,
+    exchange, assetType, ipoDate, delistingDate, status). Symbols are kept in
+    a sorted array, so validation and prefix completion are binary searches
+    and never touch the network. ``refresh`` downloads a new listing (one API
+    call), writes it next to the old one atomically and swaps the in-memory
+    index; readers keep using the old index until the swap.
+    """
+
+    def __init__(self, path=None, api_key=None, max_age=86400):
+        """
+        Args:
+            path (str): Listing CSV (default: $SYMBOL_LISTING_PATH or
+                ~/.cache/stock_analysis/symbol_listing.csv)
+            api_key (str): Alpha Vantage key used by refresh
+            max_age (int): Seconds after which refresh_if_stale downloads a new listing
+        """
+        self.path = path or default_listing_path()
+        self.api_key = api_key or os.getenv("ALPHA_VANTAGE_API_KEY", "demo")
+        self.base_url = "https://www.alphavantage.co/query"
+        self.max_age = max_age
+        self._index = None
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread = None
+        self._last_attempt = None
+        if os.path.exists(self.path):
+            self.load()
+
+    def __len__(self):
+        return 0 if self._index is None else len(self._index.symbols)
+
+    @property
+    def loaded(self):
+        return len(self) > 0
+
+    def load(self, source=None):
+        """
+        Build the index from a listing CSV
+
+        Args:
+            source (str or file): CSV path or buffer (default: self.path)
+
+        Returns:
+            int: Number of active symbols indexed
+        """
+        try:
+            listing = pd.read_csv(source or self.path, dtype=str, keep_default_na=False)
+            for column in LISTING_COLUMNS:
+                if column not in listing.columns:
+                    listing[column] = ''
+            if (listing['status'] != '').any():
+                listing = listing[listing['status'].str.lower() == 'active']
+            listing['symbol'] = listing['symbol'].str.strip().str.upper()
+            self._index = _Index(listing[listing['symbol'] != ''])
+            return len(self)
+        except Exception as e:
+            print(f"Error loading symbol listing: {str(e)}")
+            return 0
+
+    def contains(self, symbol):
+        """
+        Args:
+            symbol (str): Ticker, any case
+
+        Returns:
+            bool: Whether the ticker is listed
+        """
+        index = self._index
+        return index is not None and index.position(symbol.strip().upper()) >= 0
+
+    def lookup(self, symbol):
+        """
+        Returns:
+            dict: symbol, name, exchange, asset_type and ipo_date, or None when unlisted
+        """
+        index = self._index
+        if index is None:
+            return None
+        i = index.position(symbol.strip().upper())
+        if i < 0:
+            return None
+        return self._record(index, i)
+
+    def complete(self, prefix, limit=10):
+        """
+        Tickers starting with ``prefix``, in alphabetical order
+
+        Returns:
+            list: Up to ``limit`` records (see lookup)
+        """
+        index = self._index
+        prefix = prefix.strip().upper()
+        if index is None or not prefix:
+            return []
+        start, end = index.prefix_range(prefix)
+        return [self._record(index, i) for i in range(start, min(end, start + limit))]
+
+    def search(self, query, limit=10, exchange=None):
+        """
+        Fuzzy autocomplete over tickers and company names
+
+        Ranks the exact ticker first, then ticker prefixes, then company names
+        starting with or containing the query, then tickers within a small
+        edit distance (typos such as 'APPL').
+
+        Args:
+            query (str): Partial ticker or company name
+            limit (int): Maximum results
+            exchange (str): Only return symbols listed on this exchange
+
+        Returns:
+            list: Records (see lookup), best match first
+        """
+        index = self._index
+        query = query.strip()
+        if index is None or not query:
+            return []
+
+        allowed = None if exchange is None else index.exchanges == exchange
+        ranked = []
+        seen = set()
+
+        def take(positions):
+            for i in positions:
+                i = int(i)
+                if i in seen or (allowed is not None and not allowed[i]):
+                    continue
+                seen.add(i)
+                ranked.append(i)
+                if len(ranked) >= limit:
+                    return True
+            return False
+
+        upper = query.upper()
+        lower = query.lower()
+        start, end = index.prefix_range(upper)
+        by_length = start + np.argsort(index.lengths[start:end], kind='stable')
+        if take(by_length):
+            return [self._record(index, i) for i in ranked]
+
+        name_starts = np.flatnonzero(np.char.startswith(index.names_lower, lower))
+        if take(name_starts):
+            return [self._record(index, i) for i in ranked]
+        if len(lower) >= 3:
+            name_contains = np.flatnonzero(np.char.find(index.names_lower, lower) >= 0)
+            if take(name_contains):
+                return [self._record(index, i) for i in ranked]
+
+        # Typos: only compare against tickers of similar length
+        near = np.flatnonzero(np.abs(index.lengths - len(upper)) <= 1)
+        candidates = index.symbols[near].tolist()
+        for match in difflib.get_close_matches(upper, candidates, n=limit, cutoff=0.6):
+            if take([index.position(match)]):
+                break
+        return [self._record(index, i) for i in ranked]
+
+    def symbols(self, exchange=None):
+        """
+        Returns:
+            list: Listed tickers, optionally only those of one exchange
+        """
+        index = self._index
+        if index is None:
+            return []
+        if exchange is None:
+            return index.symbols.tolist()
+        return index.symbols[index.exchanges == exchange].tolist()
+
+    def exchanges(self):
+        """
+        Returns:
+            dict: Exchange -> number of listed symbols
+        """
+        index = self._index
+        if index is None:
+            return {}
+        names, counts = np.unique(index.exchanges, return_counts=True)
+        return dict(zip(names.tolist(), counts.tolist()))
+
+    def age(self):
+        """Seconds since the listing file was written (None when there is none)"""
+        try:
+            return time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def refresh(self, background=False):
+        """
+        Download the current listing and swap it in
+
+        Args:
+            background (bool): Run in a daemon thread and return immediately
+
+        Returns:
+            bool: Whether the listing was refreshed (True when started in the background)
+        """
+        if background:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return True
+            self._refresh_thread = threading.Thread(target=self.refresh, daemon=True,
+                                                    name='symbol-directory-refresh')
+            self._refresh_thread.start()
+            return True
+
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            params = {'function': 'LISTING_STATUS', 'apikey': self.api_key}
+            response = get_session().get(self.base_url, params=params, timeout=60)
+            response.raise_for_status()
+            text = response.text
+            if not text.startswith('symbol'):
+                # Rate-limit notes and errors come back as JSON
+                print(f"Error refreshing symbol listing: {text[:200]}")
+                return False
+            if not self.load(io.StringIO(text)):
+                return False
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            print(f"Error refreshing symbol listing: {str(e)}")
+            return False
+        finally:
+            self._refresh_lock.release()
+
+    def refresh_if_stale(self):
+        """
+        Start a background refresh when the listing is missing or older than
+        max_age, at most once per max_age (a failed download is not retried
+        on every call)
+        """
+        age = self.age()
+        if age is not None and age <= self.max_age:
+            return
+        now = time.time()
+        if self._last_attempt is not None and now - self._last_attempt < self.max_age:
+            return
+        self._last_attempt = now
+        self.refresh(background=True)
+
+    @staticmethod
+    def _record(index, i):
+        return {
+            'symbol': str(index.symbols[i]),
+            'name': str(index.names[i]),
+            'exchange': str(index.exchanges[i]),
+            'asset_type': str(index.asset_types[i]),
+            'ipo_date': str(index.ipo_dates[i]),
+        }
+
+
+_directory = None
+_directory_lock = threading.Lock()
+
+
+def get_symbol_directory(auto_refresh=False):
+    """
+    Process-wide SymbolDirectory, loaded once from its listing file
+
+    Args:
+        auto_refresh (bool): Start a background download (one API call) when the
+            listing is missing or stale, at most once per max_age; by default
+            nothing is fetched
+    """
+    global _directory
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = SymbolDirectory()
+    if auto_refresh:
+        _directory.refresh_if_stale()
+    return _directory
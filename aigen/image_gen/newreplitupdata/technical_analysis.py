@@ -2,14 +2,28 @@ import pandas as pd
 import numpy as np
 import ta
 from ta.utils import dropna
+from incremental_indicators import IncrementalIndicatorEngine
+from panel_indicators import PanelTechnicalAnalyzer
+from indicator_graph import select_indicators
+from indicator_cache import INDICATOR_CACHE
+from compact_frames import CompactDtypePolicy
+from instrumentation import METRICS, instrumented
+from volume_profile import VolumeProfileEngine
+from signal_timeline import signal_timeline, decode_signals
 import warnings
 warnings.filterwarnings('ignore')
 
 class TechnicalAnalyzer:
     """Calculates various technical indicators for stock analysis"""
     
-    def __init__(self):
-        pass
+    def __init__(self, use_cache=False, compact=False):
+        """
+        Args:
+            use_cache (bool): Share results through the process-wide indicator cache
+            compact (bool): Return float32 / integer-volume frames to save memory
+        """
+        self.cache = INDICATOR_CACHE if use_cache else None
+        self.dtype_policy = CompactDtypePolicy() if compact else None
     
     def add_all_indicators(self, df):
         """
@@ -24,6 +38,16 @@ class TechnicalAnalyzer:
         if df is None or df.empty:
             return df
         
+        if self.cache is not None:
+            df_indicators = self.cache.get_or_compute(df, ('all',), self._compute_all_indicators)
+        else:
+            df_indicators = self._compute_all_indicators(df)
+        
+        return self._apply_dtype_policy(df_indicators)
+    
+    @instrumented('technical_analyzer', 'all_indicators')
+    def _compute_all_indicators(self, df):
+        """Run every indicator group on a cleaned copy of the data"""
         # Make a copy to avoid modifying original data
         df_indicators = df.copy()
         
@@ -47,10 +71,91 @@ class TechnicalAnalyzer:
             df_indicators = self._add_other_indicators(df_indicators)
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'all_indicators', e)
             print(f"Error calculating indicators: {str(e)}")
             
         return df_indicators
     
+    def add_selected_indicators(self, df, indicators):
+        """
+        Add only the requested indicators, computing the shared intermediates
+        they depend on once
+        
+        Args:
+            df (pandas.DataFrame): OHLCV stock data
+            indicators (list): Indicator column names (e.g. ['RSI', 'BB_percent'])
+        
+        Returns:
+            pandas.DataFrame: DataFrame with the requested indicators
+        """
+        try:
+            if self.cache is not None and df is not None and not df.empty:
+                df_indicators = self.cache.get_or_compute(
+                    df, ('selected', tuple(indicators)),
+                    lambda data: select_indicators(data, indicators)
+                )
+            else:
+                df_indicators = select_indicators(df, indicators)
+            return self._apply_dtype_policy(df_indicators)
+        except Exception as e:
+            print(f"Error calculating selected indicators: {str(e)}")
+            return df
+    
+    def memory_footprint(self, df):
+        """
+        Report how much memory an indicator frame uses
+        
+        Args:
+            df (pandas.DataFrame): Frame returned by add_all_indicators
+        
+        Returns:
+            dict: Total bytes, bytes per row and the float64 equivalent
+        """
+        return (self.dtype_policy or CompactDtypePolicy()).memory_report(df)
+    
+    def _apply_dtype_policy(self, df):
+        """Convert results to compact dtypes when compact mode is enabled"""
+        if self.dtype_policy is None:
+            return df
+        return self.dtype_policy.apply(df)
+    
+    def create_incremental_engine(self, df=None):
+        """
+        Create a stateful engine that appends indicator rows one bar at a time
+        
+        Args:
+            df (pandas.DataFrame): Optional OHLCV history used to warm up the engine
+        
+        Returns:
+            IncrementalIndicatorEngine: Engine whose rows match add_all_indicators
+        """
+        engine = IncrementalIndicatorEngine()
+        
+        if df is not None and not df.empty:
+            engine.append(df)
+            
+        return engine
+    
+    def add_panel_indicators(self, panel, symbol_level=0):
+        """
+        Add the SMA/EMA/RSI/Bollinger/ATR/stochastic families for many symbols
+        in one vectorized pass
+        
+        Args:
+            panel (pandas.DataFrame): Wide (MultiIndex columns) or long
+                (MultiIndex rows) OHLCV block
+            symbol_level (int): Row level holding the symbol for long blocks
+        
+        Returns:
+            pandas.DataFrame: Panel with indicator columns added per symbol
+        """
+        try:
+            return PanelTechnicalAnalyzer().add_indicators(panel, symbol_level=symbol_level)
+        except Exception as e:
+            print(f"Error calculating panel indicators: {str(e)}")
+            return panel
+    
+    @instrumented('technical_analyzer', 'trend')
     def _add_trend_indicators(self, df):
         """Add trend-based technical indicators"""
         try:
@@ -76,10 +181,12 @@ class TechnicalAnalyzer:
             df['PSAR'] = ta.trend.psar_down(df['High'], df['Low'], df['Close'])
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'trend', e)
             print(f"Error in trend indicators: {str(e)}")
             
         return df
     
+    @instrumented('technical_analyzer', 'momentum')
     def _add_momentum_indicators(self, df):
         """Add momentum-based technical indicators"""
         try:
@@ -100,10 +207,12 @@ class TechnicalAnalyzer:
             df['MFI'] = ta.volume.money_flow_index(df['High'], df['Low'], df['Close'], df['Volume'])
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'momentum', e)
             print(f"Error in momentum indicators: {str(e)}")
             
         return df
     
+    @instrumented('technical_analyzer', 'volatility')
     def _add_volatility_indicators(self, df):
         """Add volatility-based technical indicators"""
         try:
@@ -123,10 +232,12 @@ class TechnicalAnalyzer:
             df['KC_lower'] = ta.volatility.keltner_channel_lband(df['High'], df['Low'], df['Close'])
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'volatility', e)
             print(f"Error in volatility indicators: {str(e)}")
             
         return df
     
+    @instrumented('technical_analyzer', 'volume')
     def _add_volume_indicators(self, df):
         """Add volume-based technical indicators"""
         try:
@@ -143,10 +254,12 @@ class TechnicalAnalyzer:
             df['Volume_SMA'] = ta.trend.sma_indicator(df['Volume'], window=20)
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'volume', e)
             print(f"Error in volume indicators: {str(e)}")
             
         return df
     
+    @instrumented('technical_analyzer', 'other')
     def _add_other_indicators(self, df):
         """Add other useful indicators"""
         try:
@@ -170,10 +283,12 @@ class TechnicalAnalyzer:
             df['Volatility'] = df['Close'].rolling(window=20).std()
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'other', e)
             print(f"Error in other indicators: {str(e)}")
             
         return df
     
+    @instrumented('technical_analyzer', 'signal_summary')
     def get_signal_summary(self, df):
         """
         Generate a summary of buy/sell signals from technical indicators
@@ -182,7 +297,8 @@ class TechnicalAnalyzer:
             df (pandas.DataFrame): DataFrame with technical indicators
         
         Returns:
-            dict: Summary of signals
+            dict: Summary of signals (an ordered categorical pandas.Series
+                indexed by indicator when the analyzer is compact)
         """
         if df is None or df.empty:
             return {}
@@ -232,22 +348,63 @@ class TechnicalAnalyzer:
                 signals['OVERALL'] = 'NEUTRAL'
                 
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'signal_summary', e)
             print(f"Error generating signal summary: {str(e)}")
             
+        if self.dtype_policy is not None and signals:
+            return self.dtype_policy.compact_signals(signals)
         return signals
     
-    def calculate_support_resistance(self, df, window=20):
+    @instrumented('technical_analyzer', 'signal_timeline')
+    def get_signal_timeline(self, df, labels=False):
+        """
+        Signal summary for every row, vectorized
+        
+        Applies the same rules as get_signal_summary to the whole frame.
+        
+        Args:
+            df (pandas.DataFrame): DataFrame with technical indicators
+            labels (bool): Return 'BUY'/'NEUTRAL'/'SELL' categoricals instead of
+                int8 codes (1 / 0 / -1)
+        
+        Returns:
+            pandas.DataFrame: RSI, MACD, BB, MA and OVERALL columns indexed like df
+        """
+        try:
+            timeline = signal_timeline(df)
+            return decode_signals(timeline) if labels else timeline
+        except Exception as e:
+            METRICS.record_error('technical_analyzer', 'signal_timeline', e)
+            print(f"Error generating signal timeline: {str(e)}")
+            return pd.DataFrame()
+    
+    @instrumented('technical_analyzer', 'support_resistance')
+    def calculate_support_resistance(self, df, window=20, method='range'):
         """
         Calculate support and resistance levels
         
         Args:
             df (pandas.DataFrame): OHLCV data
             window (int): Lookback window for calculation
+            method (str): 'range' for the window's low/high, or 'volume_profile'
+                for the strongest high-volume nodes below/above the close
         
         Returns:
-            dict: Support and resistance levels
+            dict: Support and resistance levels ('volume_profile' also returns
+            'strengths' aligned with 'levels', strongest first)
         """
         try:
+            if method == 'volume_profile':
+                ranked = VolumeProfileEngine(window=window).latest_levels(df)
+                supports = ranked[ranked['kind'] == 'support']
+                resistances = ranked[ranked['kind'] == 'resistance']
+                return {
+                    'support': supports['price'].iloc[0] if len(supports) else df.tail(window)['Low'].min(),
+                    'resistance': resistances['price'].iloc[0] if len(resistances) else df.tail(window)['High'].max(),
+                    'levels': ranked['price'].to_numpy(),
+                    'strengths': ranked['strength'].to_numpy(),
+                }
+            
             recent_data = df.tail(window)
             
             support = recent_data['Low'].min()
@@ -265,5 +422,28 @@ class TechnicalAnalyzer:
             }
             
         except Exception as e:
+            METRICS.record_error('technical_analyzer', 'support_resistance', e)
             print(f"Error calculating support/resistance: {str(e)}")
             return {'support': 0, 'resistance': 0, 'levels': []}
+    
+    @instrumented('technical_analyzer', 'volume_profile')
+    def volume_profile_levels(self, df, window=100, bins=200, max_levels=5):
+        """
+        Rolling volume-profile support/resistance levels for every bar
+        
+        Args:
+            df (pandas.DataFrame): OHLCV data
+            window (int): Bars per rolling window
+            bins (int): Price bins across each window's own price range
+            max_levels (int): Ranked levels per bar
+        
+        Returns:
+            pandas.DataFrame: VP_* level/strength columns indexed like df; join
+            them onto an indicator frame to let PatternDetector use them
+        """
+        try:
+            return VolumeProfileEngine(window, bins, max_levels).rolling_levels(df)
+        except Exception as e:
+            METRICS.record_error('technical_analyzer', 'volume_profile', e)
+            print(f"Error calculating volume profile levels: {str(e)}")
+            return pd.DataFrame(index=df.index if df is not None else None)
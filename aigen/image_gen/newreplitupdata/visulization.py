@@ -2,14 +2,54 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from downsampling import viewport, ohlc_buckets, lttb_positions
+from technical_analysis import TechnicalAnalyzer
 
 class ChartVisualizer:
     """Creates interactive charts for stock analysis"""
     
-    def __init__(self):
-        pass
+    # Indicator columns each chart reads; missing ones are computed with
+    # add_selected_indicators, so raw OHLCV never pays for the full set
+    CHART_INDICATORS = {
+        'Candlestick': ['EMA_12', 'EMA_26', 'BB_upper', 'BB_middle', 'BB_lower',
+                        'RSI', 'MACD', 'MACD_signal', 'MACD_histogram'],
+        'Line': ['EMA_12', 'EMA_26', 'RSI', 'MACD'],
+        'Technical': ['RSI', 'STOCH_k', 'MACD', 'MACD_signal', 'BB_percent'],
+    }
     
-    def create_candlestick_chart(self, df, symbol, chart_type="Candlestick"):
+    CHART_TITLES = {
+        'Candlestick': "{} - Technical Analysis Dashboard",
+        'Line': "{} - Line Chart Analysis",
+    }
+    
+    def __init__(self, width_px=1200, downsample=False, fast_render=False, webgl_threshold=5000,
+                 reuse_figures=False, analyzer=None):
+        """
+        Args:
+            width_px (int): Plot width the traces are sized for; candles are
+                bucketed to one per 2 pixels and lines to 2 points per pixel
+            downsample (bool): Reduce large frames before plotting (opt-in;
+                by default every bar is plotted)
+            fast_render (bool): Numeric colour arrays instead of per-bar colour
+                strings, WebGL line traces above ``webgl_threshold`` points and
+                no per-point hover
+            webgl_threshold (int): Points above which fast_render uses Scattergl
+            reuse_figures (bool): Keep one figure per (chart type, indicators)
+                and refresh only its trace arrays on later calls. The returned
+                figure is the cached one and changes on the next refresh, so
+                use one visualizer per session.
+            analyzer (TechnicalAnalyzer): Computes chart indicators missing
+                from the frame (default: a new TechnicalAnalyzer)
+        """
+        self.analyzer = analyzer or TechnicalAnalyzer()
+        self.width_px = width_px
+        self.downsample = downsample
+        self.fast_render = fast_render
+        self.webgl_threshold = webgl_threshold
+        self.reuse_figures = reuse_figures
+        self._skeletons = {}
+    
+    def create_candlestick_chart(self, df, symbol, chart_type="Candlestick", x_range=None):
         """
         Create an interactive candlestick chart with technical indicators
         matching professional trading interface style
@@ -18,6 +58,9 @@ class ChartVisualizer:
             df (pandas.DataFrame): OHLCV data with indicators
             symbol (str): Stock symbol
             chart_type (str): Type of chart ("Candlestick", "Line", "OHLC")
+            x_range (tuple): Visible (start, end); only those bars are plotted,
+                at full detail when they fit the width. Pass the range of a
+                zoom event (see downsampling.viewport_from_relayout) to redraw it.
         
         Returns:
             plotly.graph_objects.Figure: Interactive chart
@@ -25,33 +68,230 @@ class ChartVisualizer:
         if df is None or df.empty:
             return self._create_empty_chart()
         
+        df = self._with_indicators(df, 'Candlestick' if chart_type == 'Candlestick' else 'Line')
+        if not self.reuse_figures:
+            return self._build_chart(df, symbol, chart_type, x_range)
+        
+        key = self._skeleton_key(df, chart_type, x_range)
+        fig = self._refresh_skeleton(key, df, symbol, x_range)
+        if fig is None:
+            fig = self._build_chart(df, symbol, chart_type, x_range)
+            names = [trace.name for trace in fig.data]
+            if names and names[0] in ('Price', 'Close Price'):
+                self._skeletons[key] = (fig, 'Candlestick' if names[0] == 'Price' else 'Line')
+        return fig
+    
+    def _with_indicators(self, df, kind):
+        """Add just the CHART_INDICATORS[kind] columns the frame does not have yet"""
+        missing = [col for col in self.CHART_INDICATORS[kind] if col not in df.columns]
+        if not missing or not {'Open', 'High', 'Low', 'Close', 'Volume'}.issubset(df.columns):
+            return df
+        return self.analyzer.add_selected_indicators(df, missing)
+    
+    def _build_chart(self, df, symbol, chart_type, x_range):
+        """Build a 4-row chart from scratch"""
         try:
             # If candlestick fails, automatically fallback to line chart
             if chart_type == "Candlestick":
                 try:
-                    return self._create_candlestick_chart(df, symbol)
+                    return self._create_candlestick_chart(df, symbol, x_range)
                 except Exception as e:
                     print(f"Candlestick chart failed, falling back to line chart: {e}")
-                    return self._create_line_chart(df, symbol)
+                    return self._create_line_chart(df, symbol, x_range)
             elif chart_type == "Line":
-                return self._create_line_chart(df, symbol)
+                return self._create_line_chart(df, symbol, x_range)
             else:
-                return self._create_line_chart(df, symbol)
+                return self._create_line_chart(df, symbol, x_range)
         except Exception as e:
             print(f"Chart creation failed: {e}")
             return self._create_simple_line_chart(df, symbol)
     
-    def _create_candlestick_chart(self, df, symbol):
+    def _skeleton_key(self, df, chart_type, x_range=None):
+        """Charts with the same key have the same traces, shapes and layout"""
+        kind = "Candlestick" if chart_type == "Candlestick" else "Line"
+        columns = tuple(col for col in self.CHART_INDICATORS[kind] + ['Volume'] if col in df.columns)
+        points = len(viewport(df, x_range))
+        if self.downsample:
+            points = min(points, self.width_px * 2)
+        return kind, columns, self.fast_render and points > self.webgl_threshold
+    
+    def _refresh_skeleton(self, key, df, symbol, x_range):
+        """Swap new data into the cached figure for ``key`` (None when there is none)"""
+        entry = self._skeletons.get(key)
+        if entry is None:
+            return None
+        fig, kind = entry
+        try:
+            view, bars = self._visible_bars(df, x_range)
+            data = self._trace_data(df, view, bars, kind)
+            if sorted(trace.name for trace in fig.data) != sorted(data):
+                del self._skeletons[key]
+                return None
+            
+            with fig.batch_update():
+                for trace in fig.data:
+                    trace.update(data[trace.name])
+                fig.layout.annotations[0].text = self._price_title(df, symbol)
+                fig.layout.title.text = self.CHART_TITLES[kind].format(symbol)
+                for shape in fig.layout.shapes:
+                    shape.x0 = view.index[0]
+                    shape.x1 = view.index[-1]
+                if x_range is not None:
+                    fig.update_xaxes(range=list(x_range))
+                else:
+                    fig.update_xaxes(range=None)
+            return fig
+        except Exception as e:
+            print(f"Error refreshing cached chart: {str(e)}")
+            self._skeletons.pop(key, None)
+            return None
+    
+    def extend_traces(self, df, since, chart_type="Candlestick"):
+        """
+        Append-only delta for a chart already on screen
+        
+        For the 1-minute auto-refresh: instead of resending the figure, send
+        the bars after ``since`` as Plotly.extendTraces arguments (Dash:
+        ``dcc.Graph.extendData``). Only possible while the chart is drawn at
+        full resolution; once bars are bucketed or LTTB-reduced the existing
+        points change too and the chart must be redrawn.
+        
+        Args:
+            df (pandas.DataFrame): Full OHLCV data with indicators
+            since (Timestamp): Last bar already plotted
+            chart_type (str): Chart type the figure was created with
+        
+        Returns:
+            list: [update, trace_indices] pairs, one per group of traces with
+                the same attributes, or None when a redraw is needed
+        """
+        key = self._skeleton_key(df, chart_type)
+        entry = self._skeletons.get(key)
+        if entry is None or (self.downsample and len(df) > self.width_px // 2):
+            return None
+        fig, kind = entry
+        
+        new = df[df.index > pd.Timestamp(since)]
+        data = self._trace_data(new, new, new, kind)
+        groups = {}
+        for i, trace in enumerate(fig.data):
+            values = dict(data[trace.name])
+            marker = values.pop('marker', None)
+            if marker is not None:
+                values['marker.color'] = marker['color']
+            attributes = tuple(sorted(values))
+            update, indices = groups.setdefault(attributes, ({name: [] for name in attributes}, []))
+            for name in attributes:
+                update[name].append(values[name])
+            indices.append(i)
+        return [[update, indices] for update, indices in groups.values()]
+    
+    def _visible_bars(self, df, x_range):
+        """Visible slice of ``df`` and its bars bucketed to the plot width"""
+        view = viewport(df, x_range)
+        if not self.downsample:
+            return view, view
+        return view, ohlc_buckets(view, max(self.width_px // 2, 1))
+    
+    def _lines(self, view, columns):
+        """
+        x/y trace data per column, LTTB-reduced to 2 points per pixel
+        
+        All columns share the points chosen for the first one so filled
+        bands (Bollinger) stay aligned.
+        """
+        if not self.downsample or len(view) <= self.width_px * 2:
+            return {column: dict(x=view.index, y=view[column]) for column in columns}
+        positions = lttb_positions(view[columns[0]], self.width_px * 2)
+        x = view.index[positions]
+        return {column: dict(x=x, y=view[column].to_numpy()[positions]) for column in columns}
+    
+    def _trace_data(self, df, view, bars, chart_type="Candlestick"):
+        """
+        Data arrays of every trace of a 4-row chart, keyed by trace name
+        
+        Used both to build a chart and to refresh a cached one in place.
+        """
+        data = {}
+        if chart_type == "Candlestick":
+            data['Price'] = dict(x=bars.index, open=bars['Open'], high=bars['High'],
+                                 low=bars['Low'], close=bars['Close'])
+        else:
+            data['Close Price'] = self._lines(view, ['Close'])['Close']
+        
+        for column, name in [('EMA_12', 'EMA 12'), ('EMA_26', 'EMA 26')]:
+            if column in df.columns:
+                data[name] = self._lines(view, [column])[column]
+        
+        if chart_type == "Candlestick":
+            if all(col in df.columns for col in ['BB_upper', 'BB_middle', 'BB_lower']):
+                bb = self._lines(view, ['BB_middle', 'BB_upper', 'BB_lower'])
+                data['BB Upper'] = bb['BB_upper']
+                data['BB Lower'] = bb['BB_lower']
+                data['BB Middle'] = bb['BB_middle']
+            data['Volume'] = dict(x=bars.index, y=bars['Volume'], marker=self._direction_marker(
+                bars['Close'].to_numpy() < bars['Open'].to_numpy(), 'red', 'green'))
+        elif 'Volume' in df.columns:
+            data['Volume'] = dict(x=bars.index, y=bars['Volume'])
+        
+        if 'RSI' in df.columns:
+            data['RSI'] = self._lines(view, ['RSI'])['RSI']
+        
+        if chart_type == "Candlestick":
+            if all(col in df.columns for col in ['MACD', 'MACD_signal']):
+                lines = self._lines(view, ['MACD', 'MACD_signal'])
+                data['MACD'] = lines['MACD']
+                data['MACD Signal'] = lines['MACD_signal']
+                if 'MACD_histogram' in df.columns:
+                    data['MACD Histogram'] = dict(
+                        x=bars.index, y=bars['MACD_histogram'], marker=self._direction_marker(
+                            bars['MACD_histogram'].to_numpy() >= 0, 'green', 'red'))
+        elif 'MACD' in df.columns:
+            data['MACD'] = self._lines(view, ['MACD'])['MACD']
+        return data
+    
+    def _price_title(self, df, symbol):
+        price_change = ((df["Close"].iloc[-1] - df["Close"].iloc[-2]) / df["Close"].iloc[-2] * 100) if len(df) > 1 else 0
+        return f'{symbol} - ${df["Close"].iloc[-1]:.2f} ({price_change:+.2f}%)'
+    
+    def _line_trace(self, **kwargs):
+        """Scatter trace, or Scattergl for long lines in fast_render mode"""
+        if self.fast_render and len(kwargs['x']) > self.webgl_threshold:
+            return go.Scattergl(**kwargs)
+        return go.Scatter(**kwargs)
+    
+    def _direction_marker(self, mask, true_color, false_color):
+        """
+        Bar marker coloured by a boolean mask
+        
+        fast_render sends the mask as int8 through a two-colour scale; Plotly
+        validates each colour string of a string array one by one, which is
+        most of the figure build time for large frames.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        if self.fast_render:
+            return dict(color=mask.astype(np.int8), cmin=0, cmax=1,
+                        colorscale=[[0, false_color], [1, true_color]])
+        return dict(color=np.where(mask, true_color, false_color).tolist())
+    
+    def _finish(self, fig):
+        """Drop per-point hover in fast_render mode"""
+        if self.fast_render:
+            fig.update_traces(hoverinfo='skip')
+        return fig
+    
+    def _create_candlestick_chart(self, df, symbol, x_range=None):
         """Create candlestick chart with full features"""
         try:
+            view, bars = self._visible_bars(df, x_range)
+            data = self._trace_data(df, view, bars, "Candlestick")
             # Create subplots with professional layout
-            price_change = ((df["Close"].iloc[-1] - df["Close"].iloc[-2]) / df["Close"].iloc[-2] * 100) if len(df) > 1 else 0
             fig = make_subplots(
                 rows=4, cols=1,
                 shared_xaxes=True,
                 vertical_spacing=0.02,
                 subplot_titles=[
-                    f'{symbol} - ${df["Close"].iloc[-1]:.2f} ({price_change:+.2f}%)',
+                    self._price_title(df, symbol),
                     'Volume',
                     'RSI (14)',
                     'MACD (12,26,9)'
@@ -62,11 +302,7 @@ class ChartVisualizer:
             # Main candlestick chart
             fig.add_trace(
                 go.Candlestick(
-                    x=df.index,
-                    open=df['Open'],
-                    high=df['High'],
-                    low=df['Low'],
-                    close=df['Close'],
+                    **data['Price'],
                     name="Price",
                     increasing_line_color='#26a69a',
                     decreasing_line_color='#ef5350',
@@ -81,9 +317,8 @@ class ChartVisualizer:
             # Add moving averages
             if 'EMA_12' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['EMA_12'],
+                    self._line_trace(
+                        **data['EMA 12'],
                         mode='lines',
                         name='EMA 12',
                         line=dict(color='orange', width=1),
@@ -94,9 +329,8 @@ class ChartVisualizer:
             
             if 'EMA_26' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['EMA_26'],
+                    self._line_trace(
+                        **data['EMA 26'],
                         mode='lines',
                         name='EMA 26',
                         line=dict(color='purple', width=1),
@@ -108,9 +342,8 @@ class ChartVisualizer:
             # Add Bollinger Bands
             if all(col in df.columns for col in ['BB_upper', 'BB_middle', 'BB_lower']):
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_upper'],
+                    self._line_trace(
+                        **data['BB Upper'],
                         mode='lines',
                         name='BB Upper',
                         line=dict(color='gray', width=1, dash='dash'),
@@ -120,9 +353,8 @@ class ChartVisualizer:
                 )
                 
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_lower'],
+                    self._line_trace(
+                        **data['BB Lower'],
                         mode='lines',
                         name='BB Lower',
                         line=dict(color='gray', width=1, dash='dash'),
@@ -134,9 +366,8 @@ class ChartVisualizer:
                 )
                 
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['BB_middle'],
+                    self._line_trace(
+                        **data['BB Middle'],
                         mode='lines',
                         name='BB Middle',
                         line=dict(color='gray', width=1),
@@ -146,15 +377,10 @@ class ChartVisualizer:
                 )
             
             # Volume chart
-            colors = ['red' if close < open else 'green' 
-                     for close, open in zip(df['Close'], df['Open'])]
-            
             fig.add_trace(
                 go.Bar(
-                    x=df.index,
-                    y=df['Volume'],
+                    **data['Volume'],
                     name='Volume',
-                    marker_color=colors,
                     opacity=0.6
                 ),
                 row=2, col=1
@@ -163,9 +389,8 @@ class ChartVisualizer:
             # RSI chart
             if 'RSI' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['RSI'],
+                    self._line_trace(
+                        **data['RSI'],
                         mode='lines',
                         name='RSI',
                         line=dict(color='#ffc107', width=2)
@@ -175,17 +400,17 @@ class ChartVisualizer:
                 
                 # RSI reference lines (using shapes instead of add_hline for subplot compatibility)
                 fig.add_shape(
-                    type="line", x0=df.index[0], x1=df.index[-1], y0=70, y1=70,
+                    type="line", x0=view.index[0], x1=view.index[-1], y0=70, y1=70,
                     line=dict(color="red", width=1, dash="dash"), opacity=0.5,
                     row=3, col=1
                 )
                 fig.add_shape(
-                    type="line", x0=df.index[0], x1=df.index[-1], y0=30, y1=30,
+                    type="line", x0=view.index[0], x1=view.index[-1], y0=30, y1=30,
                     line=dict(color="green", width=1, dash="dash"), opacity=0.5,
                     row=3, col=1
                 )
                 fig.add_shape(
-                    type="line", x0=df.index[0], x1=df.index[-1], y0=50, y1=50,
+                    type="line", x0=view.index[0], x1=view.index[-1], y0=50, y1=50,
                     line=dict(color="gray", width=1, dash="dot"), opacity=0.3,
                     row=3, col=1
                 )
@@ -193,9 +418,8 @@ class ChartVisualizer:
             # MACD chart
             if all(col in df.columns for col in ['MACD', 'MACD_signal']):
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['MACD'],
+                    self._line_trace(
+                        **data['MACD'],
                         mode='lines',
                         name='MACD',
                         line=dict(color='blue', width=2)
@@ -204,9 +428,8 @@ class ChartVisualizer:
                 )
                 
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['MACD_signal'],
+                    self._line_trace(
+                        **data['MACD Signal'],
                         mode='lines',
                         name='MACD Signal',
                         line=dict(color='red', width=1)
@@ -216,13 +439,10 @@ class ChartVisualizer:
                 
                 # MACD histogram
                 if 'MACD_histogram' in df.columns:
-                    colors_macd = ['green' if val >= 0 else 'red' for val in df['MACD_histogram']]
                     fig.add_trace(
                         go.Bar(
-                            x=df.index,
-                            y=df['MACD_histogram'],
+                            **data['MACD Histogram'],
                             name='MACD Histogram',
-                            marker_color=colors_macd,
                             opacity=0.6
                         ),
                         row=4, col=1
@@ -230,7 +450,7 @@ class ChartVisualizer:
             
             # Update layout
             fig.update_layout(
-                title=f"{symbol} - Technical Analysis Dashboard",
+                title=self.CHART_TITLES['Candlestick'].format(symbol),
                 xaxis_title="Time",
                 template="plotly_dark",
                 height=800,
@@ -255,22 +475,26 @@ class ChartVisualizer:
             fig.update_xaxes(showticklabels=False, row=2, col=1)
             fig.update_xaxes(showticklabels=False, row=3, col=1)
             
-            return fig
+            if x_range is not None:
+                fig.update_xaxes(range=list(x_range))
+            
+            return self._finish(fig)
             
         except Exception as e:
             print(f"Error creating candlestick chart: {str(e)}")
             return self._create_empty_chart()
     
-    def _create_line_chart(self, df, symbol):
+    def _create_line_chart(self, df, symbol, x_range=None):
         """Create a simple line chart with technical indicators"""
         try:
-            price_change = ((df["Close"].iloc[-1] - df["Close"].iloc[-2]) / df["Close"].iloc[-2] * 100) if len(df) > 1 else 0
+            view, bars = self._visible_bars(df, x_range)
+            data = self._trace_data(df, view, bars, "Line")
             fig = make_subplots(
                 rows=4, cols=1,
                 shared_xaxes=True,
                 vertical_spacing=0.02,
                 subplot_titles=[
-                    f'{symbol} - ${df["Close"].iloc[-1]:.2f} ({price_change:+.2f}%)',
+                    self._price_title(df, symbol),
                     'Volume',
                     'RSI (14)',
                     'MACD (12,26,9)'
@@ -280,9 +504,8 @@ class ChartVisualizer:
             
             # Main price line chart
             fig.add_trace(
-                go.Scatter(
-                    x=df.index,
-                    y=df['Close'],
+                self._line_trace(
+                    **data['Close Price'],
                     mode='lines',
                     name='Close Price',
                     line=dict(color='#00ff88', width=2)
@@ -293,9 +516,8 @@ class ChartVisualizer:
             # Add moving averages
             if 'EMA_12' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['EMA_12'],
+                    self._line_trace(
+                        **data['EMA 12'],
                         mode='lines',
                         name='EMA 12',
                         line=dict(color='orange', width=1),
@@ -306,9 +528,8 @@ class ChartVisualizer:
             
             if 'EMA_26' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['EMA_26'],
+                    self._line_trace(
+                        **data['EMA 26'],
                         mode='lines',
                         name='EMA 26',
                         line=dict(color='purple', width=1),
@@ -321,8 +542,7 @@ class ChartVisualizer:
             if 'Volume' in df.columns:
                 fig.add_trace(
                     go.Bar(
-                        x=df.index,
-                        y=df['Volume'],
+                        **data['Volume'],
                         name='Volume',
                         marker_color='rgba(128, 128, 128, 0.5)'
                     ),
@@ -332,9 +552,8 @@ class ChartVisualizer:
             # RSI chart
             if 'RSI' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['RSI'],
+                    self._line_trace(
+                        **data['RSI'],
                         mode='lines',
                         name='RSI',
                         line=dict(color='purple', width=2)
@@ -345,9 +564,8 @@ class ChartVisualizer:
             # MACD chart
             if 'MACD' in df.columns:
                 fig.add_trace(
-                    go.Scatter(
-                        x=df.index,
-                        y=df['MACD'],
+                    self._line_trace(
+                        **data['MACD'],
                         mode='lines',
                         name='MACD',
                         line=dict(color='blue', width=2)
@@ -357,7 +575,7 @@ class ChartVisualizer:
             
             # Update layout
             fig.update_layout(
-                title=f"{symbol} - Line Chart Analysis",
+                title=self.CHART_TITLES['Line'].format(symbol),
                 template="plotly_dark",
                 height=800,
                 showlegend=True
@@ -369,7 +587,10 @@ class ChartVisualizer:
             fig.update_yaxes(title_text="RSI", row=3, col=1)
             fig.update_yaxes(title_text="MACD", row=4, col=1)
             
-            return fig
+            if x_range is not None:
+                fig.update_xaxes(range=list(x_range))
+            
+            return self._finish(fig)
             
         except Exception as e:
             print(f"Error creating line chart: {str(e)}")
@@ -504,6 +725,10 @@ class ChartVisualizer:
             plotly.graph_objects.Figure: Technical indicators chart
         """
         try:
+            df = self._with_indicators(df, 'Technical')
+            lines = {column: self._lines(df, [column])[column]
+                     for column in ['RSI', 'STOCH_k', 'MACD', 'MACD_signal', 'BB_percent']
+                     if column in df.columns}
             fig = make_subplots(
                 rows=2, cols=2,
                 subplot_titles=['RSI & Stochastic', 'MACD', 'Bollinger Bands %B', 'Volume Indicators'],
@@ -514,40 +739,41 @@ class ChartVisualizer:
             # RSI and Stochastic
             if 'RSI' in df.columns:
                 fig.add_trace(
-                    go.Scatter(x=df.index, y=df['RSI'], name='RSI', line=dict(color='orange')),
+                    self._line_trace(**lines['RSI'], name='RSI', line=dict(color='orange')),
                     row=1, col=1
                 )
             
             if 'STOCH_k' in df.columns:
                 fig.add_trace(
-                    go.Scatter(x=df.index, y=df['STOCH_k'], name='Stochastic %K', line=dict(color='blue')),
+                    self._line_trace(**lines['STOCH_k'], name='Stochastic %K', line=dict(color='blue')),
                     row=1, col=1
                 )
             
             # MACD
             if 'MACD' in df.columns:
                 fig.add_trace(
-                    go.Scatter(x=df.index, y=df['MACD'], name='MACD', line=dict(color='blue')),
+                    self._line_trace(**lines['MACD'], name='MACD', line=dict(color='blue')),
                     row=1, col=2
                 )
             
             if 'MACD_signal' in df.columns:
                 fig.add_trace(
-                    go.Scatter(x=df.index, y=df['MACD_signal'], name='Signal', line=dict(color='red')),
+                    self._line_trace(**lines['MACD_signal'], name='Signal', line=dict(color='red')),
                     row=1, col=2
                 )
             
             # Bollinger Bands %B
             if 'BB_percent' in df.columns:
                 fig.add_trace(
-                    go.Scatter(x=df.index, y=df['BB_percent'], name='BB %B', line=dict(color='purple')),
+                    self._line_trace(**lines['BB_percent'], name='BB %B', line=dict(color='purple')),
                     row=2, col=1
                 )
             
             # Volume indicators
             if 'Volume' in df.columns:
+                _, bars = self._visible_bars(df[['Volume']], None)
                 fig.add_trace(
-                    go.Bar(x=df.index, y=df['Volume'], name='Volume', opacity=0.6),
+                    go.Bar(x=bars.index, y=bars['Volume'], name='Volume', opacity=0.6),
                     row=2, col=2
                 )
             
@@ -558,7 +784,7 @@ class ChartVisualizer:
                 showlegend=False
             )
             
-            return fig
+            return self._finish(fig)
             
         except Exception as e:
             print(f"Error creating technical indicators chart: {str(e)}")
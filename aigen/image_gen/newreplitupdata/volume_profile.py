@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+
+class VolumeProfileEngine:
+    """
+    Volume-at-price support/resistance levels over rolling windows
+
+    Each window gets its own price grid of ``bins`` bins spanning the
+    window's low-to-high range, and each bar's volume is assigned to the bin
+    of its typical price ((High + Low + Close) / 3). A bar's levels therefore
+    depend only on the bars up to it: the output is causal and does not
+    change when bars are appended, and the grid stays fine on long series.
+    Windows are processed in fixed-size chunks so memory stays bounded.
+    High-volume nodes (local maxima of the histogram) are the candidate
+    levels; a level's strength is its share of the window's volume.
+    """
+
+    def __init__(self, window=100, bins=200, max_levels=5, chunk_size=4096):
+        """
+        Args:
+            window (int): Bars per rolling window
+            bins (int): Price bins across each window's price range
+            max_levels (int): Ranked levels reported per bar
+            chunk_size (int): Bars processed per vectorized block
+        """
+        self.window = window
+        self.bins = bins
+        self.max_levels = max_levels
+        self.chunk_size = chunk_size
+
+    def rolling_levels(self, df):
+        """
+        Compute ranked volume-profile levels for every bar
+
+        Windows shorter than ``window`` (the first bars) use the bars available.
+
+        Args:
+            df (pandas.DataFrame): OHLCV data
+
+        Returns:
+            pandas.DataFrame: Indexed like ``df`` with VP_level_<k> /
+            VP_strength_<k> (k = 1 strongest) plus VP_support,
+            VP_support_strength, VP_resistance and VP_resistance_strength, the
+            strongest level at or below / above the close
+        """
+        k = self.max_levels
+        columns = ([f'VP_level_{i + 1}' for i in range(k)] + [f'VP_strength_{i + 1}' for i in range(k)]
+                   + ['VP_support', 'VP_support_strength', 'VP_resistance', 'VP_resistance_strength'])
+        if df is None or df.empty:
+            return pd.DataFrame(columns=columns, dtype=float)
+
+        close = df['Close'].to_numpy(dtype=np.float64)
+        typical, volume, lo, width = self._prepare(df)
+        n = len(close)
+        out = np.full((n, len(columns)), np.nan)
+
+        for start in range(0, n, self.chunk_size):
+            end = min(n, start + self.chunk_size)
+            hist = self._histograms(typical, volume, lo, width, start, end)
+            centers = self._centers(lo[start:end], width[start:end])
+            out[start:end] = self._rank_levels(hist, centers, close[start:end])
+
+        return pd.DataFrame(out, index=df.index, columns=columns)
+
+    def latest_levels(self, df):
+        """
+        Ranked levels for the most recent window (every high-volume node, not
+        just the top ``max_levels``)
+
+        Args:
+            df (pandas.DataFrame): OHLCV data
+
+        Returns:
+            pandas.DataFrame: price, volume, strength and kind ('support' or
+            'resistance' relative to the last close), strongest first
+        """
+        if df is None or df.empty:
+            return pd.DataFrame(columns=['price', 'volume', 'strength', 'kind'])
+
+        # Same price grid as rolling_levels, so the top rows match its last bar
+        df = df.iloc[-self.window:]
+        typical, volume, lo, width = self._prepare(df)
+        n = len(df)
+        hist = self._histograms(typical, volume, lo, width, n - 1, n)[0]
+        centers = self._centers(lo[-1:], width[-1:])[0]
+        total = hist.sum()
+        peaks = np.flatnonzero(self._peak_mask(hist[None, :])[0])
+        peaks = peaks[np.argsort(-hist[peaks], kind='stable')]
+        close = df['Close'].iloc[-1]
+        return pd.DataFrame({
+            'price': centers[peaks],
+            'volume': hist[peaks],
+            'strength': hist[peaks] / total if total > 0 else np.zeros(len(peaks)),
+            'kind': np.where(centers[peaks] <= close, 'support', 'resistance'),
+        })
+
+    def _prepare(self, df):
+        """Typical prices, volumes, and each window's grid origin and bin width"""
+        high = df['High'].to_numpy(dtype=np.float64)
+        low = df['Low'].to_numpy(dtype=np.float64)
+        close = df['Close'].to_numpy(dtype=np.float64)
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+
+        typical = (high + low + close) / 3
+        finite = np.isfinite(typical)
+        volume = np.where(finite & np.isfinite(volume), volume, 0.0)
+
+        # Price range of the window ending at each bar (only bars up to it)
+        lo = pd.Series(np.where(finite, low, np.nan)).rolling(self.window, min_periods=1).min().to_numpy()
+        hi = pd.Series(np.where(finite, high, np.nan)).rolling(self.window, min_periods=1).max().to_numpy()
+        lo = np.where(np.isfinite(lo), lo, 0.0)
+        hi = np.where(np.isfinite(hi) & (hi > lo), hi, lo + 1.0)
+        width = (hi - lo) / self.bins
+        return typical, volume, lo, width
+
+    def _centers(self, lo, width):
+        """Bin centres of each window's grid, one row per bar"""
+        return lo[:, None] + (np.arange(self.bins) + 0.5)[None, :] * width[:, None]
+
+    def _histograms(self, typical, volume, lo, width, start, end):
+        """Volume-at-price histograms of the windows ending at bars start..end-1"""
+        rows = end - start
+        bars = np.arange(start, end)
+        members = bars[:, None] - np.arange(self.window)[None, :]
+        valid = members >= 0
+        members = np.where(valid, members, 0)
+
+        price = typical[members]
+        weights = np.where(valid & np.isfinite(price), volume[members], 0.0)
+        price = np.where(np.isfinite(price), price, lo[bars, None])
+        bins = np.clip(((price - lo[bars, None]) / width[bars, None]).astype(np.intp), 0, self.bins - 1)
+
+        flat = (np.arange(rows)[:, None] * self.bins + bins).ravel()
+        return np.bincount(flat, weights=weights.ravel(), minlength=rows * self.bins).reshape(rows, self.bins)
+
+    @staticmethod
+    def _peak_mask(hist):
+        """High-volume nodes: bins at least as heavy as both neighbours"""
+        peak = hist > 0
+        # Plateaus count once, at their rightmost bin
+        peak[:, 1:] &= hist[:, 1:] >= hist[:, :-1]
+        peak[:, :-1] &= hist[:, :-1] > hist[:, 1:]
+        return peak
+
+    def _rank_levels(self, hist, centers, close):
+        """Top levels plus nearest-side support/resistance for each histogram row"""
+        k = self.max_levels
+        rows = np.arange(len(hist))
+        total = hist.sum(axis=1)
+        total = np.where(total > 0, total, np.inf)
+        score = np.where(self._peak_mask(hist), hist, 0.0)
+
+        k_eff = min(k, score.shape[1])
+        top = np.argpartition(-score, k_eff - 1, axis=1)[:, :k_eff]
+        order = np.argsort(-np.take_along_axis(score, top, axis=1), axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        top_score = np.take_along_axis(score, top, axis=1)
+
+        levels = np.full((len(hist), k), np.nan)
+        strengths = np.full((len(hist), k), np.nan)
+        found = top_score > 0
+        levels[:, :k_eff] = np.where(found, np.take_along_axis(centers, top, axis=1), np.nan)
+        strengths[:, :k_eff] = np.where(found, top_score / total[:, None], np.nan)
+
+        # Strongest node at or below the close, and above it
+        below = centers <= close[:, None]
+        support = np.where(below, score, 0.0).argmax(axis=1)
+        support_score = np.where(below[rows, support], score[rows, support], 0.0)
+        resistance = np.where(below, 0.0, score).argmax(axis=1)
+        resistance_score = np.where(below[rows, resistance], 0.0, score[rows, resistance])
+
+        return np.column_stack([
+            levels, strengths,
+            np.where(support_score > 0, centers[rows, support], np.nan),
+            np.where(support_score > 0, support_score / total, np.nan),
+            np.where(resistance_score > 0, centers[rows, resistance], np.nan),
+            np.where(resistance_score > 0, resistance_score / total, np.nan),
+        ])
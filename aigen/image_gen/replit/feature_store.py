@@ -0,0 +1,334 @@
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Bump whenever build_features changes what it computes; each version is
+# stored under its own directory so old and new feature sets never mix
+FEATURE_SET_VERSION = 1
+
+LAG_COLUMNS = ['Close', 'Volume', 'RSI']
+LAGS = [1, 2, 3]
+ROLLING_WINDOWS = [5, 10]
+
+# Bars of raw input a new bar's lag and rolling features look back over
+_CONTEXT_BARS = max(max(LAGS), max(ROLLING_WINDOWS) - 1)
+
+
+def build_features(df, base_columns, fill=None):
+    """
+    Machine learning features for every bar of ``df``
+
+    Args:
+        df (pandas.DataFrame): OHLCV data with technical indicators
+        base_columns (list): Indicator columns used as features as is
+        fill (dict): Last filled value of each base column before ``df``;
+            leading gaps are carried forward from it instead of back-filled
+
+    Returns:
+        pandas.DataFrame: Features; rows without full lag/rolling history are dropped
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    available_cols = [col for col in base_columns if col in df.columns]
+    if not available_cols:
+        return pd.DataFrame()
+
+    features = df[available_cols].copy()
+
+    # Handle missing values
+    features = features.ffill()
+    if fill:
+        features = features.fillna({col: value for col, value in fill.items() if col in features.columns})
+    features = features.bfill().fillna(0)
+
+    # Add lag features
+    for col in LAG_COLUMNS:
+        if col in df.columns:
+            for lag in LAGS:
+                features[f'{col}_lag_{lag}'] = df[col].shift(lag)
+
+    # Add rolling statistics
+    if 'Close' in df.columns:
+        for window in ROLLING_WINDOWS:
+            rolling = df['Close'].rolling(window)
+            features[f'Close_rolling_mean_{window}'] = rolling.mean()
+            features[f'Close_rolling_std_{window}'] = rolling.std()
+
+    # Drop rows with NaN (from lag features)
+    return features.dropna()
+
+
+class FeatureStore:
+    """
+    Persistent, per-symbol store of ML feature rows
+
+    Rows are keyed by (symbol, timestamp, feature-set version) and kept as
+    Parquet parts under ``<root>/v<FEATURE_SET_VERSION>/<SYMBOL>/``, named by
+    the range of bars they cover (``part-<first>_<last>.parquet``, epoch
+    nanoseconds), next to a small state file holding the last stored bar, the
+    raw tail the lag and rolling windows need, and the forward-fill values of
+    the base columns. ``update`` only builds features for bars newer than the
+    last stored one and appends them as a new part; stored rows are never
+    rewritten, so call ``rebuild`` after the underlying history has been revised.
+
+    Parts and state are written to temporary files and moved into place with
+    ``os.replace``, and the state file is the commit point, as in
+    ``PatternIndex``: parts starting after the recorded last bar are left
+    over from a crash and are dropped, parts inside another part's range have
+    been merged by ``compact``, and reads keep one row per timestamp.
+    """
+
+    def __init__(self, base_columns, root='feature_store'):
+        """
+        Args:
+            base_columns (list): Indicator columns used as features
+                (e.g. MLPredictor.FEATURE_COLUMNS)
+            root (str): Directory holding the store
+        """
+        self.base_columns = list(base_columns)
+        self.root = os.path.join(root, f'v{FEATURE_SET_VERSION}')
+        self._features = {}
+        self._lock = threading.RLock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def update(self, symbol, df):
+        """
+        Build and store features for the bars of ``df`` newer than the last stored bar
+
+        Args:
+            symbol (str): Stock symbol
+            df (pandas.DataFrame): Data with technical indicators indexed by
+                timestamp; may be the full history or only the latest bars
+
+        Returns:
+            int: Number of feature rows appended
+        """
+        if df is None or df.empty:
+            return 0
+
+        symbol = symbol.upper()
+        try:
+            with self._lock:
+                if not df.index.is_monotonic_increasing:
+                    df = df.sort_index()
+                inputs = self._input_columns(df)
+                state = self._read_state(symbol)
+                if state['last_timestamp'] is not None and state['inputs'] != inputs:
+                    # The indicator columns changed, so the stored rows no longer line up
+                    self.rebuild(symbol)
+                    state = self._read_state(symbol)
+
+                if state['last_timestamp'] is not None:
+                    new = df[df.index > pd.Timestamp(state['last_timestamp'])]
+                    if new.empty:
+                        return 0
+                    # Prepend the stored raw tail so the first new bars get full windows
+                    context = pd.DataFrame(state['context'], columns=inputs, dtype=float,
+                                           index=pd.to_datetime(state['context_index']))
+                    frame = pd.concat([context, new[inputs]])
+                else:
+                    new = df
+                    frame = df[inputs]
+
+                features = build_features(frame, self.base_columns, state['fill'])
+                features = features[features.index >= new.index[0]].astype(np.float64)
+                existing = self._load(symbol)
+                self._discard_uncommitted(symbol, state)
+                if len(features):
+                    self._write_part(symbol, features, new.index[0], frame.index[-1])
+
+                base = [col for col in self.base_columns if col in inputs]
+                filled = frame[base].ffill()
+                if state['fill']:
+                    filled = filled.fillna(state['fill'])
+                last = filled.iloc[-1]
+                state['fill'] = {col: float(last[col]) for col in base if pd.notna(last[col])}
+
+                tail = frame.tail(_CONTEXT_BARS)
+                state['inputs'] = inputs
+                state['last_timestamp'] = tail.index[-1].isoformat()
+                state['context_index'] = [timestamp.isoformat() for timestamp in tail.index]
+                state['context'] = [[None if pd.isna(value) else float(value) for value in row]
+                                    for row in tail.to_numpy(dtype=np.float64)]
+                self._write_state(symbol, state)
+                if len(features):
+                    self._features[symbol] = features if existing.empty else pd.concat([existing, features])
+                return len(features)
+
+        except Exception as e:
+            print(f"Error updating feature store for {symbol}: {str(e)}")
+            return 0
+
+    def read(self, symbol, start=None, end=None):
+        """
+        Stored feature matrix of a symbol
+
+        Args:
+            symbol (str): Stock symbol
+            start, end: Inclusive timestamp bounds
+
+        Returns:
+            pandas.DataFrame: Features indexed by timestamp, in column order
+        """
+        features = self._load(symbol.upper())
+        if features.empty:
+            return features
+        lo = 0 if start is None else features.index.searchsorted(pd.Timestamp(start), 'left')
+        hi = len(features) if end is None else features.index.searchsorted(pd.Timestamp(end), 'right')
+        return features.iloc[lo:hi]
+
+    def features_for(self, symbol, df):
+        """
+        Bring the store up to date with ``df`` and return the features of its bars
+
+        Args:
+            symbol (str): Stock symbol
+            df (pandas.DataFrame): Data with technical indicators indexed by timestamp
+
+        Returns:
+            pandas.DataFrame: Features for the timestamps ``df`` covers
+        """
+        if df is None or df.empty:
+            return pd.DataFrame()
+        self.update(symbol, df)
+        features = self.read(symbol, df.index.min(), df.index.max())
+        if len(features) and not features.index.isin(df.index).all():
+            features = features[features.index.isin(df.index)]
+        return features
+
+    def symbols(self):
+        """
+        Returns:
+            list: Every symbol with stored features
+        """
+        return sorted(name for name in os.listdir(self.root)
+                      if os.path.isdir(os.path.join(self.root, name)))
+
+    def rebuild(self, symbol):
+        """Drop a symbol's stored features; the next update rebuilds them from scratch"""
+        symbol = symbol.upper()
+        with self._lock:
+            self._features.pop(symbol, None)
+            shutil.rmtree(os.path.join(self.root, symbol), ignore_errors=True)
+
+    def compact(self, symbol):
+        """
+        Rewrite a symbol's parts as a single Parquet file
+
+        The merged part is moved into place before the old parts are removed,
+        so a crash at any point leaves a readable store.
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            features = self._load(symbol)
+            state = self._read_state(symbol)
+            names = self._live_parts(symbol, state)
+            if not names:
+                return
+            if len(names) == 1:
+                # Already one part; only clear what an interrupted compact left behind
+                merged = names[0]
+            else:
+                starts = [bounds[0] for bounds in map(self._part_range, names) if bounds is not None]
+                first = min(starts + [features.index[0].value])
+                merged = self._write_part(symbol, features, pd.Timestamp(first),
+                                          pd.Timestamp(state['last_timestamp']))
+            for name in self._part_files(symbol):
+                if name != merged:
+                    os.remove(os.path.join(self.root, symbol, name))
+
+    def _input_columns(self, df):
+        """Raw columns build_features reads, in a stable order"""
+        wanted = self.base_columns + [col for col in LAG_COLUMNS if col not in self.base_columns]
+        return [col for col in wanted if col in df.columns]
+
+    def _load(self, symbol):
+        """Sorted features of a symbol, read from disk on first use"""
+        with self._lock:
+            cached = self._features.get(symbol)
+            if cached is not None:
+                return cached
+            names = self._live_parts(symbol, self._read_state(symbol))
+            parts = [pd.read_parquet(os.path.join(self.root, symbol, name)) for name in names]
+            if parts:
+                features = parts[0] if len(parts) == 1 else pd.concat(parts)
+                if not features.index.is_monotonic_increasing:
+                    features = features.sort_index(kind='stable')
+                if not features.index.is_unique:
+                    features = features[~features.index.duplicated(keep='last')]
+            else:
+                features = pd.DataFrame()
+            self._features[symbol] = features
+            return features
+
+    def _part_files(self, symbol):
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if name.endswith('.parquet'))
+
+    @staticmethod
+    def _part_range(name):
+        """(first, last) epoch nanoseconds a part covers, or None for an unnamed range"""
+        fields = name[len('part-'):-len('.parquet')].split('_')
+        if len(fields) != 2:
+            return None
+        try:
+            return int(fields[0]), int(fields[1])
+        except ValueError:
+            return None
+
+    def _live_parts(self, symbol, state):
+        """Committed parts, minus those already merged into a larger one"""
+        if state['last_timestamp'] is None:
+            return []
+        last = pd.Timestamp(state['last_timestamp']).value
+        ranges = {name: self._part_range(name) for name in self._part_files(symbol)}
+        committed = {name: bounds for name, bounds in ranges.items()
+                     if bounds is None or bounds[0] <= last}
+        live = []
+        for name, bounds in committed.items():
+            merged = bounds is not None and any(
+                other is not None and other != bounds and other[0] <= bounds[0] and bounds[1] <= other[1]
+                for other in committed.values())
+            if not merged:
+                live.append(name)
+        return sorted(live, key=lambda name: (ranges[name] or (-1, -1)))
+
+    def _discard_uncommitted(self, symbol, state):
+        """Remove parts written after the last committed state (an interrupted update)"""
+        last = None if state['last_timestamp'] is None else pd.Timestamp(state['last_timestamp']).value
+        for name in self._part_files(symbol):
+            bounds = self._part_range(name)
+            if bounds is not None and (last is None or bounds[0] > last):
+                os.remove(os.path.join(self.root, symbol, name))
+
+    def _write_part(self, symbol, features, first, last):
+        """Write a part covering bars ``first``..``last`` atomically; returns its file name"""
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+        name = f'part-{pd.Timestamp(first).value}_{pd.Timestamp(last).value}.parquet'
+        path = os.path.join(directory, name)
+        features.to_parquet(path + '.tmp')
+        os.replace(path + '.tmp', path)
+        return name
+
+    def _read_state(self, symbol):
+        path = os.path.join(self.root, symbol, '_state.json')
+        if not os.path.exists(path):
+            return {'last_timestamp': None, 'inputs': [], 'context_index': [], 'context': [], 'fill': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_state(self, symbol, state):
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, '_state.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(state, f)
+        os.replace(path + '.tmp', path)
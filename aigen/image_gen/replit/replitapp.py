@@ -8,14 +8,41 @@ import xgboost as xgb
 from sklearn.svm import SVC, SVR
 import pickle
 import os
+from feature_store import build_features
+try:
+    # Available when this module runs next to the analysis modules
+    from technical_analysis import TechnicalAnalyzer
+except ImportError:
+    TechnicalAnalyzer = None
 import warnings
 warnings.filterwarnings('ignore')
 
 class MLPredictor:
     """Machine Learning predictor for stock price movements"""
     
-    def __init__(self, model_type="random_forest"):
+    # Indicator columns used as features; missing ones are computed with
+    # add_selected_indicators instead of the full indicator set
+    FEATURE_COLUMNS = [
+        'RSI', 'MACD', 'MACD_signal', 'BB_percent', 'BB_width',
+        'ATR', 'ADX', 'STOCH_k', 'STOCH_d', 'WILLIAMS_R',
+        'MFI', 'CMF', 'OBV', 'Volume_change', 'Price_change',
+        'HL_pct', 'Close_position', 'Momentum_5', 'Volatility'
+    ]
+    
+    def __init__(self, model_type="random_forest", feature_store=None, analyzer=None):
+        """
+        Args:
+            model_type (str): 'random_forest', 'xgboost' or 'svm'
+            feature_store (FeatureStore): Persistent feature store used when
+                train_models/predict are given a symbol
+            analyzer (TechnicalAnalyzer): Computes feature indicators missing
+                from the frame (default: a new TechnicalAnalyzer when available)
+        """
         self.model_type = model_type
+        self.feature_store = feature_store
+        if analyzer is None and TechnicalAnalyzer is not None:
+            analyzer = TechnicalAnalyzer()
+        self.analyzer = analyzer
         self.classification_model = None
         self.regression_model = None
         self.scaler = StandardScaler()
@@ -25,12 +52,14 @@ class MLPredictor:
         # Try to load existing model
         self._load_model()
     
-    def _prepare_features(self, df):
+    def _prepare_features(self, df, symbol=None):
         """
         Prepare features for machine learning
         
         Args:
             df (pandas.DataFrame): DataFrame with technical indicators
+            symbol (str): Stock symbol; with a feature store, features are read
+                from it and only bars it has not seen yet are computed
         
         Returns:
             pandas.DataFrame: Prepared features
@@ -38,43 +67,18 @@ class MLPredictor:
         if df is None or df.empty:
             return pd.DataFrame()
         
-        # Select relevant features for ML
-        feature_cols = [
-            'RSI', 'MACD', 'MACD_signal', 'BB_percent', 'BB_width',
-            'ATR', 'ADX', 'STOCH_k', 'STOCH_d', 'WILLIAMS_R',
-            'MFI', 'CMF', 'OBV', 'Volume_change', 'Price_change',
-            'HL_pct', 'Close_position', 'Momentum_5', 'Volatility'
-        ]
-        
-        # Filter existing columns
-        available_cols = [col for col in feature_cols if col in df.columns]
-        
-        if not available_cols:
-            return pd.DataFrame()
+        df = self._with_indicators(df)
+        if self.feature_store is not None and symbol and isinstance(df.index, pd.DatetimeIndex):
+            return self.feature_store.features_for(symbol, df)
         
-        features = df[available_cols].copy()
-        
-        # Handle missing values
-        features = features.fillna(method='ffill').fillna(method='bfill')
-        features = features.fillna(0)
-        
-        # Add lag features
-        for col in ['Close', 'Volume', 'RSI']:
-            if col in df.columns:
-                for lag in [1, 2, 3]:
-                    features[f'{col}_lag_{lag}'] = df[col].shift(lag)
-        
-        # Add rolling statistics
-        if 'Close' in df.columns:
-            features['Close_rolling_mean_5'] = df['Close'].rolling(5).mean()
-            features['Close_rolling_std_5'] = df['Close'].rolling(5).std()
-            features['Close_rolling_mean_10'] = df['Close'].rolling(10).mean()
-            features['Close_rolling_std_10'] = df['Close'].rolling(10).std()
-        
-        # Drop rows with NaN (from lag features)
-        features = features.dropna()
-        
-        return features
+        return build_features(df, self.FEATURE_COLUMNS)
+    
+    def _with_indicators(self, df):
+        """Add just the FEATURE_COLUMNS indicators the frame does not have yet"""
+        missing = [col for col in self.FEATURE_COLUMNS if col not in df.columns]
+        if not missing or self.analyzer is None or 'Close' not in df.columns:
+            return df
+        return self.analyzer.add_selected_indicators(df, missing)
     
     def _create_targets(self, df, timeframe="5min"):
         """
@@ -118,20 +122,21 @@ class MLPredictor:
         
         return classification_target, regression_target
     
-    def train_models(self, df, timeframe="5min"):
+    def train_models(self, df, timeframe="5min", symbol=None):
         """
         Train both classification and regression models
         
         Args:
             df (pandas.DataFrame): Training data with technical indicators
             timeframe (str): Prediction timeframe
+            symbol (str): Stock symbol, used to read features from the feature store
         
         Returns:
             dict: Training results
         """
         try:
             # Prepare features and targets
-            features = self._prepare_features(df)
+            features = self._prepare_features(df, symbol)
             class_target, reg_target = self._create_targets(df, timeframe)
             
             if features.empty or class_target is None:
@@ -219,13 +224,14 @@ class MLPredictor:
         except Exception as e:
             return {"error": f"Training failed: {str(e)}"}
     
-    def predict(self, df, timeframe="5min"):
+    def predict(self, df, timeframe="5min", symbol=None):
         """
         Make predictions on new data
         
         Args:
             df (pandas.DataFrame): Data with technical indicators
             timeframe (str): Prediction timeframe
+            symbol (str): Stock symbol, used to read features from the feature store
         
         Returns:
             dict: Prediction results
@@ -233,12 +239,12 @@ class MLPredictor:
         try:
             # If models are not trained, train them first
             if not self.is_trained or self.classification_model is None:
-                training_result = self.train_models(df, timeframe)
+                training_result = self.train_models(df, timeframe, symbol)
                 if "error" in training_result:
                     return {"error": training_result["error"]}
             
             # Prepare features
-            features = self._prepare_features(df)
+            features = self._prepare_features(df, symbol)
             
             if features.empty:
                 return {"error": "No features available for prediction"}